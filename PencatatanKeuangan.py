@@ -1,181 +1,178 @@
+import io
 import streamlit as st
-import pandas as pd
-import matplotlib.pyplot as plt
 from datetime import datetime, timedelta
-
-# File untuk menyimpan data
-DATA_FILE = "data_keuangan.csv"
-STOCK_FILE = "stok_produk.csv"
-
-# Fungsi untuk memuat data dari file
-@st.cache_data
-def load_data():
-    try:
-        return pd.read_csv(DATA_FILE, parse_dates=["Tanggal"])
-    except FileNotFoundError:
-        return pd.DataFrame(columns=["Tanggal", "Kategori", "Tipe", "Jumlah", "Keterangan"])
-
-@st.cache_data
-def load_stock():
-    try:
-        return pd.read_csv(STOCK_FILE)
-    except FileNotFoundError:
-        stok_awal = pd.DataFrame({
-            "Kode Produk": [f"P{i+1:03d}" for i in range(32)],
-            "Produk": [
-                "T-Shirts", "T-Shirts", "T-Shirts", "T-Shirts",
-                "Jackets", "Jackets", "Jackets", "Jackets",
-                "Flannel", "Flannel", "Flannel",
-                "Sweater", "Sweater", "Sweater", "Sweater",
-                "Jeans", "Jeans", "Jeans", "Jeans",
-                "Shorts", "Shorts", "Shorts", "Shorts",
-                "Chinos", "Chinos", "Chinos", "Chinos",
-                "Sweat Pants", "Sweat Pants", "Sweat Pants", "Sweat Pants",
-                "Cargo Pants", "Jumpsuits", "Leggings", "Sweatshirts"
-            ],
-            "Merek": [
-                "Short Sleeve", "Long Sleeve", "AIRism Cotton", "Cotton",
-                "Reversible Parka", "Pocketable UV Protection Parka", "BLOCKTECH Parka 3D Cut", "Zip Ip Blouson",
-                "Flannel Shirt Long Sleeve", "Flannel Long Sleeve Checked", "Flannel Long Sleeve",
-                "Crew Neck Long Sleeve Sweater", "Polo Sweater Short Sleeve", "3D Knit Crew Neck Sweater", "Waffle V Neck Sweater",
-                "Wide Tapered Jeans", "Straight Jeans", "Slim Fit Jeans", "Ultra Strech Skinny Fit Jeans",
-                "Stretch Slim Fit Shorts", "Geared Shorts", "Ultra Stretch Shorts", "Cargo Shorts",
-                "Slim Fit Chino Pants", "Pleated Wide Chino Pants", "Wide Fit Chino Pants", "Chino Shorts",
-                "Sweat Pants", "Sweat Wide Pants", "Ultra Stretch Sweat Shorts", "Wide Fit Cargo Pants",
-                "Tight Fit Jumpsuit", "Casual Leggings", "Slim Fit Sweatshirts", "Oversized Sweatshirts"
-            ],
-            "UkuranProduk": ["Small", "Medium", "Large"] * 11,
-            "WarnaProduk": ["Hijau", "Hitam", "Putih"] * 11,
-            "HargaProduk": [
-                120000, 125000, 130000, 110000,
-                250000, 275000, 300000, 220000,
-                150000, 160000, 155000,
-                180000, 190000, 185000, 175000,
-                210000, 220000, 200000, 195000,
-                100000, 105000, 110000, 115000,
-                140000, 145000, 150000, 135000,
-                90000, 95000, 100000, 120000,
-                140000, 150000, 160000, 170000
-            ],
-            "Stok": [100] * 32
-        })
-        stok_awal.to_csv(STOCK_FILE, index=False)
-        return stok_awal
-
-# Fungsi untuk menyimpan data ke file
-def save_data(data):
-    data.to_csv(DATA_FILE, index=False)
-
-def save_stock(stock):
-    stock.to_csv(STOCK_FILE, index=False)
-
-# Inisialisasi data
-if "data_keuangan" not in st.session_state:
-    st.session_state["data_keuangan"] = load_data()
-
-if "stok_produk" not in st.session_state:
-    st.session_state["stok_produk"] = load_stock()
+from core import ledger as ledger_core
+from core import inventory, metrik
+from core.dataset import DatasetBersama, TurunanDataset
+from core.expenses import KATEGORI_PENGELUARAN
+from core.impor_ekspor import FORMAT_FILE, ekspor_transaksi, format_file, impor_transaksi
+from core.inventory import StokTidakCukup, nama_produk
+from core.partisi import ringkasan_terbuka, tutup_buku_terpisah
+from core.pencarian import IndeksProduk
+from core.reporting import buat_laporan, filter_transaksi, grafik_keuangan, laporan_agregat
+from core.ringkasan import RingkasanBerjalan
+from core.skema import SKEMA_LEDGER, SKEMA_STOK
+from core.sales import catat_penjualan
+from keranjang import keranjang_belanja, kosongkan_keranjang
+from paginasi import halaman_dataframe, tabel_berhalaman
+from panel_metrik import tampilkan_panel, tampilkan_status_penyimpanan
+
+# Waktu setiap rerun dan rinciannya dicatat mulai dari sini
+metrik.mulai_rerun("keuangan")
+
+# Pilihan granularitas laporan agregat -> granularitas kubus
+GRANULARITAS_LAPORAN = {"Harian": "hari", "Mingguan": "minggu", "Bulanan": "bulan"}
+
+# Penyimpanan ledger dipakai bersama oleh semua sesi
+@st.cache_resource
+def get_ledger():
+    return ledger_core.buka_ledger()
+
+# Ledger dan tabel stok dimuat sekali per proses dan dipakai bersama oleh semua sesi
+# sebagai snapshot berversi (tanpa salinan per sesi seperti st.cache_data). Dari ledger
+# bulanan hanya bulan yang belum ditutup yang dimuat; bulan yang sudah ditutup dibaca
+# dari ringkasan tersegelnya dan partisinya hanya dibaca saat query membutuhkannya.
+@st.cache_resource
+def get_dataset():
+    ledger = get_ledger()
+    return DatasetBersama(getattr(ledger, "muat_terbuka", ledger.muat), SKEMA_LEDGER)
+
+@st.cache_resource
+def get_stok():
+    return DatasetBersama(inventory.muat_stok, SKEMA_STOK)
+
+# Inventaris bersama; diisi dari file stok saat pertama kali dibuat
+@st.cache_resource
+def get_inventaris():
+    return inventory.buka_inventaris(get_stok().snapshot()[1])
+
+# Indeks pencarian produk (nama, merek, ukuran, warna) untuk keranjang penjualan,
+# dibangun sekali dari tabel stok bersama
+@st.cache_resource
+def get_indeks_produk():
+    return IndeksProduk(get_stok().snapshot()[1], "Kode Produk", ["Kode Produk", "Produk", "Merek", "UkuranProduk", "WarnaProduk"])
+
+# Fungsi untuk membangun ringkasan berjalan dari ledger, dicocokkan dengan perhitungan ulang penuh.
+# Ledger bulanan: ringkasan tersegel bulan yang sudah ditutup ditambah baris bulan yang masih terbuka.
+def bangun_ringkasan(data):
+    ledger = get_ledger()
+    if hasattr(ledger, "ringkasan_tersegel"):
+        return ringkasan_terbuka(ledger, data)
+    ringkasan = RingkasanBerjalan.dari_ledger(data)
+    if not ringkasan.cocok_dengan(data):
+        st.warning("Ringkasan tidak cocok dengan data transaksi, periksa kolom Jumlah yang kosong.")
+    return ringkasan
+
+# Ledger sesi ini adalah referensi ke snapshot bersama; ringkasan berjalan dibangun sekali
+# per sesi lalu mengikuti versi dataset: hanya transaksi yang di-commit sejak rerun
+# sebelumnya (dari sesi mana pun) yang ditambahkan.
+def siapkan_ledger():
+    if "turunan_ringkasan" not in st.session_state:
+        st.session_state["turunan_ringkasan"] = TurunanDataset(get_dataset(), bangun_ringkasan, RingkasanBerjalan.tambah_ledger)
+    st.session_state["data_keuangan"], st.session_state["ringkasan"] = st.session_state["turunan_ringkasan"].ambil()
+
+# Katalog menyimpan indeks Kode Produk -> baris; stok_produk adalah tabel yang sama.
+# Tabelnya salinan dangkal dari tabel stok bersama: kolom baru disalin saat stok sesi ini ditulis.
+def siapkan_katalog():
+    if "katalog" not in st.session_state:
+        st.session_state["katalog"] = inventory.buat_katalog_stok(get_stok().snapshot()[1].copy(deep=False))
+        st.session_state["stok_produk"] = st.session_state["katalog"].data
+        segarkan_stok()
+    return st.session_state["katalog"]
+
+# Fungsi untuk menyamakan stok di sesi ini dengan inventaris bersama
+def segarkan_stok():
+    inventory.segarkan_stok(st.session_state["katalog"], get_inventaris())
 
 # Fungsi untuk menambah data
 def tambah_transaksi(tanggal, kategori, tipe, jumlah, keterangan):
-    data_baru = pd.DataFrame([{
-        "Tanggal": pd.to_datetime(tanggal),
-        "Kategori": kategori,
-        "Tipe": tipe,
-        "Jumlah": jumlah,
-        "Keterangan": keterangan,
-    }])
-
-    # Tambahkan data baru ke session_state dan simpan ke file
-    st.session_state["data_keuangan"] = pd.concat(
-        [st.session_state["data_keuangan"], data_baru],
-        ignore_index=True
+    ledger_core.komit_transaksi(get_ledger(), get_dataset(), tanggal, kategori, tipe, jumlah, keterangan)
+    siapkan_ledger()
+
+# Fungsi untuk mencatat penjualan satu keranjang
+def tambah_penjualan(tanggal, keranjang, keterangan):
+    jumlah_baris = catat_penjualan(
+        get_ledger(), get_dataset(), st.session_state["katalog"], get_inventaris(), tanggal, keranjang, keterangan
     )
-    save_data(st.session_state["data_keuangan"])
+    siapkan_ledger()
+    return jumlah_baris
+
+# Label produk di hasil pencarian dan keranjang
+def label_produk(kode):
+    katalog = st.session_state["katalog"]
+    produk = katalog.baris(kode)
+    return f"{nama_produk(katalog, kode)} {produk['UkuranProduk']}/{produk['WarnaProduk']} - Rp {produk['Harga']:,}"
+
+# Fungsi untuk mengubah stok produk berdasarkan Kode Produk
+def ubah_stok(kode, selisih):
+    inventory.ubah_stok(st.session_state["katalog"], get_inventaris(), kode, selisih)
 
 # Fungsi untuk mengurangi stok produk
-def kurangi_stok(produk, jumlah):
-    stok_produk = st.session_state["stok_produk"]
-    if produk in stok_produk["Produk"].values:
-        indeks = stok_produk[stok_produk["Produk"] == produk].index[0]
-        stok_produk.at[indeks, "Stok"] -= jumlah
-        save_stock(stok_produk)
-
-# Fungsi untuk menghitung ringkasan
-def hitung_ringkasan(data):
-    pemasukan = data[data["Tipe"] == "Pemasukan"]["Jumlah"].sum()
-    pengeluaran = data[data["Tipe"] == "Pengeluaran"]["Jumlah"].sum()
-    saldo = pemasukan - pengeluaran
-    return pemasukan, pengeluaran, saldo
-
-# Fungsi untuk membuat laporan berdasarkan rentang waktu
-def buat_laporan(data, periode, tanggal_awal=None, tanggal_akhir=None):
-    if data.empty:
-        return pd.DataFrame()
-
-    data["Tanggal"] = pd.to_datetime(data["Tanggal"])
-    if periode == "Harian":
-        return data[data["Tanggal"] == pd.Timestamp(datetime.now().date())]
-    elif periode == "Rentang Tanggal" and tanggal_awal and tanggal_akhir:
-        return data[(data["Tanggal"] >= pd.to_datetime(tanggal_awal)) & (data["Tanggal"] <= pd.to_datetime(tanggal_akhir))]
-    return data
+def kurangi_stok(kode, jumlah):
+    ubah_stok(kode, -jumlah)
+
+# Fungsi untuk menampilkan riwayat transaksi per halaman. Dengan SQLite, filter,
+# urutan dan LIMIT/OFFSET dijalankan di database; ledger bulanan hanya membaca partisi
+# halaman yang ditampilkan; selain itu dipotong dari ledger sesi.
+def tampilkan_riwayat():
+    ringkasan = st.session_state["ringkasan"]
+    kolom1, kolom2 = st.columns(2)
+    tipe = kolom1.selectbox("Filter Tipe", ["Semua", "Pemasukan", "Pengeluaran"], key="riwayat_tipe")
+    daftar_kategori = sorted({kategori for _, kategori in ringkasan.per_kategori})
+    kategori = kolom2.selectbox("Filter Kategori", ["Semua"] + daftar_kategori, key="riwayat_kategori")
+    filter = {
+        "tipe": None if tipe == "Semua" else tipe,
+        "kategori": None if kategori == "Semua" else kategori,
+    }
+
+    ledger = get_ledger()
+    if hasattr(ledger, "halaman"):
+        total = ledger.hitung(**filter)
+        def ambil_halaman(offset, limit, urut, menurun):
+            return ledger.halaman(offset, limit, urut, menurun, **filter)
+    else:
+        data = filter_transaksi(st.session_state["data_keuangan"], **filter)
+        total = len(data)
+        def ambil_halaman(offset, limit, urut, menurun):
+            return halaman_dataframe(data, offset, limit, urut, menurun)
+
+    tabel_berhalaman("riwayat", ambil_halaman, total, ["Tanggal", "Jumlah", "Kategori"])
 
 # Fungsi untuk membuat grafik
 def buat_grafik(data):
-    if data.empty:
+    # Untuk ledger sesi ini, deret harian diambil dari ringkasan berjalan (termasuk bulan
+    # yang sudah ditutup, yang barisnya tidak dimuat)
+    ringkasan = st.session_state["ringkasan"] if data is st.session_state.get("data_keuangan") else None
+    if (ringkasan.jumlah_transaksi == 0) if ringkasan is not None else data.empty:
         st.warning("Tidak ada data untuk ditampilkan dalam grafik.")
         return
 
-    data["Tanggal"] = pd.to_datetime(data["Tanggal"])
-    data.sort_values("Tanggal", inplace=True)
-
-    pemasukan = data[data["Tipe"] == "Pemasukan"].groupby("Tanggal")["Jumlah"].sum()
-    pengeluaran = data[data["Tipe"] == "Pengeluaran"].groupby("Tanggal")["Jumlah"].sum()
+    gambar = grafik_keuangan(data, ringkasan)
+    with metrik.ukur("app.tampilkan_gambar"):
+        st.image(gambar)
 
-    plt.figure(figsize=(10, 6))
-    plt.plot(pemasukan.index, pemasukan.values, label="Pemasukan", marker="o")
-    plt.plot(pengeluaran.index, pengeluaran.values, label="Pengeluaran", marker="o")
-    plt.title("Grafik Pemasukan dan Pengeluaran")
-    plt.xlabel("Tanggal")
-    plt.ylabel("Jumlah")
-    plt.legend()
-    plt.grid()
-    st.pyplot(plt)
+def halaman_keuangan():
+    siapkan_ledger()
+    siapkan_katalog()
 
-# Halaman utama
-st.title("Aplikasi Pencatatan Keuangan")
-st.markdown("Kelola keuangan Anda dengan mudah dan terorganisir.")
-
-# Tambahkan menu navigasi di Streamlit
-menu = st.sidebar.radio("Menu", ["Pencatatan Keuangan", "Manajemen Stok Produk"])
-
-if menu == "Pencatatan Keuangan":
     # Form untuk mencatat transaksi
     st.header("Pencatatan Keuangan")
     tanggal = st.date_input("Tanggal", value=datetime.now().date())
     tipe = st.radio("Tipe Transaksi", ["Pemasukan", "Pengeluaran"])
 
     if tipe == "Pemasukan":
-        st.subheader("Masukkan Jumlah untuk Masing-Masing Produk")
-        col1, col2 = st.columns(2)
-        jumlah_produk = {}
-        total_pemasukan = 0
-
-        stok_produk = st.session_state["stok_produk"]
-        for idx, produk in enumerate(stok_produk.itertuples()):
-            kolom = col1 if idx % 2 == 0 else col2
-            with kolom:
-                jumlah_unit = st.number_input(f"{produk.Produk} - Rp {produk.Harga:,}", min_value=0, step=1, key=f"jumlah_{produk.Produk}")
-                total_harga = jumlah_unit * produk.Harga
-                jumlah_produk[produk.Produk] = jumlah_unit
-                total_pemasukan += total_harga
+        st.subheader("Keranjang Penjualan")
+        katalog = st.session_state["katalog"]
+        with metrik.ukur("app.form_produk"):
+            jumlah_produk = keranjang_belanja("keranjang", get_indeks_produk(), label_produk)
+        total_pemasukan = sum(unit * katalog.harga(kode) for kode, unit in jumlah_produk.items() if kode in katalog)
 
         st.write(f"*Total Pemasukan:* Rp {total_pemasukan:,.2f}")
         jumlah = total_pemasukan
         kategori = "Penjualan Produk"
     else:
-        kategori = st.selectbox("Kategori", ["Gaji", "Utilitas", "Perlengkapan", "Sewa"])
-        jumlah = st.number_input("Jumlah Pengeluaran (Rp)", min_value=0.0, step=0.01)
+        kategori = st.selectbox("Kategori", KATEGORI_PENGELUARAN)
+        jumlah = st.number_input("Jumlah Pengeluaran (Rp)", min_value=0, step=1000)
 
     keterangan = st.text_area("Keterangan", placeholder="Tuliskan detail transaksi")
 
@@ -183,29 +180,58 @@ if menu == "Pencatatan Keuangan":
         try:
             if jumlah > 0:
                 if tipe == "Pemasukan":
-                    for produk, jumlah_unit in jumlah_produk.items():
-                        if jumlah_unit > 0:
-                            total_harga = jumlah_unit * stok_produk[stok_produk["Produk"] == produk]["Harga"].values[0]
-                            tambah_transaksi(tanggal, produk, tipe, total_harga, keterangan)
-                            kurangi_stok(produk, jumlah_unit)
+                    tambah_penjualan(tanggal, jumlah_produk, keterangan)
+                    kosongkan_keranjang("keranjang")
                 else:
                     tambah_transaksi(tanggal, kategori, tipe, jumlah, keterangan)
                 st.success("Transaksi berhasil ditambahkan!")
             else:
                 st.error("Jumlah harus lebih dari 0.")
+        except StokTidakCukup as e:
+            st.error(f"Transaksi dibatalkan: stok {nama_produk(st.session_state['katalog'], e.kode)} tidak mencukupi.")
         except Exception as e:
             st.error(f"Terjadi kesalahan: {e}")
 
     # Menampilkan data keuangan
     st.header("Riwayat Transaksi")
-    if st.session_state["data_keuangan"].empty:
+    if st.session_state["ringkasan"].jumlah_transaksi == 0:
         st.info("Belum ada transaksi yang tercatat.")
     else:
-        st.dataframe(st.session_state["data_keuangan"])
+        tampilkan_riwayat()
+
+    # Laporan transaksi per periode
+    st.header("Laporan Transaksi")
+    periode = st.radio("Periode Laporan", ["Harian", "Rentang Tanggal"], horizontal=True)
+    tanggal_awal = tanggal_akhir = None
+    if periode == "Rentang Tanggal":
+        tanggal_awal = st.date_input("Dari Tanggal", value=datetime.now().date() - timedelta(days=30))
+        tanggal_akhir = st.date_input("Sampai Tanggal", value=datetime.now().date())
+    # Filter tanggal dijalankan di penyimpanan jika didukung (SQLite, atau ledger bulanan
+    # yang hanya membaca partisi bulan dalam rentang)
+    laporan = buat_laporan(st.session_state["data_keuangan"], periode, tanggal_awal, tanggal_akhir, ledger=get_ledger())
+    if laporan.empty:
+        st.info("Tidak ada transaksi pada periode ini.")
+    else:
+        st.dataframe(laporan)
+
+    # Laporan agregat harian/mingguan/bulanan dari kubus ringkasan berjalan
+    st.header("Laporan Agregat")
+    kolom1, kolom2 = st.columns(2)
+    granularitas = kolom1.radio("Per", list(GRANULARITAS_LAPORAN), index=2, horizontal=True)
+    rincian = kolom2.multiselect("Rincian", ["Tipe", "Kategori"], default=["Tipe"])
+    agregat_awal = kolom1.date_input("Dari", value=datetime.now().date().replace(day=1) - timedelta(days=365), key="agregat_awal")
+    agregat_akhir = kolom2.date_input("Sampai", value=datetime.now().date(), key="agregat_akhir")
+    agregat = laporan_agregat(
+        st.session_state["ringkasan"], GRANULARITAS_LAPORAN[granularitas], agregat_awal, agregat_akhir, rincian
+    )
+    if agregat.empty:
+        st.info("Tidak ada transaksi pada periode ini.")
+    else:
+        st.dataframe(agregat[["Periode"] + rincian + ["Jumlah", "Transaksi"]])
 
     # Ringkasan keuangan
     st.header("Ringkasan Keuangan")
-    pemasukan, pengeluaran, saldo = hitung_ringkasan(st.session_state["data_keuangan"])
+    pemasukan, pengeluaran, saldo = st.session_state["ringkasan"].totals()
     st.metric("Total Pemasukan", f"Rp {pemasukan:,.2f}")
     st.metric("Total Pengeluaran", f"Rp {pengeluaran:,.2f}")
     st.metric("Saldo", f"Rp {saldo:,.2f}")
@@ -214,9 +240,11 @@ if menu == "Pencatatan Keuangan":
     st.header("Grafik Keuangan")
     buat_grafik(st.session_state["data_keuangan"])
 
-elif menu == "Manajemen Stok Produk":
+def halaman_stok():
     st.header("Manajemen Stok Produk")
-    stok_produk = st.session_state["stok_produk"]
+    katalog = siapkan_katalog()
+    segarkan_stok()
+    stok_produk = katalog.data
 
     # Menampilkan stok saat ini
     st.subheader("Stok Produk Saat Ini")
@@ -224,27 +252,110 @@ elif menu == "Manajemen Stok Produk":
 
     # Form untuk menambahkan stok
     st.subheader("Tambah Stok Produk")
-    produk_tambah = st.selectbox("Pilih Produk", stok_produk["Produk"])
+    produk_tambah = st.selectbox("Pilih Produk", stok_produk["Kode Produk"], format_func=lambda kode: nama_produk(katalog, kode))
     jumlah_tambah = st.number_input("Jumlah Stok yang Akan Ditambahkan", min_value=0, step=1)
     if st.button("Tambah Stok"):
         if jumlah_tambah > 0:
-            indeks = stok_produk[stok_produk["Produk"] == produk_tambah].index[0]
-            stok_produk.at[indeks, "Stok"] += jumlah_tambah
-            save_stock(stok_produk)
-            st.success(f"Stok untuk {produk_tambah} berhasil ditambahkan.")
+            ubah_stok(produk_tambah, jumlah_tambah)
+            st.success(f"Stok untuk {nama_produk(katalog, produk_tambah)} berhasil ditambahkan.")
         else:
             st.error("Jumlah harus lebih dari 0.")
 
     # Form untuk mengurangi stok
     st.subheader("Kurangi Stok Produk")
-    produk_kurang = st.selectbox("Pilih Produk untuk Dikurangi", stok_produk["Produk"])
+    produk_kurang = st.selectbox("Pilih Produk untuk Dikurangi", stok_produk["Kode Produk"], format_func=lambda kode: nama_produk(katalog, kode))
     jumlah_kurang = st.number_input("Jumlah Stok yang Akan Dikurangi", min_value=0, step=1)
     if st.button("Kurangi Stok"):
-        indeks = stok_produk[stok_produk["Produk"] == produk_kurang].index[0]
-        if jumlah_kurang > 0 and stok_produk.at[indeks, "Stok"] >= jumlah_kurang:
-            stok_produk.at[indeks, "Stok"] -= jumlah_kurang
-            save_stock(stok_produk)
-            st.success(f"Stok untuk {produk_kurang} berhasil dikurangi.")
-        else:
+        try:
+            if jumlah_kurang <= 0:
+                raise StokTidakCukup(produk_kurang)
+            kurangi_stok(produk_kurang, jumlah_kurang)
+            st.success(f"Stok untuk {nama_produk(katalog, produk_kurang)} berhasil dikurangi.")
+        except StokTidakCukup:
             st.error("Jumlah harus lebih dari 0 dan tidak boleh melebihi stok saat ini.")
 
+def halaman_impor_ekspor():
+    st.header("Impor / Ekspor Data")
+    siapkan_ledger()
+
+    # Impor massal: file dibaca dan ditulis ke penyimpanan per chunk
+    st.subheader("Impor Transaksi")
+    st.caption("Kolom: Tanggal, Kategori, Tipe (Pemasukan/Pengeluaran), Jumlah, Keterangan (opsional)")
+    file_impor = st.file_uploader("File transaksi", type=["csv", "jsonl", "json", "parquet"])
+    if file_impor is not None and st.button("Impor"):
+        try:
+            hasil = impor_transaksi(file_impor, get_ledger(), format=format_file(file_impor.name))
+        except ValueError as e:
+            st.error(f"Impor dibatalkan: {e}")
+        else:
+            # Penyimpanan sudah berubah; versi baru dimuat sekali untuk semua sesi
+            get_dataset().muat_ulang()
+            siapkan_ledger()
+            st.success(f"{hasil['diterima']:,} transaksi diimpor dalam {hasil['chunk']} chunk.")
+            if hasil["ditolak"]:
+                st.warning(f"{hasil['ditolak']:,} baris ditolak. Contoh baris yang ditolak:")
+                st.dataframe(hasil["contoh_ditolak"])
+
+    # Ekspor per rentang tanggal ke file yang bisa diunduh
+    st.subheader("Ekspor Transaksi")
+    tanggal_awal = st.date_input("Dari Tanggal", value=datetime.now().date() - timedelta(days=30), key="ekspor_awal")
+    tanggal_akhir = st.date_input("Sampai Tanggal", value=datetime.now().date(), key="ekspor_akhir")
+    format_ekspor = st.selectbox("Format", FORMAT_FILE)
+    if st.button("Siapkan File Ekspor"):
+        # Dengan SQLite baris dibaca per chunk dari database; selain itu dari ledger sesi
+        ledger = get_ledger()
+        sumber = ledger if hasattr(ledger, "iter_query") else st.session_state["data_keuangan"]
+        berkas = io.BytesIO()
+        total = ekspor_transaksi(sumber, berkas, tanggal_awal, tanggal_akhir, format=format_ekspor)
+        st.info(f"{total:,} transaksi siap diunduh.")
+        st.download_button(
+            "Unduh", berkas.getvalue(),
+            file_name=f"transaksi_{tanggal_awal}_{tanggal_akhir}.{format_ekspor}",
+        )
+
+    # Tutup buku dan arsip hanya untuk ledger yang dipartisi per bulan (STORAGE_ENGINE=bulanan)
+    ledger = get_ledger()
+    if hasattr(ledger, "arsipkan"):
+        st.subheader("Tutup Buku Bulanan")
+        st.caption("Partisi: " + (", ".join(ledger.daftar_partisi()) or "belum ada"))
+        hitung_ulang = st.checkbox("Hitung ulang bulan yang sudah ditutup", value=False)
+        if st.button("Tutup Buku"):
+            try:
+                ditutup = tutup_buku_terpisah(ledger, hitung_ulang=hitung_ulang)
+            except RuntimeError as e:
+                st.error(f"Tutup buku gagal: {e}")
+            else:
+                # Bulan yang baru ditutup dilepas dari dataset bersama; ringkasannya dibaca dari segel
+                if ditutup:
+                    get_dataset().muat_ulang()
+                    siapkan_ledger()
+                st.success(f"{len(ditutup)} bulan ditutup.")
+
+        # Tahun lama dipadatkan menjadi arsip hanya-baca; isi ledger tidak berubah
+        tahun_arsip = st.number_input("Arsipkan Tahun", min_value=2000, max_value=datetime.now().year - 1, value=datetime.now().year - 1, step=1)
+        if st.button("Arsipkan"):
+            try:
+                jumlah_arsip = ledger.arsipkan(tahun_arsip)
+            except ValueError as e:
+                st.error(f"Arsip dibatalkan: {e}")
+            else:
+                st.success(f"{jumlah_arsip:,} transaksi tahun {tahun_arsip} diarsipkan.")
+
+# Halaman utama
+st.title("Aplikasi Pencatatan Keuangan")
+st.markdown("Kelola keuangan Anda dengan mudah dan terorganisir.")
+
+# Tambahkan menu navigasi di Streamlit; hanya halaman yang dipilih yang memuat datanya
+menu = st.sidebar.radio("Menu", ["Pencatatan Keuangan", "Manajemen Stok Produk", "Impor / Ekspor Data"])
+if menu == "Pencatatan Keuangan":
+    halaman_keuangan()
+elif menu == "Manajemen Stok Produk":
+    halaman_stok()
+elif menu == "Impor / Ekspor Data":
+    halaman_impor_ekspor()
+
+# Status penulisan di belakang (jurnal dan file stok): menunggu ditulis atau sudah tersimpan
+tampilkan_status_penyimpanan()
+
+# Panel debug di sidebar (?debug=1) dan keluaran metrik (METRIK_JSONL / METRIK_PROM)
+tampilkan_panel(metrik.selesai_rerun(menu))
@@ -0,0 +1,374 @@
+# Benchmark jalur panas kedua aplikasi tanpa UI Streamlit, pada data sintetis berukuran
+# 1k sampai 10M baris. Hasil (waktu, puncak memori, byte I/O) disimpan sebagai JSON dan
+# bisa dibandingkan dengan baseline:
+#
+#   python benchmarks/bench_aplikasi.py --ukuran 1000 100000 1000000 --keluaran hasil.json
+#   python benchmarks/bench_aplikasi.py --banding baseline.json --ambang 0.25
+#
+# Keluar dengan status 1 jika ada kasus yang lebih lambat dari baseline melebihi ambang.
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core import grafik, impor_ekspor, ledger, partisi, reporting, sales  # noqa: E402
+from core.dataset import DatasetBersama, TurunanDataset  # noqa: E402
+from core.inventaris import InventarisBersama  # noqa: E402
+from core.inventory import buat_katalog_stok, create_product_catalog, segarkan_stok  # noqa: E402
+from core.katalog import KatalogProduk  # noqa: E402
+from core.pencarian import IndeksProduk  # noqa: E402
+from core.penulis import penulis  # noqa: E402
+from core.penyimpanan import JurnalKeuangan, LedgerBulanan, LedgerSQLite, PenjualanSQLite, tulis_tabel  # noqa: E402
+from core.ringkasan import RingkasanBerjalan  # noqa: E402
+from core.skema import SKEMA_LEDGER  # noqa: E402
+from generator_data import buat_katalog, buat_ledger, buat_penjualan, pelanggan_sintetis, ulang_untuk_sku  # noqa: E402
+
+UKURAN_DEFAULT = [1_000, 10_000, 100_000, 1_000_000]
+# Kasus di bawah batas ini terlalu bising untuk dibandingkan dengan baseline
+DETIK_MINIMUM = 0.001
+
+
+# Byte yang dibaca/ditulis proses ini (Linux); None jika tidak tersedia
+def io_proses():
+    try:
+        with open("/proc/self/io") as f:
+            nilai = dict(baris.split(": ") for baris in f.read().splitlines())
+        return int(nilai["rchar"]), int(nilai["wchar"])
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+# ---- Kasus benchmark. Setiap kasus: siapkan(n, folder) -> state, lalu jalankan(state).
+# Kasus memanggil fungsi di paket core yang dipakai oleh halaman Streamlit.
+
+def siapkan_ledger(n, folder):
+    path = os.path.join(folder, "data_keuangan.arrow")
+    tulis_tabel(buat_ledger(n, seed=0), path)
+    jurnal = JurnalKeuangan(path)
+    data = jurnal.muat()
+    return {"data": data, "jurnal": jurnal, "ringkasan": RingkasanBerjalan.dari_ledger(data)}
+
+
+# Dataset bersama dengan satu sesi lain yang mengikuti versinya
+def siapkan_dataset(n, folder):
+    state = siapkan_ledger(n, folder)
+    state["dataset"] = DatasetBersama(state["jurnal"].muat, SKEMA_LEDGER)
+    state["sesi"] = TurunanDataset(state["dataset"], RingkasanBerjalan.dari_ledger, RingkasanBerjalan.tambah_ledger)
+    state["sesi"].ambil()
+    return state
+
+
+def komit_transaksi(state):
+    ledger.komit_transaksi(state["jurnal"], state["dataset"], "2024-01-01", "Gaji", "Pengeluaran", 50000, "")
+
+
+# Rerun sesi lain setelah satu commit: hanya baris baru yang diterapkan ke ringkasannya
+def sesi_ikut_komit(state):
+    komit_transaksi(state)
+    state["sesi"].ambil()
+
+
+def load_data(state):
+    JurnalKeuangan(state["jurnal"].path_snapshot).muat()
+
+
+def hitung_ringkasan(state):
+    return reporting.hitung_ringkasan(state["data"])
+
+
+def ringkasan_berjalan(state):
+    return state["ringkasan"].totals()
+
+
+def buat_laporan(state):
+    return reporting.buat_laporan(state["data"], "Rentang Tanggal", "2022-01-01", "2022-01-31")
+
+
+def laporan_bulanan(state):
+    return reporting.laporan_agregat(state["ringkasan"], "bulan", "2020-01-15", "2024-12-20", ["Tipe", "Kategori"])
+
+
+def siapkan_sqlite(n, folder):
+    penyimpanan = LedgerSQLite(os.path.join(folder, "data_keuangan.db"))
+    for chunk_awal in range(0, n, 1_000_000):
+        penyimpanan.tambah_data(buat_ledger(min(1_000_000, n - chunk_awal), seed=chunk_awal))
+    return {"ledger": penyimpanan, "data": penyimpanan.halaman(0, 1)}
+
+
+def buat_laporan_sqlite(state):
+    return reporting.buat_laporan(state["data"], "Rentang Tanggal", "2022-01-01", "2022-01-31", ledger=state["ledger"])
+
+
+# Ledger dipartisi per bulan dan sudah ditutup buku
+def siapkan_bulanan(n, folder):
+    penyimpanan = LedgerBulanan(os.path.join(folder, "bulanan"))
+    penyimpanan.tambah_data(buat_ledger(n, seed=0))
+    partisi.tutup_buku(penyimpanan)
+    return {"ledger": penyimpanan, "data": penyimpanan.query(tanggal_awal="2020-01-01", tanggal_akhir="2020-01-31")}
+
+
+def buat_laporan_bulanan(state):
+    return reporting.buat_laporan(state["data"], "Rentang Tanggal", "2022-01-01", "2022-01-31", ledger=state["ledger"])
+
+
+def ringkasan_partisi(state):
+    return partisi.ringkasan_partisi(state["ledger"])
+
+
+def tutup_buku(state):
+    return partisi.tutup_buku(state["ledger"], hitung_ulang=True)
+
+
+def buat_grafik(state):
+    grafik.kosongkan_cache()
+    reporting.grafik_keuangan(state["data"])
+
+
+def siapkan_impor(n, folder):
+    path = os.path.join(folder, "impor.csv")
+    impor_ekspor.tulis_chunk([buat_ledger(n, seed=0)], path)
+    return {"sumber": path, "folder": folder}
+
+
+# Setiap putaran mengimpor ke ledger kosong agar waktunya tidak bergantung putaran sebelumnya
+def impor_transaksi(state):
+    jurnal = JurnalKeuangan(os.path.join(state["folder"], "impor.arrow"))
+    jurnal.hapus()
+    impor_ekspor.impor_transaksi(state["sumber"], jurnal, RingkasanBerjalan())
+    jurnal.tutup()
+
+
+def siapkan_stok(n, folder):
+    produk = buat_katalog(ulang=ulang_untuk_sku(n), seed=0).head(n)
+    produk["IdProduk"] = produk["IdProduk"].astype(str)
+    inventaris = InventarisBersama(os.path.join(folder, "stok.db"))
+    inventaris.impor(produk["IdProduk"], [10**9] * len(produk))
+    katalog = KatalogProduk(produk, "IdProduk", "HargaProduk", "StokProduk")
+    segarkan_stok(katalog, inventaris)
+    return {"katalog": katalog, "inventaris": inventaris, "kode": produk["IdProduk"].iloc[len(produk) // 2]}
+
+
+# Pengurangan stok beserta sinkron katalog sesi yang dijalankan aplikasi di rerun berikutnya
+def kurangi_stok(state):
+    state["inventaris"].kurangi({state["kode"]: 1})
+    segarkan_stok(state["katalog"], state["inventaris"])
+
+
+# Kasir kedua aplikasi di folder sendiri: ledger n baris di dataset bersama dengan katalog
+# dan inventaris stok, serta riwayat n penjualan clothing dengan katalog dan inventarisnya
+def siapkan_kasir(n, folder):
+    folder = os.path.join(folder, "kasir")
+    os.makedirs(folder)
+    path = os.path.join(folder, "data_keuangan.arrow")
+    tulis_tabel(buat_ledger(n, seed=0), path)
+    jurnal = JurnalKeuangan(path)
+    dataset = DatasetBersama(jurnal.muat, SKEMA_LEDGER)
+    dataset.snapshot()
+
+    produk = buat_katalog(seed=0)
+    stok = produk.rename(columns={
+        "IdProduk": "Kode Produk", "JenisProduk": "Produk", "NamaProduk": "Merek",
+        "HargaProduk": "Harga", "StokProduk": "Stok",
+    })
+    stok["Kode Produk"] = "P" + stok["Kode Produk"].astype(str)
+    inventaris_stok = InventarisBersama(os.path.join(folder, "stok.db"))
+    inventaris_stok.impor(stok["Kode Produk"], [10**9] * len(stok))
+    katalog_stok = buat_katalog_stok(stok)
+    segarkan_stok(katalog_stok, inventaris_stok)
+
+    inventaris = InventarisBersama(os.path.join(folder, "clothing_stock.db"))
+    inventaris.impor(produk["IdProduk"], [10**9] * len(produk))
+    katalog = create_product_catalog(produk.copy())
+    segarkan_stok(katalog, inventaris)
+    riwayat = PenjualanSQLite(os.path.join(folder, "penjualan.db"))
+    riwayat.tambah_data(pd.concat(buat_penjualan(produk, n, pelanggan=pelanggan_sintetis(1000), seed=0), ignore_index=True))
+    return {
+        "jurnal": jurnal, "dataset": dataset, "katalog_stok": katalog_stok, "inventaris_stok": inventaris_stok,
+        "keranjang_stok": dict.fromkeys(stok["Kode Produk"].iloc[:3], 1),
+        "katalog": katalog, "inventaris": inventaris, "riwayat": riwayat, "ringkasan": sales.sales_summary(riwayat),
+        "keranjang": dict.fromkeys(produk["IdProduk"].iloc[:3].tolist(), 1),
+    }
+
+
+# Satu keranjang tiga produk di halaman penjualan PencatatanKeuangan: stok, ledger, katalog
+def catat_penjualan(state):
+    sales.catat_penjualan(
+        state["jurnal"], state["dataset"], state["katalog_stok"], state["inventaris_stok"],
+        "2024-01-01", state["keranjang_stok"], "Penjualan",
+    )
+
+
+# Satu keranjang tiga produk di Sales Transaction clothing: stok, riwayat, ringkasan
+def sell_basket(state):
+    sales.sell_basket(
+        state["katalog"], state["inventaris"], state["riwayat"], state["ringkasan"],
+        state["keranjang"], "2024-01-01", 1,
+    )
+
+
+# Katalog berukuran n untuk pencarian produk di keranjang
+def siapkan_pencarian(n, folder):
+    produk = buat_katalog(ulang=ulang_untuk_sku(n), seed=0).head(n)
+    return {"indeks": IndeksProduk(produk, "IdProduk", ["NamaProduk", "JenisProduk", "UkuranProduk", "WarnaProduk"])}
+
+
+# Satu kueri type-ahead diketik huruf demi huruf, k = 10 hasil per huruf
+def cari_produk(state):
+    for kueri in ("j", "je", "jea", "jean", "jeans", "jeans h", "jeans hi", "jeans hit"):
+        state["indeks"].cari(kueri, 10)
+
+
+def siapkan_penjualan(n, folder):
+    produk = buat_katalog(seed=0)
+    penjualan = pd.concat(buat_penjualan(produk, n, pelanggan=pelanggan_sintetis(1000), seed=0), ignore_index=True)
+    riwayat = PenjualanSQLite(os.path.join(folder, "penjualan.db"))
+    riwayat.tambah_data(penjualan)
+    ringkasan = RingkasanBerjalan()
+    ringkasan.tambah_penjualan(penjualan)
+    return {
+        "produk": produk, "penjualan": penjualan, "riwayat": riwayat, "ringkasan": ringkasan,
+        "katalog": KatalogProduk(produk, "IdProduk", "HargaProduk", "StokProduk"),
+    }
+
+
+def dashboard_top10(state):
+    return reporting.top_products(state["ringkasan"], state["katalog"])
+
+
+def customer_sales(state):
+    return reporting.customer_sales(state["riwayat"], "ctm500")
+
+
+def sales_report(state):
+    return reporting.sales_over_time(state["ringkasan"], "hari", datetime(2022, 3, 1), datetime(2022, 5, 31))
+
+
+KASUS = {
+    "komit_transaksi": (siapkan_dataset, komit_transaksi),
+    "sesi_ikut_komit": (siapkan_dataset, sesi_ikut_komit),
+    "load_data": (siapkan_ledger, load_data),
+    "hitung_ringkasan": (siapkan_ledger, hitung_ringkasan),
+    "ringkasan_berjalan": (siapkan_ledger, ringkasan_berjalan),
+    "buat_laporan": (siapkan_ledger, buat_laporan),
+    "laporan_bulanan": (siapkan_ledger, laporan_bulanan),
+    "buat_laporan_sqlite": (siapkan_sqlite, buat_laporan_sqlite),
+    "buat_laporan_bulanan": (siapkan_bulanan, buat_laporan_bulanan),
+    "ringkasan_partisi": (siapkan_bulanan, ringkasan_partisi),
+    "tutup_buku": (siapkan_bulanan, tutup_buku),
+    "buat_grafik": (siapkan_ledger, buat_grafik),
+    "impor_transaksi": (siapkan_impor, impor_transaksi),
+    "kurangi_stok": (siapkan_stok, kurangi_stok),
+    "catat_penjualan": (siapkan_kasir, catat_penjualan),
+    "sell_basket": (siapkan_kasir, sell_basket),
+    "cari_produk": (siapkan_pencarian, cari_produk),
+    "dashboard_top10": (siapkan_penjualan, dashboard_top10),
+    "customer_sales": (siapkan_penjualan, customer_sales),
+    "sales_report": (siapkan_penjualan, sales_report),
+}
+
+
+def ukur(jalankan, state, ulang):
+    waktu = []
+    for _ in range(ulang):
+        mulai = time.perf_counter()
+        jalankan(state)
+        waktu.append(time.perf_counter() - mulai)
+
+    # Satu putaran tambahan untuk memori puncak dan I/O (tracemalloc memperlambat)
+    io_awal = io_proses()
+    tracemalloc.start()
+    jalankan(state)
+    _, puncak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    io_akhir = io_proses()
+
+    return {
+        "detik": statistics.median(waktu),
+        "detik_min": min(waktu),
+        "puncak_mb": puncak / 2**20,
+        "io_baca": io_akhir[0] - io_awal[0] if io_awal else None,
+        "io_tulis": io_akhir[1] - io_awal[1] if io_awal else None,
+    }
+
+
+def jalankan_semua(kasus, ukuran, ulang):
+    hasil = []
+    for n in ukuran:
+        # State dipakai bersama oleh kasus dengan fungsi siapkan yang sama
+        cache_state = {}
+        with tempfile.TemporaryDirectory() as folder:
+            # File yang ditulis aplikasi dengan path relatif (misalnya tabel stok) masuk ke folder sementara
+            folder_awal = os.getcwd()
+            os.chdir(folder)
+            try:
+                for nama in kasus:
+                    siapkan, jalankan = KASUS[nama]
+                    if siapkan not in cache_state:
+                        cache_state[siapkan] = siapkan(n, folder)
+                    baris = {"kasus": nama, "baris": n, **ukur(jalankan, cache_state[siapkan], ulang)}
+                    print(f"{nama:<22} {n:>10}  {baris['detik'] * 1000:>10.2f} ms  {baris['puncak_mb']:>8.1f} MB")
+                    hasil.append(baris)
+                penulis.tunggu()
+            finally:
+                os.chdir(folder_awal)
+    return hasil
+
+
+# Bandingkan dengan baseline; kembalikan daftar kasus yang melambat melebihi ambang
+def banding(hasil, baseline, ambang):
+    lama = {(b["kasus"], b["baris"]): b for b in baseline["hasil"]}
+    regresi = []
+    for b in hasil:
+        acuan = lama.get((b["kasus"], b["baris"]))
+        if acuan is None or acuan["detik"] < DETIK_MINIMUM:
+            continue
+        rasio = b["detik"] / acuan["detik"]
+        if rasio > 1 + ambang:
+            regresi.append((b["kasus"], b["baris"], rasio))
+    return regresi
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--ukuran", type=int, nargs="+", default=UKURAN_DEFAULT)
+    parser.add_argument("--kasus", nargs="+", choices=list(KASUS), default=list(KASUS))
+    parser.add_argument("--ulang", type=int, default=5)
+    parser.add_argument("--keluaran", default="bench_hasil.json")
+    parser.add_argument("--banding", help="file JSON baseline")
+    parser.add_argument("--ambang", type=float, default=0.25, help="batas perlambatan relatif, misalnya 0.25 = 25%%")
+    args = parser.parse_args()
+
+    hasil = jalankan_semua(args.kasus, args.ukuran, args.ulang)
+    with open(args.keluaran, "w") as f:
+        json.dump({
+            "meta": {
+                "waktu": datetime.now().isoformat(timespec="seconds"),
+                "python": platform.python_version(),
+                "pandas": pd.__version__,
+                "mesin": platform.platform(),
+            },
+            "hasil": hasil,
+        }, f, indent=2)
+    print(f"Hasil disimpan ke {args.keluaran}")
+
+    if args.banding:
+        with open(args.banding) as f:
+            regresi = banding(hasil, json.load(f), args.ambang)
+        for nama, n, rasio in regresi:
+            print(f"REGRESI {nama} ({n} baris): {rasio:.2f}x lebih lambat")
+        if regresi:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
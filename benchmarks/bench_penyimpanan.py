@@ -0,0 +1,73 @@
+# Bandingkan waktu muat dan RSS ledger dalam format CSV, Arrow (memory map) dan Parquet.
+#
+#   python benchmarks/bench_penyimpanan.py --baris 1000000
+#
+# Setiap pemuatan dijalankan di proses terpisah agar waktu start dan RSS-nya bersih.
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from generator_data import buat_ledger  # noqa: E402
+from core.penyimpanan import FORMAT, JurnalKeuangan, tulis_tabel  # noqa: E402
+
+
+# Puncak RSS proses ini dalam MB. ru_maxrss ikut terbawa dari proses induk saat exec,
+# jadi di Linux dipakai VmHWM yang direset untuk setiap proses baru.
+def puncak_rss():
+    try:
+        with open("/proc/self/status") as f:
+            for baris in f:
+                if baris.startswith("VmHWM:"):
+                    return int(baris.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def muat_di_proses_ini(path):
+    mulai = time.perf_counter()
+    data = JurnalKeuangan(path).muat()
+    durasi = time.perf_counter() - mulai
+    print(f"{durasi:.4f} {puncak_rss():.1f} {len(data)}")
+
+
+def ukur(path):
+    hasil = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--muat", path],
+        check=True, capture_output=True, text=True,
+    )
+    durasi, rss, baris = hasil.stdout.split()
+    return float(durasi), float(rss), int(baris)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--baris", type=int, default=1_000_000)
+    parser.add_argument("--format", nargs="+", default=list(FORMAT))
+    parser.add_argument("--muat", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.muat:
+        muat_di_proses_ini(args.muat)
+        return
+
+    data = buat_ledger(args.baris, seed=0)
+    with tempfile.TemporaryDirectory() as folder:
+        print(f"{'format':<8} {'ukuran (MB)':>12} {'muat (s)':>10} {'RSS (MB)':>10}")
+        for nama in args.format:
+            path = os.path.join(folder, f"data_keuangan.{nama}")
+            tulis_tabel(data, path)
+            ukuran = os.path.getsize(path) / 2**20
+            durasi, rss, baris = ukur(path)
+            assert baris == len(data)
+            print(f"{nama:<8} {ukuran:>12.1f} {durasi:>10.3f} {rss:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+# Uji beban inventaris bersama: beberapa proses menjual dari stok yang sama secara
+# bersamaan, lalu diperiksa bahwa tidak ada penjualan yang hilang dan stok tidak
+# pernah terjual melebihi jumlah awal.
+#
+#   python benchmarks/stress_inventaris.py --proses 8 --percobaan 500
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import Counter
+from multiprocessing import Pool
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.inventaris import InventarisBersama, StokTidakCukup  # noqa: E402
+
+
+def kasir(args):
+    path_db, kode, percobaan, seed = args
+    rng = random.Random(seed)
+    inventaris = InventarisBersama(path_db)
+    terjual = Counter()
+    for _ in range(percobaan):
+        keranjang = {k: rng.randint(1, 3) for k in rng.sample(kode, rng.randint(1, 3))}
+        try:
+            inventaris.kurangi(keranjang)
+        except StokTidakCukup:
+            continue
+        terjual.update(keranjang)
+    return terjual
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--proses", type=int, default=8)
+    parser.add_argument("--percobaan", type=int, default=500)
+    parser.add_argument("--produk", type=int, default=5)
+    parser.add_argument("--stok", type=int, default=300)
+    args = parser.parse_args()
+
+    kode = [f"P{i + 1:03d}" for i in range(args.produk)]
+    with tempfile.TemporaryDirectory() as folder:
+        path_db = os.path.join(folder, "stok.db")
+        inventaris = InventarisBersama(path_db)
+        inventaris.impor(kode, [args.stok] * len(kode))
+
+        mulai = time.perf_counter()
+        with Pool(args.proses) as pool:
+            hasil = pool.map(kasir, [(path_db, kode, args.percobaan, seed) for seed in range(args.proses)])
+        durasi = time.perf_counter() - mulai
+
+        terjual = sum(hasil, Counter())
+        akhir = inventaris.semua()
+
+    gagal = False
+    for k in kode:
+        cocok = args.stok - terjual[k] == akhir[k]
+        print(f"{k}: terjual {terjual[k]:>5}  sisa {akhir[k]:>5}  {'OK' if cocok and akhir[k] >= 0 else 'SALAH'}")
+        gagal |= not cocok or akhir[k] < 0
+
+    transaksi = args.proses * args.percobaan
+    print(f"{transaksi} percobaan dalam {durasi:.2f} s ({transaksi / durasi:.0f}/s)")
+    if gagal:
+        sys.exit("Stok tidak konsisten: ada penjualan yang hilang atau oversell")
+
+
+if __name__ == "__main__":
+    main()
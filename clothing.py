@@ -1,115 +1,111 @@
+import io
 import streamlit as st
 import pandas as pd
-import random
 from datetime import datetime
-import matplotlib.pyplot as plt
-
-# Generate Product Data
-def generate_product_data():
-    product_data = []
-    jenis_produk = [
-        "T-Shirts", "Jackets", "Flannel", "Sweater", "Jeans", "Shorts", "Chinos", "Sweat Pants"
-    ]
-    nama_produk = {
-        "T-Shirts": ["Short Sleeve", "Long Sleeve", "AIRism Cotton", "Cotton"],
-        "Jackets": ["Reversible Parka", "Pocketable UV Protection Parka", "BLOCKTECH Parka 3D Cut", "Zip Ip Blouson"],
-        "Flannel": ["Flannel Shirt Long Sleeve", "Flannel Long Sleeve Checked", "Flannel Long Sleeve"],
-        "Sweater": ["Crew Neck Long Sleeve Sweater", "Polo Sweater Short Sleeve", "3D Knit Crew Neck Sweater", "Waffle V Neck Sweater"],
-        "Jeans": ["Wide Tapered Jeans", "Straight Jeans", "Slim Fit Jeans", "Ultra Stretch Skinny Fit Jeans"],
-        "Shorts": ["Stretch Slim Fit Shorts", "Geared Shorts", "Ultra Stretch Shorts", "Cargo Shorts"],
-        "Chinos": ["Slim Fit Chino Pants", "Pleated Wide Chino Pants", "Wide Fit Chino Pants", "Chino Shorts"],
-        "Sweat Pants": ["Sweat Pants", "Sweat Wide Pants", "Ultra Stretch Sweat Shorts"]
-    }
-    ukuran_produk = ["Small", "Medium", "Large"]
-    warna_produk = ["Hijau", "Hitam", "Putih"]
-
-    id_counter = 1
-    for jenis in jenis_produk:
-        for nama in nama_produk[jenis]:
-            for ukuran in ukuran_produk:
-                for warna in warna_produk:
-                    product_data.append({
-                        "IdProduk": id_counter,
-                        "JenisProduk": jenis,
-                        "NamaProduk": nama,
-                        "UkuranProduk": ukuran,
-                        "WarnaProduk": warna,
-                        "HargaProduk": random.randint(100000, 300000),
-                        "StokProduk": 100
-                    })
-                    id_counter += 1
-    return pd.DataFrame(product_data)
-
-# Generate Fixed Expenses
-def generate_fixed_expenses():
-    return {
-        "Gaji Karyawan": 15000000,
-        "Bahan Baku": 10000000,
-        "Utilitas": 5000000,
-        "Advertising": 5000000,
-        "Asuransi": 2000000
-    }
+from core import metrik
+from core.expenses import VARIABLE_EXPENSE_TYPES, expense_totals, generate_fixed_expenses, record_variable_expense
+from core.impor_ekspor import FORMAT_FILE, ekspor_penjualan, format_file, impor_penjualan
+from core.inventory import (
+    CLOTHING_INVENTORY_DB, InventarisBersama, StokTidakCukup, add_product, create_product_catalog,
+    generate_product_data, restock_product, segarkan_stok,
+)
+from core.partisi import tutup_buku_terpisah
+from core.pencarian import IndeksProduk
+from core.reporting import customer_sales, earnings_by_product, sales_over_time, top_products
+from core.sales import add_customer, default_customers, open_sales, sales_summary, sell_basket, simulate_sales, sync_summary
+from core.grafik import grafik_pie
+from keranjang import keranjang_belanja, kosongkan_keranjang, pilih_produk
+from paginasi import halaman_dataframe, tabel_berhalaman
+from panel_metrik import tampilkan_panel
+
+# Sales report grouping -> report cube granularity
+REPORT_GRANULARITY = {"Day": "hari", "Week": "minggu", "Month": "bulan"}
+
+# Leaderboard windows in days (None = all time)
+TOP_WINDOWS = {"All time": None, "Today": 1, "7 days": 7, "30 days": 30}
+
+# Product columns searched by the cart and restock search boxes
+SEARCH_COLUMNS = ["NamaProduk", "JenisProduk", "UkuranProduk", "WarnaProduk"]
+
+# Product label in search results and cart lines
+def product_label(product_id):
+    katalog = st.session_state.katalog
+    product = katalog.baris(product_id)
+    return (
+        f"{product_id} - {product['NamaProduk']} ({product['UkuranProduk']}, {product['WarnaProduk']})"
+        f" - Rp {product['HargaProduk']:,}, stock {product['StokProduk']}"
+    )
+
+@st.cache_resource
+def get_inventory():
+    return InventarisBersama(CLOTHING_INVENTORY_DB)
+
+# Persistent sales history, indexed by product, customer and date
+@st.cache_resource
+def get_sales():
+    return open_sales()
 
 # Main App
 def main():
+    metrik.mulai_rerun("clothing")
     st.title("Clothing Business Management")
 
     # Initialize session state
-    if "product_data" not in st.session_state:
-        st.session_state.product_data = generate_product_data()
-    if "sales_history" not in st.session_state:
-        st.session_state.sales_history = []
+    if "katalog" not in st.session_state:
+        # Product catalog with an IdProduk -> row index; product_data is its table
+        st.session_state.katalog = create_product_catalog(generate_product_data())
+        st.session_state.product_data = st.session_state.katalog.data
+        get_inventory().impor(st.session_state.product_data["IdProduk"], st.session_state.product_data["StokProduk"])
+        # Search index over name, type, size and color for the cart and restock search
+        st.session_state.indeks = IndeksProduk(st.session_state.product_data, "IdProduk", SEARCH_COLUMNS)
     if "fixed_expenses" not in st.session_state:
         st.session_state.fixed_expenses = generate_fixed_expenses()
     if "variable_expenses" not in st.session_state:
         st.session_state.variable_expenses = []
+    if "ringkasan" not in st.session_state:
+        # Running totals, started from the stored sales and updated as each variable
+        # expense is recorded; sales are synced from the store on every rerun
+        st.session_state.ringkasan = sales_summary(get_sales())
     if "customers" not in st.session_state:
         # Predefined customers
-        st.session_state.customers = {
-            "ctm1": "John Doe",
-            "ctm2": "Jane Smith",
-            "ctm3": "Alice Brown",
-            "ctm4": "Bob White"
-        }
-    product_data = st.session_state.product_data
-    sales_history = st.session_state.sales_history
+        st.session_state.customers = default_customers()
+    katalog = st.session_state.katalog
+    product_data = katalog.data
+    inventory = get_inventory()
+    with metrik.ukur("app.sync_stock"):
+        segarkan_stok(katalog, inventory)
+    sales = get_sales()
     fixed_expenses = st.session_state.fixed_expenses
     variable_expenses = st.session_state.variable_expenses
     customers = st.session_state.customers
+    ringkasan = st.session_state.ringkasan
+    # Sales recorded by other sessions (or imports) since the last rerun
+    with metrik.ukur("app.sync_sales"):
+        sync_summary(ringkasan, sales)
 
     # Sidebar menu
-    menu = ["Dashboard", "All Products", "Sales Transaction", "Sales Report", "Expenses", "All Customer"]
+    menu = ["Dashboard", "All Products", "Sales Transaction", "Sales Report", "Expenses", "All Customer", "Import / Export"]
     choice = st.sidebar.selectbox("Menu", menu)
 
     if choice == "Dashboard":
-        st.subheader("Top 10 Products by Sales")
-        # Simulate random sales data for the top 10 products
-        if not sales_history:
-            for _ in range(50):
-                random_product = random.choice(product_data["IdProduk"].values)
-                random_quantity = random.randint(1, 5)
-                product_index = product_data[product_data["IdProduk"] == random_product].index[0]
-                sales_history.append({
-                    "Date": datetime.now(),
-                    "IdProduk": random_product,
-                    "NamaProduk": product_data.loc[product_index, "NamaProduk"],
-                    "Quantity": random_quantity,
-                    "TotalPrice": random_quantity * product_data.loc[product_index, "HargaProduk"]
-                })
-
-        sales_df = pd.DataFrame(sales_history)
-        top_products = sales_df.groupby("IdProduk")["Quantity"].sum().sort_values(ascending=False).head(10)
-        top_products_df = product_data[product_data["IdProduk"].isin(top_products.index)]
-        top_products_df = top_products_df.merge(top_products, on="IdProduk")
-        top_products_df = top_products_df.rename(columns={"Quantity": "Total Quantity Sold"})
-        st.dataframe(top_products_df)
+        # Demo sales go into the store only when asked for
+        if sales.kosong():
+            st.info("No sales recorded yet.")
+            if st.button("Load demo sales"):
+                simulate_sales(product_data, sales)
+                sync_summary(ringkasan, sales)
+
+        col1, col2 = st.columns(2)
+        top_k = col1.selectbox("Show", [5, 10, 20, 50], index=1)
+        window = col2.radio("Period", list(TOP_WINDOWS), horizontal=True)
+        st.subheader(f"Top {top_k} Products by Sales")
+        # Served from the leaderboard maintained as sales are recorded
+        st.dataframe(top_products(ringkasan, katalog, top_k, TOP_WINDOWS[window]))
 
         # Financial Summary
         st.subheader("Financial Summary")
-        total_earnings = sales_df["TotalPrice"].sum() if not sales_df.empty else 0
-        total_fixed_expenses = sum(fixed_expenses.values())
-        total_variable_expenses = sum(item["Amount"] for item in variable_expenses)
-        total_expenses = total_fixed_expenses + total_variable_expenses
+        total_earnings = ringkasan.total["Pemasukan"]
+        total_fixed_expenses, total_variable_expenses, total_expenses = expense_totals(fixed_expenses, ringkasan)
 
         st.metric("Total Earnings", f"Rp {total_earnings:,}")
         st.metric("Total Expenses", f"Rp {total_expenses:,}")
@@ -118,15 +114,18 @@ def main():
         st.subheader("Earnings vs Expenses")
         labels = ["Earnings", "Fixed Expenses", "Variable Expenses"]
         values = [total_earnings, total_fixed_expenses, total_variable_expenses]
-        fig, ax = plt.subplots()
-        ax.pie(values, labels=labels, autopct="%1.1f%%", startangle=90, textprops={"color": "white"})
-        ax.axis("equal")  # Equal aspect ratio ensures the pie is drawn as a circle.
-        fig.patch.set_alpha(0)  # Transparent background
-        st.pyplot(fig)
+        # Rendered once per distinct set of values and served from the shared chart cache
+        chart = grafik_pie(values, labels)
+        with metrik.ukur("app.show_image"):
+            st.image(chart)
 
     elif choice == "All Products":
         st.subheader("All Products")
-        st.dataframe(product_data)
+        tabel_berhalaman(
+            "products",
+            lambda offset, limit, sort, descending: halaman_dataframe(product_data, offset, limit, sort, descending),
+            len(product_data), ["IdProduk", "HargaProduk", "StokProduk"], menurun=False, bahasa="en"
+        )
 
         st.subheader("Low Stock Alerts")
         low_stock_threshold = 20
@@ -138,18 +137,17 @@ def main():
             st.success("All products have sufficient stock.")
 
         st.subheader("Update Product Stock")
+        product_id = pilih_produk("restock", st.session_state.indeks, product_label, bahasa="en")
         with st.form("update_stock_form"):
-            product_id = st.number_input("Enter Product ID", min_value=1, max_value=len(product_data), step=1)
             additional_stock = st.number_input("Additional Stock", min_value=1, step=1)
             submit_update_stock = st.form_submit_button("Update Stock")
 
         if submit_update_stock:
-            product_index = product_data[product_data["IdProduk"] == product_id].index
-            if not product_index.empty:
-                product_data.loc[product_index, "StokProduk"] += additional_stock
+            if product_id in katalog:
+                restock_product(katalog, inventory, product_id, additional_stock)
                 st.success(f"Stock for Product ID {product_id} updated successfully!")
             else:
-                st.error("Product ID not found!")
+                st.error("Search for a product first!")
 
         st.subheader("Add New Product")
         with st.form("add_product_form"):
@@ -162,22 +160,17 @@ def main():
             submit_new_product = st.form_submit_button("Add Product")
 
         if submit_new_product:
-            new_id = product_data["IdProduk"].max() + 1
-            new_product = {
-                "IdProduk": new_id,
-                "JenisProduk": jenis_produk,
-                "NamaProduk": nama_produk,
-                "UkuranProduk": ukuran_produk,
-                "WarnaProduk": warna_produk,
-                "HargaProduk": harga_produk,
-                "StokProduk": stok_produk
-            }
-            st.session_state.product_data = pd.concat([product_data, pd.DataFrame([new_product])], ignore_index=True)
+            new_id = add_product(katalog, inventory, jenis_produk, nama_produk, ukuran_produk, warna_produk, harga_produk, stok_produk)
+            st.session_state.indeks.tambah(katalog.baris(new_id).to_dict())
             st.success(f"Product {nama_produk} has been added successfully!")
             
     elif choice == "Sales Transaction":
         st.subheader("Add Sales Transaction")
 
+        # Products are found through the search index; only the cart lines become inputs
+        st.markdown("**Cart**")
+        basket = keranjang_belanja("cart", st.session_state.indeks, product_label, bahasa="en")
+
         # Radio button to select new or existing customer
         customer_type = st.radio("Select Customer Type", ["New Customer", "Existing Customer"])
 
@@ -185,8 +178,7 @@ def main():
             if customer_type == "New Customer":
                 customer_name = st.text_input("Enter Customer Name")
                 if st.form_submit_button("Add New Customer"):
-                    new_customer_id = f"ctm{len(customers) + 1}"
-                    customers[new_customer_id] = customer_name
+                    new_customer_id = add_customer(customers, customer_name)
                     st.session_state.customers = customers
                     customer_id = new_customer_id
                     st.success(f"New customer {customer_name} added with ID {new_customer_id}")
@@ -194,44 +186,35 @@ def main():
                 customer_id = st.selectbox("Select Existing Customer ID", list(customers.keys()))
 
             # Input transaction details
-            product_id = st.number_input("Enter Product ID", min_value=1, max_value=len(product_data), step=1)
-            quantity = st.number_input("Enter Quantity Sold", min_value=1, step=1)
             transaction_date = st.date_input("Select Transaction Date", value=datetime.now().date())
             submit = st.form_submit_button("Submit")
 
         if submit:
-            product_index = product_data[product_data["IdProduk"] == product_id].index
-            if product_index.empty:
-                st.error("Product ID not found!")
+            if not any(quantity > 0 for quantity in basket.values()):
+                st.error("The cart is empty!")
             else:
-                if product_data.loc[product_index, "StokProduk"].values[0] >= quantity:
-                    product_data.loc[product_index, "StokProduk"] -= quantity
-                    sales_history.append({
-                        "Date": pd.Timestamp(transaction_date),
-                        "IdProduk": product_id,
-                        "NamaProduk": product_data.loc[product_index, "NamaProduk"].values[0],
-                        "Quantity": quantity,
-                        "TotalPrice": quantity * product_data.loc[product_index, "HargaProduk"].values[0],
-                        "CustomerId": customer_id
-                    })
-                    st.success("Transaction Successful!")
+                try:
+                    sell_basket(katalog, inventory, sales, ringkasan, basket, transaction_date, customer_id)
+                except StokTidakCukup as e:
+                    st.error(f"Insufficient stock for {product_label(e.kode)}!")
                 else:
-                    st.error("Insufficient stock!")
+                    kosongkan_keranjang("cart")
+                    st.success("Transaction Successful!")
 
         st.subheader("Sales History")
-        sales_df = pd.DataFrame(sales_history)
-        if not sales_df.empty:
-            st.dataframe(sales_df)
+        if not sales.kosong():
+            tabel_berhalaman(
+                "sales_history",
+                lambda offset, limit, sort, descending: sales.halaman(offset, limit, sort, descending),
+                sales.hitung(), ["Date", "TotalPrice", "Quantity"], bahasa="en"
+            )
         else:
             st.info("No sales history available.")
 
     elif choice == "Sales Report":
         st.subheader("Sales Report")
-        sales_df = pd.DataFrame(sales_history)
-        if not sales_df.empty:
-            total_sales = sales_df.groupby("IdProduk")["TotalPrice"].sum().reset_index()
-            total_sales = total_sales.merge(product_data, on="IdProduk")[["IdProduk", "JenisProduk", "NamaProduk", "WarnaProduk", "TotalPrice"]]
-            total_sales = total_sales.rename(columns={"TotalPrice": "Total Earnings"})
+        if not sales.kosong():
+            total_sales = earnings_by_product(ringkasan, product_data)
 
             st.subheader("Total Earnings by Product")
             st.dataframe(total_sales)
@@ -239,16 +222,20 @@ def main():
             st.subheader("Sales Over Time")
             date_option = st.radio("Select Report Type", ["Daily", "Date Range"])
 
+            # Totals come from the report cube; long ranges read monthly/weekly cells
             if date_option == "Daily":
-                selected_date = st.date_input("Select Date", value=datetime.now().date())
-                filtered_sales = sales_df[sales_df["Date"].dt.date == selected_date]
+                start_date = end_date = st.date_input("Select Date", value=datetime.now().date())
+                granularity = "hari"
             else:
                 start_date = st.date_input("Start Date", value=datetime.now().date())
                 end_date = st.date_input("End Date", value=datetime.now().date())
-                filtered_sales = sales_df[(sales_df["Date"].dt.date >= start_date) & (sales_df["Date"].dt.date <= end_date)]
+                granularity = REPORT_GRANULARITY[st.selectbox("Group By", list(REPORT_GRANULARITY))]
+            period_sales = sales_over_time(ringkasan, granularity, start_date, end_date)
 
-            if not filtered_sales.empty:
-                st.bar_chart(filtered_sales.groupby(filtered_sales["Date"].dt.date)["TotalPrice"].sum())
+            if not period_sales.empty:
+                st.bar_chart(period_sales)
+                if st.checkbox("Break down by product"):
+                    st.dataframe(sales_over_time(ringkasan, granularity, start_date, end_date, by_product=True))
             else:
                 st.info("No sales data available for the selected period.")
         else:
@@ -272,23 +259,19 @@ def main():
 
         st.subheader("Add Variable Expense")
         with st.form("add_variable_expense_form"):
-            expense_type = st.selectbox("Expense Type", ["Peralatan", "Bangunan", "Cetakan"])
+            expense_type = st.selectbox("Expense Type", VARIABLE_EXPENSE_TYPES)
             expense_amount = st.number_input("Expense Amount", min_value=0, step=1000)
             add_expense = st.form_submit_button("Add Expense")
 
         if add_expense:
-            variable_expenses.append({"Expense Type": expense_type, "Amount": expense_amount})
+            record_variable_expense(variable_expenses, ringkasan, expense_type, expense_amount)
             st.success(f"Expense {expense_type} of Rp {expense_amount:,} added successfully!")
 
         # Expense Breakdown Chart
         st.subheader("Expense Breakdown")
         expense_labels = ["Fixed Expenses", "Variable Expenses"]
-        expense_values = [sum(fixed_expenses.values()), sum(item["Amount"] for item in variable_expenses)]
-        fig, ax = plt.subplots()
-        ax.pie(expense_values, labels=expense_labels, autopct="%1.1f%%", startangle=90, textprops={"color": "white"})
-        ax.axis("equal")  # Equal aspect ratio ensures the pie is drawn as a circle.
-        fig.patch.set_alpha(0)  # Transparent background
-        st.pyplot(fig)
+        expense_values = list(expense_totals(fixed_expenses, ringkasan)[:2])
+        st.image(grafik_pie(expense_values, expense_labels))
 
     elif choice == "All Customer":
         st.subheader("All Customers")
@@ -299,8 +282,7 @@ def main():
         customer_id_input = st.text_input("Enter Customer ID to view purchase history")
 
         if customer_id_input in customers:
-            customer_sales = [sale for sale in sales_history if sale.get("CustomerId") == customer_id_input]
-            customer_sales_df = pd.DataFrame(customer_sales)
+            customer_sales_df = customer_sales(sales, customer_id_input)
             if not customer_sales_df.empty:
                 st.dataframe(customer_sales_df)
             else:
@@ -308,5 +290,54 @@ def main():
         else:
             st.info("Customer ID not found.")
 
+    elif choice == "Import / Export":
+        st.subheader("Import Sales")
+        st.caption("Columns: Date, IdProduk, Quantity, TotalPrice (optional), CustomerId (optional)")
+        sales_file = st.file_uploader("Sales file", type=["csv", "jsonl", "json", "parquet"])
+        # Old POS history usually should not touch today's stock
+        take_stock = st.checkbox("Take the sold quantities from stock", value=False)
+        if sales_file is not None and st.button("Import"):
+            try:
+                result = impor_penjualan(
+                    sales_file, katalog, sales.tambah_data,
+                    inventaris=inventory if take_stock else None, format=format_file(sales_file.name)
+                )
+                sync_summary(ringkasan, sales)
+            except ValueError as e:
+                st.error(f"Import cancelled: {e}")
+            else:
+                st.success(f"{result['diterima']:,} sales imported in {result['chunk']} chunk(s).")
+                if result["ditolak"]:
+                    st.warning(f"{result['ditolak']:,} rows rejected. Sample of the rejected rows:")
+                    st.dataframe(result["contoh_ditolak"])
+
+        st.subheader("Export Sales")
+        start_date = st.date_input("Start Date", value=datetime.now().date().replace(day=1), key="export_start")
+        end_date = st.date_input("End Date", value=datetime.now().date(), key="export_end")
+        export_format = st.selectbox("Format", FORMAT_FILE)
+        if st.button("Prepare Export"):
+            export_file = io.BytesIO()
+            total = ekspor_penjualan(sales, export_file, start_date, end_date, format=export_format)
+            st.info(f"{total:,} sales ready to download.")
+            st.download_button(
+                "Download", export_file.getvalue(),
+                file_name=f"sales_{start_date}_{end_date}.{export_format}",
+            )
+
+        # Seals the summary of every finished month so new sessions only read open months
+        st.subheader("Month-End Close")
+        st.caption("Months closed: " + (", ".join(sales.ringkasan_tersegel.daftar()) or "none"))
+        recompute = st.checkbox("Recompute closed months", value=False)
+        if st.button("Close Months"):
+            try:
+                closed = tutup_buku_terpisah(sales, hitung_ulang=recompute)
+            except RuntimeError as e:
+                st.error(f"Month-end close failed: {e}")
+            else:
+                st.success(f"{len(closed)} month(s) closed.")
+
+    # Debug panel in the sidebar (?debug=1) and metrics output (METRIK_JSONL / METRIK_PROM)
+    tampilkan_panel(metrik.selesai_rerun(choice), bahasa="en")
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,9 @@
+# Logika bisnis kedua aplikasi tanpa Streamlit, bisa dipakai dari CLI atau batch:
+#
+#   ledger      penyimpanan ledger dan pencatatan transaksi
+#   inventory   stok produk dan katalog
+#   sales       pencatatan penjualan
+#   expenses    pengeluaran tetap dan variabel
+#   reporting   ringkasan, laporan dan grafik
+#
+# pandas dan matplotlib baru dimuat saat pertama kali dipakai.
@@ -0,0 +1,15 @@
+import importlib
+
+
+# Modul yang baru diimpor saat atributnya pertama kali dipakai, sehingga `import core`
+# tidak ikut memuat pandas/numpy untuk perintah yang tidak membutuhkannya
+class ModulMalas:
+    def __init__(self, nama):
+        self._nama = nama
+
+    def __getattr__(self, atribut):
+        return getattr(importlib.import_module(self._nama), atribut)
+
+
+pd = ModulMalas("pandas")
+np = ModulMalas("numpy")
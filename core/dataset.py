@@ -0,0 +1,106 @@
+import threading
+
+from core._malas import pd
+from core.metrik import diukur, ukur
+from core.skema import gabung
+
+# Banyak commit terakhir yang disimpan di log perubahan; turunan yang tertinggal lebih
+# jauh dari ini dibangun ulang dari snapshot
+BATAS_LOG = 1000
+
+
+# Dataset bersama untuk semua sesi: satu snapshot yang tidak pernah diubah di tempat,
+# dibagikan per referensi, dengan nomor versi yang naik setiap commit. Commit membuat
+# snapshot baru (baris lama tidak disalin ulang per sesi) dan mencatat baris barunya di
+# log perubahan, sehingga turunan per sesi cukup menerapkan baris sejak versi terakhir
+# yang dilihatnya. Memori sebanding dengan ukuran data, bukan ukuran data x jumlah sesi.
+class DatasetBersama:
+    def __init__(self, muat, skema, batas_log=BATAS_LOG):
+        self._muat = muat
+        self.skema = skema
+        self.batas_log = batas_log
+        self._lock = threading.RLock()
+        self._log = []  # (versi, baris baru) untuk commit terakhir, terurut menurut versi
+        self.versi = 0
+        self._data = self._muat_data()
+
+    @diukur("dataset.muat")
+    def _muat_data(self):
+        return self._muat()
+
+    # Versi dan snapshot saat ini. Snapshot dipakai bersama: jangan diubah di tempat,
+    # buat salinan (copy(deep=False) cukup, kolom disalin saat ditulis) untuk mengubahnya.
+    def snapshot(self):
+        with self._lock:
+            return self.versi, self._data
+
+    # Commit baris baru: disimpan lewat `simpan` (jika ada) lalu digabung ke snapshot baru.
+    # Penyimpanan dan penggabungan berjalan di bawah lock yang sama sehingga urutan baris
+    # di snapshot sama dengan urutan di penyimpanan. Mengembalikan versi baru.
+    @diukur("dataset.komit")
+    def komit(self, baru, simpan=None):
+        if baru.empty:
+            return self.versi
+        with self._lock:
+            if simpan is not None:
+                simpan(baru)
+            with ukur("dataset.gabung"):
+                self._data = gabung(self._data, baru, self.skema)
+            self.versi += 1
+            self._log.append((self.versi, baru))
+            del self._log[:-self.batas_log]
+            return self.versi
+
+    # Lock dataset sebagai context manager: selama dipegang tidak ada commit (termasuk
+    # penulisannya ke penyimpanan) maupun muat ulang
+    def terkunci(self):
+        return self._lock
+
+    # Baris yang di-commit setelah `dari_versi` sampai `sampai_versi`, atau None jika
+    # log sudah tidak mencakup rentang itu (misalnya setelah muat ulang)
+    def perubahan(self, dari_versi, sampai_versi):
+        with self._lock:
+            if dari_versi == sampai_versi:
+                return self._data.iloc[:0]
+            if not self._log or self._log[0][0] > dari_versi + 1:
+                return None
+            baru = [baris for versi, baris in self._log if dari_versi < versi <= sampai_versi]
+        return pd.concat(baru, ignore_index=True)
+
+    # Muat ulang dari penyimpanan, misalnya setelah impor massal yang menulis langsung
+    # ke penyimpanan. Log dikosongkan sehingga semua turunan dibangun ulang.
+    def muat_ulang(self):
+        with self._lock:
+            self._data = self._muat_data()
+            self.versi += 1
+            self._log = []
+            return self.versi
+
+
+# Turunan dataset milik satu sesi (misalnya ringkasan berjalan) beserta versi dataset
+# yang sudah tercermin di dalamnya. Saat dataset maju, hanya baris yang di-commit sejak
+# versi itu yang diterapkan lewat `perbarui`; `bangun` dipakai saat pertama kali atau jika
+# log perubahan sudah tidak mencakupnya. Turunan yang versinya sama tidak disentuh.
+# `bangun` dijalankan di bawah lock dataset, sehingga sumber lain yang dibacanya (misalnya
+# ringkasan tersegel yang ikut ditulis saat commit) sesuai dengan versi snapshotnya.
+class TurunanDataset:
+    def __init__(self, dataset, bangun, perbarui):
+        self.dataset = dataset
+        self._bangun = bangun
+        self._perbarui = perbarui
+        self.versi = None
+        self.nilai = None
+
+    # Snapshot saat ini dan turunannya pada versi yang sama
+    def ambil(self):
+        versi, data = self.dataset.snapshot()
+        if versi != self.versi:
+            baru = None if self.versi is None else self.dataset.perubahan(self.versi, versi)
+            if baru is None:
+                with self.dataset.terkunci():
+                    versi, data = self.dataset.snapshot()
+                    self.nilai = self._bangun(data)
+            else:
+                self._perbarui(self.nilai, baru)
+            self.versi = versi
+        return data, self.nilai
@@ -0,0 +1,25 @@
+KATEGORI_PENGELUARAN = ["Gaji", "Utilitas", "Perlengkapan", "Sewa"]
+VARIABLE_EXPENSE_TYPES = ["Peralatan", "Bangunan", "Cetakan"]
+
+
+# Generate Fixed Expenses
+def generate_fixed_expenses():
+    return {
+        "Gaji Karyawan": 15000000,
+        "Bahan Baku": 10000000,
+        "Utilitas": 5000000,
+        "Advertising": 5000000,
+        "Asuransi": 2000000
+    }
+
+
+def record_variable_expense(variable_expenses, ringkasan, expense_type, expense_amount):
+    variable_expenses.append({"Expense Type": expense_type, "Amount": expense_amount})
+    ringkasan.tambah("Pengeluaran", expense_amount, kategori=expense_type)
+
+
+# Fixed, variable and total expenses
+def expense_totals(fixed_expenses, ringkasan):
+    total_fixed_expenses = sum(fixed_expenses.values())
+    total_variable_expenses = ringkasan.total["Pengeluaran"]
+    return total_fixed_expenses, total_variable_expenses, total_fixed_expenses + total_variable_expenses
@@ -0,0 +1,119 @@
+import hashlib
+import io
+import threading
+from collections import OrderedDict
+
+from core._malas import pd
+from core.metrik import diukur, hitung
+
+# Batas titik per garis sebelum deret waktu dikelompokkan ke periode yang lebih kasar
+MAKS_TITIK = 400
+# Periode pengelompokan, dari yang paling halus
+PERIODE = ["D", "W", "MS", "QS", "YS"]
+# Jumlah gambar yang disimpan di cache (dipakai bersama oleh semua sesi)
+UKURAN_CACHE = 64
+
+_cache = OrderedDict()
+_lock = threading.Lock()
+
+
+def _ambil_cache(kunci):
+    with _lock:
+        if kunci in _cache:
+            _cache.move_to_end(kunci)
+            hitung("grafik.cache_hit")
+            return _cache[kunci]
+    hitung("grafik.cache_miss")
+    return None
+
+
+def _simpan_cache(kunci, gambar):
+    with _lock:
+        _cache[kunci] = gambar
+        _cache.move_to_end(kunci)
+        while len(_cache) > UKURAN_CACHE:
+            _cache.popitem(last=False)
+
+
+def kosongkan_cache():
+    with _lock:
+        _cache.clear()
+
+
+# Hash isi deret (setelah diturunkan resolusinya) sebagai versi data grafik
+def hash_data(*bagian):
+    h = hashlib.sha1()
+    for b in bagian:
+        if isinstance(b, (pd.Series, pd.DataFrame, pd.Index)):
+            h.update(pd.util.hash_pandas_object(b).values.tobytes())
+        else:
+            h.update(repr(b).encode())
+    return h.hexdigest()
+
+
+# Kelompokkan deret waktu (indeks tanggal) ke periode terhalus yang jumlah titiknya
+# tidak melebihi `maks_titik`. Nilai dijumlahkan per periode.
+def turunkan_resolusi(seri, maks_titik=MAKS_TITIK):
+    if len(seri) <= maks_titik:
+        return seri
+    seri = seri.copy()
+    seri.index = pd.to_datetime(seri.index)
+    for periode in PERIODE:
+        hasil = seri.resample(periode).sum()
+        if len(hasil) <= maks_titik:
+            return hasil
+    return hasil
+
+
+@diukur("grafik.render")
+def _render(fig):
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    FigureCanvasAgg(fig)
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", bbox_inches="tight", transparent=True)
+    # Lepaskan memori gambar secara eksplisit; Figure tidak terdaftar di pyplot
+    fig.clear()
+    return buffer.getvalue()
+
+
+# Grafik garis untuk beberapa deret waktu, dikembalikan sebagai PNG (bytes).
+# `deret` berisi label -> Series dengan indeks tanggal.
+def grafik_garis(deret, judul, label_x, label_y, maks_titik=MAKS_TITIK):
+    from matplotlib.figure import Figure
+
+    deret = {label: turunkan_resolusi(seri, maks_titik) for label, seri in deret.items()}
+    kunci = hash_data("garis", judul, label_x, label_y, *deret.keys(), *deret.values())
+    gambar = _ambil_cache(kunci)
+    if gambar is not None:
+        return gambar
+
+    fig = Figure(figsize=(10, 6))
+    ax = fig.subplots()
+    for label, seri in deret.items():
+        ax.plot(seri.index, seri.values, label=label, marker="o" if len(seri) <= 60 else None)
+    ax.set_title(judul)
+    ax.set_xlabel(label_x)
+    ax.set_ylabel(label_y)
+    ax.legend()
+    ax.grid()
+    gambar = _render(fig)
+    _simpan_cache(kunci, gambar)
+    return gambar
+
+
+def grafik_pie(nilai, label, warna_teks="white"):
+    from matplotlib.figure import Figure
+
+    kunci = hash_data("pie", tuple(nilai), tuple(label), warna_teks)
+    gambar = _ambil_cache(kunci)
+    if gambar is not None:
+        return gambar
+
+    fig = Figure()
+    ax = fig.subplots()
+    ax.pie(nilai, labels=label, autopct="%1.1f%%", startangle=90, textprops={"color": warna_teks})
+    ax.axis("equal")
+    gambar = _render(fig)
+    _simpan_cache(kunci, gambar)
+    return gambar
@@ -0,0 +1,344 @@
+# Impor dan ekspor massal transaksi (ledger keuangan) dan penjualan (clothing) per chunk,
+# sehingga jutaan baris bisa diproses dengan memori terbatas:
+#
+#   python -m core.impor_ekspor impor riwayat_pos.csv --ditolak ditolak.csv
+#   python -m core.impor_ekspor ekspor laporan.parquet --dari 2024-01-01 --sampai 2024-03-31
+#
+# Format ditentukan dari ekstensi file: .csv, .jsonl atau .parquet.
+import argparse
+import os
+
+from core._malas import np, pd
+from core.inventaris import StokTidakCukup
+from core.inventory import segarkan_stok
+from core.metrik import diukur
+from core.penyimpanan import KOLOM_KEUANGAN, KOLOM_PENJUALAN
+from core.ringkasan import TIPE
+from core.skema import SKEMA_LEDGER, SKEMA_PENJUALAN, terapkan_skema
+
+UKURAN_CHUNK = 100_000
+FORMAT_FILE = ("csv", "jsonl", "parquet")
+# Jumlah baris ditolak yang disimpan di hasil untuk ditampilkan (sisanya hanya ke file)
+CONTOH_DITOLAK = 100
+
+
+def format_file(nama):
+    ekstensi = os.path.splitext(nama)[1].lstrip(".").lower()
+    if ekstensi == "json":
+        ekstensi = "jsonl"
+    if ekstensi not in FORMAT_FILE:
+        raise ValueError(f"Format file {nama} tidak didukung (csv, jsonl, parquet)")
+    return ekstensi
+
+
+# Baca file (path atau file object) per chunk. Nilai CSV/JSONL dibaca apa adanya sebagai
+# teks agar baris yang tidak valid bisa dilaporkan persis seperti di sumbernya.
+def baca_chunk(sumber, format, ukuran_chunk=UKURAN_CHUNK):
+    if format == "csv":
+        yield from pd.read_csv(sumber, chunksize=ukuran_chunk, dtype=str, keep_default_na=False)
+    elif format == "jsonl":
+        yield from pd.read_json(sumber, lines=True, chunksize=ukuran_chunk, dtype=False, convert_dates=False)
+    else:
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(sumber).iter_batches(batch_size=ukuran_chunk):
+            yield batch.to_pandas()
+
+
+# Tulis chunk satu per satu ke file biner (path atau file object) tanpa menampung seluruh
+# data di memori. Mengembalikan jumlah baris yang ditulis.
+def tulis_chunk(chunks, tujuan, format=None):
+    format = format or format_file(tujuan)
+    f = open(tujuan, "wb") if isinstance(tujuan, str) else tujuan
+    total = 0
+    penulis = None
+    try:
+        for i, chunk in enumerate(chunks):
+            if format == "parquet":
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+
+                tabel = pa.Table.from_pandas(chunk, preserve_index=False)
+                if penulis is None:
+                    penulis = pq.ParquetWriter(f, tabel.schema)
+                penulis.write_table(tabel)
+            elif format == "jsonl":
+                if len(chunk):
+                    f.write(chunk.to_json(orient="records", lines=True, date_format="iso").rstrip("\n").encode() + b"\n")
+            else:
+                f.write(chunk.to_csv(index=False, header=i == 0).encode())
+            total += len(chunk)
+    finally:
+        if penulis is not None:
+            penulis.close()
+        if isinstance(tujuan, str):
+            f.close()
+    return total
+
+
+# Pisahkan baris valid dan ditolak. `alasan` berisi teks alasan per baris ("" = valid).
+# Indeks baris valid adalah nomor barisnya di file sumber.
+def _pisahkan(chunk, valid, alasan, baris_awal):
+    ok = alasan == ""
+    nomor = np.arange(baris_awal, baris_awal + len(chunk))
+    ditolak = chunk.loc[~ok].copy()
+    ditolak.insert(0, "Baris", nomor[~ok])
+    ditolak["Alasan"] = alasan[~ok]
+    valid = valid.loc[ok].set_axis(pd.Index(nomor[ok], name="Baris"))
+    return valid, ditolak
+
+
+def _wajib(chunk, kolom):
+    hilang = [k for k in kolom if k not in chunk.columns]
+    if hilang:
+        raise ValueError(f"Kolom wajib tidak ada: {', '.join(hilang)}")
+
+
+def _teks(chunk, kolom):
+    if kolom not in chunk.columns:
+        return pd.Series("", index=chunk.index)
+    return chunk[kolom].fillna("").astype(str).str.strip()
+
+
+# Validasi chunk transaksi ledger (kolom Tanggal, Kategori, Tipe, Jumlah, Keterangan).
+# `baris_awal` adalah nomor baris data pertama di file sumber (mulai dari 1).
+def validasi_transaksi(chunk, baris_awal=1):
+    _wajib(chunk, ["Tanggal", "Kategori", "Tipe", "Jumlah"])
+    chunk = chunk.reset_index(drop=True)
+    tanggal = pd.to_datetime(chunk["Tanggal"], errors="coerce", format="mixed")
+    jumlah = pd.to_numeric(chunk["Jumlah"], errors="coerce")
+    tipe = _teks(chunk, "Tipe")
+    kategori = _teks(chunk, "Kategori")
+    alasan = np.select(
+        [tanggal.isna(), ~tipe.isin(TIPE), kategori == "", jumlah.isna(), jumlah <= 0],
+        ["Tanggal tidak valid", "Tipe harus Pemasukan atau Pengeluaran", "Kategori kosong",
+         "Jumlah bukan angka", "Jumlah harus lebih dari 0"],
+        default="",
+    )
+    valid = pd.DataFrame({
+        "Tanggal": tanggal,
+        "Kategori": kategori,
+        "Tipe": tipe,
+        "Jumlah": jumlah,
+        "Keterangan": _teks(chunk, "Keterangan"),
+    })
+    valid, ditolak = _pisahkan(chunk, valid, alasan, baris_awal)
+    return terapkan_skema(valid, SKEMA_LEDGER), ditolak
+
+
+# Validasi chunk penjualan clothing terhadap katalog. NamaProduk diambil dari katalog dan
+# TotalPrice dihitung dari harga katalog jika kolomnya tidak ada atau kosong.
+def validasi_penjualan(chunk, katalog, baris_awal=1):
+    _wajib(chunk, ["Date", "IdProduk", "Quantity"])
+    chunk = chunk.reset_index(drop=True)
+    kode_katalog = katalog.data[katalog.kolom_kode]
+    tanggal = pd.to_datetime(chunk["Date"], errors="coerce", format="mixed")
+    kode = pd.to_numeric(chunk["IdProduk"], errors="coerce") if pd.api.types.is_numeric_dtype(kode_katalog) else _teks(chunk, "IdProduk")
+    kuantitas = pd.to_numeric(chunk["Quantity"], errors="coerce")
+    dikenal = kode.isin(kode_katalog)
+
+    label = kode.where(dikenal).map(katalog.label)
+    baris_produk = katalog.data.reindex(label)
+    harga = baris_produk[katalog.kolom_harga].to_numpy()
+    total = pd.to_numeric(chunk["TotalPrice"], errors="coerce") if "TotalPrice" in chunk.columns else pd.Series(np.nan, index=chunk.index)
+    total = total.fillna(pd.Series(kuantitas.to_numpy() * harga, index=chunk.index))
+
+    alasan = np.select(
+        [tanggal.isna(), ~dikenal, kuantitas.isna() | (kuantitas % 1 != 0), kuantitas <= 0, total < 0],
+        ["Date is not a valid date", "IdProduk not in catalog", "Quantity is not a whole number",
+         "Quantity must be greater than 0", "TotalPrice must not be negative"],
+        default="",
+    )
+    valid = pd.DataFrame({
+        "Date": tanggal,
+        "IdProduk": kode,
+        "NamaProduk": baris_produk["NamaProduk"].to_numpy(),
+        "Quantity": kuantitas,
+        "TotalPrice": total,
+        "CustomerId": _teks(chunk, "CustomerId").replace("", None),
+    })
+    valid, ditolak = _pisahkan(chunk, valid, alasan, baris_awal)
+    if not pd.api.types.is_float_dtype(kode_katalog):
+        valid["IdProduk"] = valid["IdProduk"].astype(kode_katalog.dtype)
+    return terapkan_skema(valid, SKEMA_PENJUALAN), ditolak
+
+
+# Kurangi stok untuk satu chunk penjualan sekaligus (satu transaksi inventaris per
+# percobaan). Produk yang stoknya tidak cukup ditolak seluruh barisnya di chunk ini.
+def _kurangi_stok_chunk(valid, inventaris):
+    ditolak = []
+    while not valid.empty:
+        keranjang = valid.groupby("IdProduk")["Quantity"].sum().to_dict()
+        try:
+            inventaris.kurangi(keranjang)
+            break
+        except StokTidakCukup as e:
+            kurang = valid["IdProduk"] == e.kode
+            ditolak.append(valid.loc[kurang].assign(Alasan="Insufficient stock").reset_index())
+            valid = valid.loc[~kurang]
+    return valid, ditolak
+
+
+class _PenulisDitolak:
+    def __init__(self, path):
+        self.path = path
+        self.contoh = []
+        self.jumlah = 0
+        self._ditulis = False
+
+    def tambah(self, ditolak):
+        if ditolak.empty:
+            return
+        self.jumlah += len(ditolak)
+        if sum(len(c) for c in self.contoh) < CONTOH_DITOLAK:
+            self.contoh.append(ditolak.head(CONTOH_DITOLAK))
+        if self.path:
+            ditolak.to_csv(self.path, mode="a" if self._ditulis else "w", header=not self._ditulis, index=False)
+            self._ditulis = True
+
+    def hasil(self, diterima, chunk):
+        contoh = pd.concat(self.contoh, ignore_index=True).head(CONTOH_DITOLAK) if self.contoh else pd.DataFrame()
+        return {"diterima": diterima, "ditolak": self.jumlah, "chunk": chunk, "contoh_ditolak": contoh}
+
+
+# Impor transaksi ledger per chunk: validasi, tulis ke penyimpanan (satu batch per chunk,
+# lewat tambah_data sehingga chunk besar tidak melewati jurnal JSON)
+# dan perbarui ringkasan berjalan. Baris ditolak ditulis ke `path_ditolak` (CSV) beserta
+# nomor baris dan alasannya.
+@diukur("impor.transaksi")
+def impor_transaksi(sumber, ledger, ringkasan=None, format=None, path_ditolak=None, ukuran_chunk=UKURAN_CHUNK):
+    format = format or format_file(sumber)
+    penolak = _PenulisDitolak(path_ditolak)
+    diterima = baris = jumlah_chunk = 0
+    for chunk in baca_chunk(sumber, format, ukuran_chunk):
+        valid, ditolak = validasi_transaksi(chunk, baris + 1)
+        if not valid.empty:
+            ledger.tambah_data(valid)
+            if ringkasan is not None:
+                ringkasan.tambah_ledger(valid)
+        penolak.tambah(ditolak)
+        diterima += len(valid)
+        baris += len(chunk)
+        jumlah_chunk += 1
+    ledger.sinkron()
+    return penolak.hasil(diterima, jumlah_chunk)
+
+
+# Import sales per chunk: validate against the catalog, take the stock for the whole
+# chunk from the shared inventory (optional, e.g. not for old POS history), then hand the
+# accepted rows to `simpan(frame)` (e.g. PenjualanSQLite.tambah_data) and update the
+# running totals in bulk. If `simpan` fails, the chunk's stock is put back.
+@diukur("impor.penjualan")
+def impor_penjualan(sumber, katalog, simpan, ringkasan=None, inventaris=None, format=None,
+                    path_ditolak=None, ukuran_chunk=UKURAN_CHUNK):
+    format = format or format_file(sumber)
+    penolak = _PenulisDitolak(path_ditolak)
+    diterima = baris = jumlah_chunk = 0
+    for chunk in baca_chunk(sumber, format, ukuran_chunk):
+        valid, ditolak = validasi_penjualan(chunk, katalog, baris + 1)
+        penolak.tambah(ditolak)
+        if inventaris is not None:
+            valid, kurang = _kurangi_stok_chunk(valid, inventaris)
+            for d in kurang:
+                penolak.tambah(d)
+        if not valid.empty:
+            try:
+                simpan(valid)
+            except BaseException:
+                # The chunk was not stored: give back the stock taken for it
+                if inventaris is not None:
+                    inventaris.ubah(valid.groupby("IdProduk")["Quantity"].sum().to_dict())
+                raise
+            if ringkasan is not None:
+                ringkasan.tambah_penjualan(valid)
+        diterima += len(valid)
+        baris += len(chunk)
+        jumlah_chunk += 1
+    if inventaris is not None:
+        segarkan_stok(katalog, inventaris)
+    return penolak.hasil(diterima, jumlah_chunk)
+
+
+def _potong(data, ukuran_chunk):
+    for mulai in range(0, len(data), ukuran_chunk):
+        yield data.iloc[mulai:mulai + ukuran_chunk]
+
+
+# Chunk transaksi dalam rentang tanggal (inklusif). Dengan SQLite baris dibaca dari
+# database per chunk; selain itu dipotong dari ledger di memori.
+def chunk_transaksi(sumber, tanggal_awal=None, tanggal_akhir=None, ukuran_chunk=UKURAN_CHUNK):
+    if hasattr(sumber, "iter_query"):
+        yield from sumber.iter_query(ukuran_chunk, tanggal_awal=tanggal_awal, tanggal_akhir=tanggal_akhir)
+        return
+    data = sumber if isinstance(sumber, pd.DataFrame) else sumber.muat()
+    if data.empty:
+        return
+    tanggal = pd.to_datetime(data["Tanggal"])
+    cocok = pd.Series(True, index=data.index)
+    if tanggal_awal is not None:
+        cocok &= tanggal >= pd.to_datetime(tanggal_awal)
+    if tanggal_akhir is not None:
+        cocok &= tanggal <= pd.to_datetime(tanggal_akhir)
+    yield from _potong(data.loc[cocok, KOLOM_KEUANGAN], ukuran_chunk)
+
+
+# Sales in a date range (whole days), chunk by chunk. The sales store reads them from
+# the database; a list of sale dicts is converted to frames as it goes.
+def chunk_penjualan(sales, tanggal_awal=None, tanggal_akhir=None, ukuran_chunk=UKURAN_CHUNK):
+    if hasattr(sales, "iter_query"):
+        yield from sales.iter_query(ukuran_chunk, tanggal_awal=tanggal_awal, tanggal_akhir=tanggal_akhir)
+        return
+    awal = pd.Timestamp(tanggal_awal) if tanggal_awal is not None else None
+    akhir = pd.Timestamp(tanggal_akhir) + pd.Timedelta(days=1) if tanggal_akhir is not None else None
+    potongan = []
+    for sale in sales:
+        tanggal = pd.Timestamp(sale["Date"])
+        if (awal is None or tanggal >= awal) and (akhir is None or tanggal < akhir):
+            potongan.append(sale)
+            if len(potongan) >= ukuran_chunk:
+                yield pd.DataFrame(potongan, columns=KOLOM_PENJUALAN)
+                potongan = []
+    if potongan:
+        yield pd.DataFrame(potongan, columns=KOLOM_PENJUALAN)
+
+
+@diukur("ekspor.transaksi")
+def ekspor_transaksi(sumber, tujuan, tanggal_awal=None, tanggal_akhir=None, format=None, ukuran_chunk=UKURAN_CHUNK):
+    return tulis_chunk(chunk_transaksi(sumber, tanggal_awal, tanggal_akhir, ukuran_chunk), tujuan, format)
+
+
+@diukur("ekspor.penjualan")
+def ekspor_penjualan(sales, tujuan, tanggal_awal=None, tanggal_akhir=None, format=None, ukuran_chunk=UKURAN_CHUNK):
+    return tulis_chunk(chunk_penjualan(sales, tanggal_awal, tanggal_akhir, ukuran_chunk), tujuan, format)
+
+
+def main(argv=None):
+    from core.ledger import buka_ledger
+
+    parser = argparse.ArgumentParser(prog="python -m core.impor_ekspor")
+    sub = parser.add_subparsers(dest="perintah", required=True)
+    p_impor = sub.add_parser("impor", help="impor transaksi ke ledger aplikasi keuangan")
+    p_impor.add_argument("sumber")
+    p_impor.add_argument("--ditolak", help="file CSV untuk baris yang ditolak")
+    p_ekspor = sub.add_parser("ekspor", help="ekspor transaksi ledger dalam rentang tanggal")
+    p_ekspor.add_argument("tujuan")
+    p_ekspor.add_argument("--dari")
+    p_ekspor.add_argument("--sampai")
+    for p in (p_impor, p_ekspor):
+        p.add_argument("--chunk", type=int, default=UKURAN_CHUNK)
+    args = parser.parse_args(argv)
+
+    ledger = buka_ledger()
+    try:
+        if args.perintah == "impor":
+            hasil = impor_transaksi(args.sumber, ledger, path_ditolak=args.ditolak, ukuran_chunk=args.chunk)
+            print(f"{hasil['diterima']} baris diimpor, {hasil['ditolak']} ditolak")
+        else:
+            total = ekspor_transaksi(ledger, args.tujuan, args.dari, args.sampai, ukuran_chunk=args.chunk)
+            print(f"{total} baris ditulis ke {args.tujuan}")
+    finally:
+        ledger.tutup()
+
+
+if __name__ == "__main__":
+    main()
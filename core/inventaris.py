@@ -0,0 +1,120 @@
+import sqlite3
+from contextlib import closing
+
+from core.metrik import diukur
+
+
+class StokTidakCukup(Exception):
+    def __init__(self, kode):
+        super().__init__(f"Stok produk {kode} tidak mencukupi")
+        self.kode = kode
+
+
+# Inventaris bersama untuk semua sesi dan proses, disimpan di SQLite.
+# Setiap transaksi memberi baris yang diubahnya nomor versi baru (versi terbesar + 1),
+# sehingga katalog cukup membaca baris dengan versi di atas sinkron terakhirnya. Pengurangan stok
+# dilakukan dengan UPDATE bersyarat di dalam satu transaksi, sehingga dua kasir yang
+# menjual bersamaan tidak saling menimpa dan stok tidak pernah menjadi negatif.
+class InventarisBersama:
+    def __init__(self, path_db, timeout=30):
+        self.path_db = path_db
+        self.timeout = timeout
+        with closing(self._koneksi()) as db:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS stok ("
+                " kode TEXT PRIMARY KEY,"
+                " jumlah INTEGER NOT NULL CHECK (jumlah >= 0),"
+                " versi INTEGER NOT NULL DEFAULT 0)"
+            )
+            db.execute("CREATE INDEX IF NOT EXISTS stok_versi ON stok (versi)")
+
+    def _koneksi(self):
+        # isolation_level=None: transaksi diatur sendiri dengan BEGIN IMMEDIATE
+        return sqlite3.connect(self.path_db, timeout=self.timeout, isolation_level=None)
+
+    # Versi untuk transaksi yang sedang berjalan (dipanggil setelah BEGIN IMMEDIATE)
+    def _versi_baru(self, db):
+        return db.execute("SELECT COALESCE(MAX(versi), 0) + 1 FROM stok").fetchone()[0]
+
+    # Isi stok awal; produk yang sudah ada di database tidak ditimpa
+    def impor(self, kode, jumlah):
+        with closing(self._koneksi()) as db:
+            db.execute("BEGIN IMMEDIATE")
+            versi = self._versi_baru(db)
+            db.executemany(
+                "INSERT OR IGNORE INTO stok (kode, jumlah, versi) VALUES (?, ?, ?)",
+                ((str(k), int(j), versi) for k, j in zip(kode, jumlah)),
+            )
+            db.execute("COMMIT")
+
+    # Daftarkan produk baru dengan kode angka berikutnya (angka terbesar + 1) dan stok
+    # awalnya. Kode dipilih dan disisipkan dalam satu transaksi, sehingga dua sesi yang
+    # menambah produk bersamaan tidak pernah mendapat kode yang sama.
+    def produk_baru(self, jumlah):
+        with closing(self._koneksi()) as db:
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                kode = db.execute(
+                    "SELECT COALESCE(MAX(CAST(kode AS INTEGER)), 0) + 1 FROM stok WHERE kode GLOB '[0-9]*'"
+                ).fetchone()[0]
+                db.execute(
+                    "INSERT INTO stok (kode, jumlah, versi) VALUES (?, ?, ?)",
+                    (str(kode), int(jumlah), self._versi_baru(db)),
+                )
+                db.execute("COMMIT")
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+        return kode
+
+    def stok(self, kode):
+        with closing(self._koneksi()) as db:
+            baris = db.execute("SELECT jumlah, versi FROM stok WHERE kode = ?", (str(kode),)).fetchone()
+        return baris if baris is not None else (None, None)
+
+    @diukur("inventaris.semua")
+    def semua(self):
+        with closing(self._koneksi()) as db:
+            return {kode: jumlah for kode, jumlah in db.execute("SELECT kode, jumlah FROM stok")}
+
+    # Stok produk yang berubah setelah `versi` (None: semua produk) beserta versi terbaru.
+    # Tanpa perubahan hanya indeks versi yang dibaca. Jika versi terbaru lebih kecil
+    # (database diganti), semua produk dikembalikan.
+    @diukur("inventaris.berubah_sejak")
+    def berubah_sejak(self, versi):
+        with closing(self._koneksi()) as db:
+            terbaru = db.execute("SELECT COALESCE(MAX(versi), 0) FROM stok").fetchone()[0]
+            if versi == terbaru:
+                return {}, terbaru
+            batas = versi if versi is not None and versi < terbaru else -1
+            baris = db.execute("SELECT kode, jumlah FROM stok WHERE versi > ?", (batas,))
+            return dict(baris.fetchall()), terbaru
+
+    # Ubah stok beberapa produk sebagai satu transaksi (semua berhasil atau tidak sama sekali).
+    # `perubahan` berisi kode -> selisih; selisih negatif berarti stok berkurang.
+    # Mengembalikan stok terbaru untuk setiap kode.
+    @diukur("inventaris.ubah")
+    def ubah(self, perubahan):
+        with closing(self._koneksi()) as db:
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                hasil = {}
+                versi = self._versi_baru(db)
+                for kode, selisih in perubahan.items():
+                    kursor = db.execute(
+                        "UPDATE stok SET jumlah = jumlah + ?, versi = ?"
+                        " WHERE kode = ? AND jumlah + ? >= 0",
+                        (int(selisih), versi, str(kode), int(selisih)),
+                    )
+                    if kursor.rowcount != 1:
+                        raise StokTidakCukup(kode)
+                    hasil[kode] = db.execute("SELECT jumlah FROM stok WHERE kode = ?", (str(kode),)).fetchone()[0]
+                db.execute("COMMIT")
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+        return hasil
+
+    def kurangi(self, keranjang):
+        return self.ubah({kode: -jumlah for kode, jumlah in keranjang.items()})
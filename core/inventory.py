@@ -0,0 +1,141 @@
+from core._malas import pd
+from core.inventaris import InventarisBersama, StokTidakCukup  # noqa: F401
+from core.katalog import KatalogProduk
+from core.penulis import penulis
+from core.penyimpanan import baca_tabel, format_default, migrasi_tabel, tulis_tabel
+from core.skema import SKEMA_PRODUK, SKEMA_STOK, terapkan_skema
+
+STOCK_FILE = f"stok_produk.{format_default()}"
+LEGACY_STOCK_FILE = "stok_produk.csv"
+# Jumlah stok yang dipakai bersama oleh semua sesi dan proses
+INVENTORY_DB = "stok_produk.db"
+# Stock shared by every session and worker process of clothing.py
+CLOTHING_INVENTORY_DB = "clothing_stock.db"
+
+
+# Tabel stok dengan tipe kolom sesuai skema (nama/ukuran/warna kategorikal, harga rupiah int64)
+def muat_stok():
+    migrasi_tabel(LEGACY_STOCK_FILE, STOCK_FILE)
+    try:
+        return terapkan_skema(baca_tabel(STOCK_FILE), SKEMA_STOK)
+    except FileNotFoundError:
+        stok_awal = pd.DataFrame({
+            "Kode Produk": [f"P{i+1:03d}" for i in range(35)],
+            "Produk": [
+                "T-Shirts", "T-Shirts", "T-Shirts", "T-Shirts",
+                "Jackets", "Jackets", "Jackets", "Jackets",
+                "Flannel", "Flannel", "Flannel",
+                "Sweater", "Sweater", "Sweater", "Sweater",
+                "Jeans", "Jeans", "Jeans", "Jeans",
+                "Shorts", "Shorts", "Shorts", "Shorts",
+                "Chinos", "Chinos", "Chinos", "Chinos",
+                "Sweat Pants", "Sweat Pants", "Sweat Pants", "Sweat Pants",
+                "Cargo Pants", "Jumpsuits", "Leggings", "Sweatshirts"
+            ],
+            "Merek": [
+                "Short Sleeve", "Long Sleeve", "AIRism Cotton", "Cotton",
+                "Reversible Parka", "Pocketable UV Protection Parka", "BLOCKTECH Parka 3D Cut", "Zip Ip Blouson",
+                "Flannel Shirt Long Sleeve", "Flannel Long Sleeve Checked", "Flannel Long Sleeve",
+                "Crew Neck Long Sleeve Sweater", "Polo Sweater Short Sleeve", "3D Knit Crew Neck Sweater", "Waffle V Neck Sweater",
+                "Wide Tapered Jeans", "Straight Jeans", "Slim Fit Jeans", "Ultra Strech Skinny Fit Jeans",
+                "Stretch Slim Fit Shorts", "Geared Shorts", "Ultra Stretch Shorts", "Cargo Shorts",
+                "Slim Fit Chino Pants", "Pleated Wide Chino Pants", "Wide Fit Chino Pants", "Chino Shorts",
+                "Sweat Pants", "Sweat Wide Pants", "Ultra Stretch Sweat Shorts", "Wide Fit Cargo Pants",
+                "Tight Fit Jumpsuit", "Casual Leggings", "Slim Fit Sweatshirts", "Oversized Sweatshirts"
+            ],
+            "UkuranProduk": (["Small", "Medium", "Large"] * 12)[:35],
+            "WarnaProduk": (["Hijau", "Hitam", "Putih"] * 12)[:35],
+            "Harga": [
+                120000, 125000, 130000, 110000,
+                250000, 275000, 300000, 220000,
+                150000, 160000, 155000,
+                180000, 190000, 185000, 175000,
+                210000, 220000, 200000, 195000,
+                100000, 105000, 110000, 115000,
+                140000, 145000, 150000, 135000,
+                90000, 95000, 100000, 120000,
+                140000, 150000, 160000, 170000
+            ],
+            "Stok": [100] * 35
+        })
+        tulis_tabel(stok_awal, STOCK_FILE)
+        return terapkan_skema(stok_awal, SKEMA_STOK)
+
+
+# Tulis tabel stok di belakang lewat penulis latar; penulisan beruntun digabung menjadi
+# satu. Salinan dangkal menjaga isi tabel saat ini: perubahan stok berikutnya di katalog
+# menyalin kolomnya (copy-on-write) dan tidak ikut tertulis.
+def simpan_stok(stok):
+    stok = stok.copy(deep=False)
+    penulis.kirim(("tabel", STOCK_FILE), lambda: tulis_tabel(stok, STOCK_FILE))
+
+
+# Inventaris bersama; diisi dari tabel stok jika produknya belum ada
+def buka_inventaris(stok_awal, path_db=INVENTORY_DB):
+    inventaris = InventarisBersama(path_db)
+    inventaris.impor(stok_awal["Kode Produk"], stok_awal["Stok"])
+    return inventaris
+
+
+# Katalog menyimpan indeks Kode Produk -> baris di atas tabel stok
+def buat_katalog_stok(stok):
+    return KatalogProduk(stok, "Kode Produk", "Harga", "Stok")
+
+
+# Fungsi untuk menyamakan stok katalog dengan inventaris bersama. Hanya produk yang
+# berubah sejak sinkron terakhir katalog yang dibaca dan ditulis.
+def segarkan_stok(katalog, inventaris):
+    berubah, versi = inventaris.berubah_sejak(katalog.versi_stok)
+    if berubah:
+        katalog.sinkron_stok(berubah)
+    katalog.versi_stok = versi
+
+
+# Fungsi untuk mengubah stok produk berdasarkan Kode Produk.
+# Perubahan dilakukan di inventaris bersama; StokTidakCukup jika stok akan menjadi negatif.
+def ubah_stok(katalog, inventaris, kode, selisih):
+    if kode in katalog:
+        inventaris.ubah({kode: selisih})
+        segarkan_stok(katalog, inventaris)
+        simpan_stok(katalog.data)
+
+
+# Nama produk untuk ditampilkan di pilihan dan pesan
+def nama_produk(katalog, kode):
+    produk = katalog.baris(kode)
+    return f"{produk['Produk']} - {produk['Merek']} ({kode})"
+
+
+# Generate Product Data: every (jenis, nama) x ukuran x warna combination, built vectorized
+def generate_product_data():
+    from generator_data import buat_katalog
+
+    # Categorical name/size/color columns; new products extend their categories (see KatalogProduk.tambah_produk)
+    return terapkan_skema(buat_katalog(), SKEMA_PRODUK)
+
+
+# Product catalog with an IdProduk -> row index; its table is the product data
+def create_product_catalog(product_data):
+    return KatalogProduk(product_data, "IdProduk", "HargaProduk", "StokProduk")
+
+
+# Restock a clothing product in the shared inventory and in the session catalog
+def restock_product(katalog, inventory, product_id, additional_stock):
+    stock = inventory.ubah({product_id: additional_stock})
+    katalog.set_stok(product_id, stock[product_id])
+
+
+# Add a clothing product. Its id is allocated by the shared inventory, so two sessions
+# adding products at the same time never get the same id.
+def add_product(katalog, inventory, jenis_produk, nama_produk, ukuran_produk, warna_produk, harga_produk, stok_produk):
+    new_id = inventory.produk_baru(stok_produk)
+    katalog.tambah_produk({
+        "IdProduk": new_id,
+        "JenisProduk": jenis_produk,
+        "NamaProduk": nama_produk,
+        "UkuranProduk": ukuran_produk,
+        "WarnaProduk": warna_produk,
+        "HargaProduk": harga_produk,
+        "StokProduk": stok_produk
+    })
+    return new_id
@@ -0,0 +1,80 @@
+from core._malas import pd
+
+
+# Katalog produk dengan indeks hash: kode produk -> label baris. Semua baca/tulis
+# stok lewat katalog ini sehingga tidak perlu memindai seluruh kolom untuk satu produk.
+class KatalogProduk:
+    def __init__(self, data, kolom_kode, kolom_harga, kolom_stok):
+        self.data = data
+        self.kolom_kode = kolom_kode
+        self.kolom_harga = kolom_harga
+        self.kolom_stok = kolom_stok
+        # Versi inventaris bersama saat stok terakhir disinkronkan (None: belum pernah)
+        self.versi_stok = None
+        self.bangun_indeks()
+
+    def bangun_indeks(self):
+        self._indeks = dict(zip(self.data[self.kolom_kode], self.data.index))
+        self._indeks_teks = None
+
+    def __len__(self):
+        return len(self._indeks)
+
+    def __contains__(self, kode):
+        return kode in self._indeks
+
+    def label(self, kode):
+        return self._indeks.get(kode)
+
+    def baris(self, kode):
+        return self.data.loc[self._indeks[kode]]
+
+    def ambil(self, kode, kolom):
+        return self.data.at[self._indeks[kode], kolom]
+
+    def harga(self, kode):
+        return self.ambil(kode, self.kolom_harga)
+
+    def stok(self, kode):
+        return self.ambil(kode, self.kolom_stok)
+
+    def ubah_stok(self, kode, selisih):
+        label = self._indeks[kode]
+        self.data.at[label, self.kolom_stok] += selisih
+        return self.data.at[label, self.kolom_stok]
+
+    def set_stok(self, kode, jumlah):
+        self.data.at[self._indeks[kode], self.kolom_stok] = jumlah
+
+    # Samakan kolom stok dengan stok dari sumber lain (kode sebagai teks -> jumlah).
+    # Hanya baris produk yang ada di `stok_per_kode` yang ditulis.
+    def sinkron_stok(self, stok_per_kode):
+        if self._indeks_teks is None:
+            self._indeks_teks = {str(kode): label for kode, label in self._indeks.items()}
+        pasangan = [(self._indeks_teks[k], j) for k, j in stok_per_kode.items() if k in self._indeks_teks]
+        if pasangan:
+            label, jumlah = zip(*pasangan)
+            self.data.loc[list(label), self.kolom_stok] = list(jumlah)
+
+    def labels(self, kode):
+        return [self._indeks[k] for k in kode]
+
+    # Tambah produk baru di akhir tabel dan perbarui indeks
+    def tambah_produk(self, produk):
+        kode = produk[self.kolom_kode]
+        if kode in self._indeks:
+            raise KeyError(f"Kode produk {kode} sudah ada")
+        label = self.data.index.max() + 1 if len(self.data) else 0
+        kategorikal = {kolom: dtype for kolom, dtype in self.data.dtypes.items() if isinstance(dtype, pd.CategoricalDtype)}
+        self.data.loc[label] = pd.Series(produk)
+        # Menambah baris lewat .loc melepas tipe kategorikal; kembalikan dengan kategori
+        # baru di akhir agar kode kategori yang sudah ada tidak berubah
+        for kolom, dtype in kategorikal.items():
+            kategori = dtype.categories
+            if kolom in produk and produk[kolom] not in kategori:
+                kategori = kategori.append(pd.Index([produk[kolom]]))
+            self.data[kolom] = self.data[kolom].astype(pd.CategoricalDtype(kategori, dtype.ordered))
+        self._indeks[kode] = label
+        if self._indeks_teks is not None:
+            self._indeks_teks[str(kode)] = label
+        return label
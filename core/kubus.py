@@ -0,0 +1,210 @@
+import threading
+
+from core._malas import pd
+from core.metrik import diukur
+
+GRANULARITAS = ("hari", "minggu", "bulan")
+DIMENSI = ["Tipe", "Kategori", "Produk", "Pelanggan"]
+UKURAN = ["Jumlah", "Unit", "Transaksi"]
+# Filter query -> kolom dimensi
+FILTER = {"tipe": "Tipe", "kategori": "Kategori", "produk": "Produk", "pelanggan": "Pelanggan"}
+# Baris tertunda sebelum digabung ke sel utama
+BATAS_TERTUNDA = 20_000
+# Banyak potongan sel tertunda sebelum digabung, agar query tidak menyaring banyak potongan kecil
+BATAS_POTONGAN = 16
+
+
+# Awal periode (Senin untuk minggu, tanggal 1 untuk bulan) untuk satu tanggal atau Series
+def awal_periode(tanggal, granularitas):
+    if isinstance(tanggal, pd.Series):
+        hari = tanggal.dt.normalize()
+        if granularitas == "minggu":
+            return hari - pd.to_timedelta(hari.dt.dayofweek, unit="D")
+        if granularitas == "bulan":
+            return hari - pd.to_timedelta(hari.dt.day - 1, unit="D")
+        return hari
+    hari = pd.Timestamp(tanggal).normalize()
+    if granularitas == "minggu":
+        return hari - pd.Timedelta(days=hari.dayofweek)
+    if granularitas == "bulan":
+        return hari.replace(day=1)
+    return hari
+
+
+def _periode_berikut(awal, granularitas):
+    if granularitas == "minggu":
+        return awal + pd.Timedelta(days=7)
+    if granularitas == "bulan":
+        return awal + pd.DateOffset(months=1)
+    return awal + pd.Timedelta(days=1)
+
+
+def _sel_kosong():
+    return pd.DataFrame({
+        "Periode": pd.Series(dtype="datetime64[us]"),
+        **{kolom: pd.Series(dtype=object) for kolom in DIMENSI},
+        **{kolom: pd.Series(dtype="int64") for kolom in UKURAN},
+    })
+
+
+def _agregasi(frame, granularitas):
+    frame = frame.assign(Periode=awal_periode(frame["Tanggal"], granularitas))
+    return frame.groupby(["Periode"] + DIMENSI, dropna=False, sort=False)[UKURAN].sum().reset_index()
+
+
+# Sel harian kubus (kolom Periode, DIMENSI, UKURAN) dari baris ledger: kolom Tanggal, Tipe,
+# Kategori, Jumlah dan opsional Produk, Unit, Pelanggan. Sel beberapa bagian data bisa
+# digabung begitu saja karena semua ukurannya berupa jumlah.
+def sel_harian(data):
+    if data.empty:
+        return _sel_kosong()
+    # .array menjaga tipe kolom (kategorikal/string) tanpa salinan ke objek Python
+    frame = pd.DataFrame({
+        "Tanggal": pd.to_datetime(data["Tanggal"]).array,
+        **{kolom: data[kolom].array if kolom in data.columns else None for kolom in DIMENSI},
+        "Jumlah": data["Jumlah"].array,
+        "Unit": data["Unit"].array if "Unit" in data.columns else 0,
+        "Transaksi": 1,
+    })
+    return _agregasi(frame, "hari")
+
+
+# Rencana query: rentang dipecah menjadi periode penuh (dibaca dari sel granularitas itu)
+# dan sisa hari di kedua ujung (dibaca dari sel harian). Setiap bagian berisi
+# (granularitas sumber, awal periode pertama, awal periode terakhir); None = tanpa batas.
+def rencana_query(granularitas, tanggal_awal=None, tanggal_akhir=None):
+    awal = pd.Timestamp(tanggal_awal).normalize() if tanggal_awal is not None else None
+    akhir = pd.Timestamp(tanggal_akhir).normalize() if tanggal_akhir is not None else None
+    if granularitas == "hari":
+        return [("hari", awal, akhir)]
+
+    penuh_awal = None
+    if awal is not None:
+        periode = awal_periode(awal, granularitas)
+        penuh_awal = awal if periode == awal else _periode_berikut(periode, granularitas)
+    # Awal periode sesudah periode penuh terakhir
+    penuh_selesai = None
+    if akhir is not None:
+        periode = awal_periode(akhir, granularitas)
+        berikut = _periode_berikut(periode, granularitas)
+        penuh_selesai = berikut if berikut - pd.Timedelta(days=1) == akhir else periode
+
+    if penuh_awal is not None and penuh_selesai is not None and penuh_awal >= penuh_selesai:
+        return [("hari", awal, akhir)]
+    rencana = [(granularitas, penuh_awal, penuh_selesai - pd.Timedelta(days=1) if penuh_selesai is not None else None)]
+    if awal is not None and penuh_awal > awal:
+        rencana.append(("hari", awal, penuh_awal - pd.Timedelta(days=1)))
+    if akhir is not None and penuh_selesai <= akhir:
+        rencana.append(("hari", penuh_selesai, akhir))
+    return rencana
+
+
+# Kubus agregat ledger/penjualan: Jumlah, Unit dan banyak Transaksi per (periode, Tipe,
+# Kategori, Produk, Pelanggan) untuk tiga granularitas (hari, minggu, bulan), diperbarui
+# setiap kali data dicatat. Query rentang, roll-up (hari -> bulan) dan drill-down
+# (kategori -> produk) dijawab dari sel agregat, bukan dari baris mentah; rentang panjang
+# dibaca dari sel bulanan/mingguan dan hanya ujung-ujungnya dari sel harian.
+# Sel baru ditampung dulu (tertunda) lalu digabung ke sel utama secara berkala.
+class KubusLaporan:
+    def __init__(self, batas_tertunda=BATAS_TERTUNDA):
+        self.batas_tertunda = batas_tertunda
+        self._sel = {g: _sel_kosong() for g in GRANULARITAS}
+        self._frame_tertunda = {g: [] for g in GRANULARITAS}
+        self._baris_tertunda = []  # (tanggal, tipe, kategori, produk, pelanggan, jumlah, unit)
+        self._jumlah_tertunda = 0
+        self._lock = threading.RLock()
+
+    def tambah(self, tanggal, tipe, kategori, jumlah, produk=None, unit=0, pelanggan=None):
+        with self._lock:
+            self._baris_tertunda.append((pd.Timestamp(tanggal), tipe, kategori, produk, pelanggan, jumlah, unit))
+            self._jumlah_tertunda += 1
+            if self._jumlah_tertunda >= self.batas_tertunda:
+                self.padatkan()
+
+    # Tambahkan banyak baris sekaligus: kolom Tanggal, Tipe, Kategori, Jumlah dan
+    # opsional Produk, Unit, Pelanggan
+    @diukur("kubus.tambah_data")
+    def tambah_data(self, data):
+        if not data.empty:
+            self.tambah_sel(sel_harian(data))
+
+    # Tambahkan sel harian yang sudah diagregasi (lihat sel_harian), misalnya ringkasan
+    # tersegel satu partisi bulan. Minggu dan bulan di-roll-up dari sel harian itu.
+    def tambah_sel(self, harian):
+        if harian.empty:
+            return
+        with self._lock:
+            for granularitas in GRANULARITAS:
+                self._frame_tertunda[granularitas].append(
+                    harian if granularitas == "hari" else _agregasi(harian.rename(columns={"Periode": "Tanggal"}), granularitas)
+                )
+            self._jumlah_tertunda += len(harian)
+            if self._jumlah_tertunda >= self.batas_tertunda:
+                self.padatkan()
+
+    def _frame_baris_tertunda(self):
+        frame = pd.DataFrame(self._baris_tertunda, columns=["Tanggal"] + DIMENSI + ["Jumlah", "Unit"])
+        frame["Transaksi"] = 1
+        return frame
+
+    # Gabungkan semua sel tertunda ke sel utama
+    @diukur("kubus.padatkan")
+    def padatkan(self):
+        with self._lock:
+            baris = self._frame_baris_tertunda() if self._baris_tertunda else None
+            for granularitas in GRANULARITAS:
+                bagian = [self._sel[granularitas]] + self._frame_tertunda[granularitas]
+                if baris is not None:
+                    bagian.append(_agregasi(baris, granularitas))
+                bagian = [sel for sel in bagian if not sel.empty]
+                if len(bagian) == 1:
+                    self._sel[granularitas] = bagian[0]
+                elif bagian:
+                    self._sel[granularitas] = self._agregasi_ulang(pd.concat(bagian, ignore_index=True))
+                self._frame_tertunda[granularitas] = []
+            self._baris_tertunda = []
+            self._jumlah_tertunda = 0
+
+    def _agregasi_ulang(self, sel):
+        return sel.groupby(["Periode"] + DIMENSI, dropna=False, sort=False)[UKURAN].sum().reset_index()
+
+    # Agregasikan baris tunggal yang tertunda sekali saja sebelum query
+    def _siapkan_query(self):
+        if self._baris_tertunda:
+            baris = self._frame_baris_tertunda()
+            for granularitas in GRANULARITAS:
+                self._frame_tertunda[granularitas].append(_agregasi(baris, granularitas))
+            self._baris_tertunda = []
+        if len(self._frame_tertunda["hari"]) > BATAS_POTONGAN:
+            self.padatkan()
+
+    def _potongan(self, granularitas):
+        yield self._sel[granularitas]
+        yield from self._frame_tertunda[granularitas]
+
+    # Agregat per periode `granularitas` dalam rentang tanggal (inklusif), dirinci menurut
+    # `dimensi` (subset DIMENSI) dan disaring dengan tipe/kategori/produk/pelanggan.
+    # Mengembalikan DataFrame dengan kolom Periode, dimensi, Jumlah, Unit, Transaksi.
+    @diukur("kubus.query")
+    def query(self, granularitas="hari", tanggal_awal=None, tanggal_akhir=None, dimensi=(), **filter):
+        dimensi = list(dimensi)
+        hasil = []
+        with self._lock:
+            self._siapkan_query()
+            for sumber, awal, akhir in rencana_query(granularitas, tanggal_awal, tanggal_akhir):
+                for sel in self._potongan(sumber):
+                    cocok = pd.Series(True, index=sel.index)
+                    if awal is not None:
+                        cocok &= sel["Periode"] >= awal
+                    if akhir is not None:
+                        cocok &= sel["Periode"] <= akhir
+                    for nama, nilai in filter.items():
+                        if nilai is not None:
+                            cocok &= sel[FILTER[nama]] == nilai
+                    if cocok.any():
+                        hasil.append(sel.loc[cocok, ["Periode"] + dimensi + UKURAN])
+        if not hasil:
+            return pd.DataFrame(columns=["Periode"] + dimensi + UKURAN)
+        data = pd.concat(hasil, ignore_index=True)
+        data["Periode"] = awal_periode(data["Periode"], granularitas)
+        return data.groupby(["Periode"] + dimensi, dropna=False)[UKURAN].sum().reset_index()
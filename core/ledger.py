@@ -0,0 +1,58 @@
+import os
+from decimal import ROUND_HALF_UP, Decimal
+
+from core._malas import pd
+from core.metrik import diukur
+from core.penulis import penulis
+from core.penyimpanan import JurnalKeuangan, LedgerBulanan, LedgerSQLite, format_default, migrasi_ledger, migrasi_partisi
+
+# File untuk menyimpan data. Format kolumnar (Arrow) dipakai jika pyarrow tersedia;
+# file CSV lama dimigrasikan satu kali saat pertama dimuat.
+STORAGE_FORMAT = format_default()
+DATA_FILE = f"data_keuangan.{STORAGE_FORMAT}"
+LEGACY_DATA_FILE = "data_keuangan.csv"
+# Mesin penyimpanan ledger: "jurnal" (snapshot + jurnal), "sqlite" (berindeks, laporan
+# per tanggal dijalankan langsung di database) atau "bulanan" (dipartisi per bulan,
+# laporan hanya membaca bulan dalam rentangnya)
+STORAGE_ENGINE = os.environ.get("STORAGE_ENGINE", "jurnal")
+LEDGER_DB = "data_keuangan.db"
+LEDGER_FOLDER = "data_keuangan"
+
+
+# Buka penyimpanan ledger, migrasikan file lama jika ada. Jurnal menjalankan fsync dan
+# kompaksinya lewat penulis latar proses ini.
+def buka_ledger(engine=STORAGE_ENGINE):
+    migrasi_ledger(LEGACY_DATA_FILE, DATA_FILE)
+    if engine == "sqlite":
+        migrasi_ledger(DATA_FILE, LEDGER_DB)
+        return LedgerSQLite(LEDGER_DB)
+    if engine == "bulanan":
+        ledger = LedgerBulanan(LEDGER_FOLDER, penulis=penulis)
+        migrasi_partisi(DATA_FILE, ledger)
+        return ledger
+    return JurnalKeuangan(DATA_FILE, penulis=penulis)
+
+
+# Catat baris baru ke penyimpanan dan commit ke dataset bersama. Ringkasan setiap sesi
+# mengikuti versi dataset (lihat TurunanDataset). Mengembalikan versi baru.
+def komit_baris(ledger, dataset, data_baru):
+    return dataset.komit(data_baru, simpan=ledger.tambah_data)
+
+
+# Satu transaksi sebagai record ledger; Jumlah disimpan sebagai rupiah utuh, sama
+# seperti kolom Jumlah di memori (setengah rupiah dibulatkan ke atas, bukan ke genap)
+def record_transaksi(tanggal, kategori, tipe, jumlah, keterangan):
+    return {
+        "Tanggal": pd.to_datetime(tanggal),
+        "Kategori": kategori,
+        "Tipe": tipe,
+        "Jumlah": int(Decimal(str(jumlah)).quantize(Decimal("1"), ROUND_HALF_UP)),
+        "Keterangan": keterangan,
+    }
+
+
+# Fungsi untuk menambah satu transaksi ke dataset bersama
+@diukur("ledger.komit_transaksi")
+def komit_transaksi(ledger, dataset, tanggal, kategori, tipe, jumlah, keterangan):
+    record = record_transaksi(tanggal, kategori, tipe, jumlah, keterangan)
+    return komit_baris(ledger, dataset, pd.DataFrame([record]))
@@ -0,0 +1,187 @@
+import json
+import os
+import threading
+import time
+from collections import Counter, defaultdict, deque
+from contextlib import contextmanager
+from functools import wraps
+
+# Jumlah sampel durasi terakhir per metrik yang disimpan untuk persentil di panel debug
+UKURAN_SAMPEL = 2048
+# Batas atas bucket histogram (detik) untuk ekspor Prometheus
+BUCKET_DETIK = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+# Keluaran metrik: satu baris JSON per rerun dan/atau file teks Prometheus
+# (untuk node_exporter textfile collector). Kosong berarti tidak ditulis.
+METRIK_JSONL = os.environ.get("METRIK_JSONL")
+METRIK_PROM = os.environ.get("METRIK_PROM")
+# File Prometheus ditulis ulang paling sering sekali per interval ini (detik)
+INTERVAL_PROM = 10
+
+_lock = threading.Lock()
+_sampel = defaultdict(lambda: deque(maxlen=UKURAN_SAMPEL))
+_jumlah = Counter()
+_total = Counter()
+_bucket = defaultdict(lambda: [0] * len(BUCKET_DETIK))
+_penghitung = Counter()
+_prom_terakhir = [0.0]
+# Rerun yang sedang berjalan; Streamlit menjalankan script setiap sesi di thread sendiri
+_lokal = threading.local()
+
+
+def _rerun():
+    return getattr(_lokal, "rerun", None)
+
+
+def catat_durasi(nama, detik):
+    with _lock:
+        _sampel[nama].append(detik)
+        _jumlah[nama] += 1
+        _total[nama] += detik
+        bucket = _bucket[nama]
+        for i, batas in enumerate(BUCKET_DETIK):
+            if detik <= batas:
+                bucket[i] += 1
+    rerun = _rerun()
+    if rerun is not None:
+        rerun["bagian"][nama] += detik
+        rerun["panggilan"][nama] += 1
+
+
+def hitung(nama, n=1):
+    with _lock:
+        _penghitung[nama] += n
+    rerun = _rerun()
+    if rerun is not None:
+        rerun["penghitung"][nama] += n
+
+
+# Ukur durasi satu blok kode:  with ukur("penyimpanan.muat"): ...
+@contextmanager
+def ukur(nama):
+    mulai = time.perf_counter()
+    try:
+        yield
+    finally:
+        catat_durasi(nama, time.perf_counter() - mulai)
+
+
+# Dekorator untuk mengukur setiap pemanggilan fungsi
+def diukur(nama):
+    def dekorator(fungsi):
+        @wraps(fungsi)
+        def pembungkus(*args, **kwargs):
+            with ukur(nama):
+                return fungsi(*args, **kwargs)
+        return pembungkus
+    return dekorator
+
+
+def mulai_rerun(aplikasi):
+    _lokal.rerun = {
+        "aplikasi": aplikasi,
+        "waktu": time.time(),
+        "mulai": time.perf_counter(),
+        "bagian": Counter(),
+        "panggilan": Counter(),
+        "penghitung": Counter(),
+    }
+
+
+# Tutup rerun yang sedang berjalan, catat latensinya dan tulis ke keluaran metrik.
+# Mengembalikan rincian rerun (durasi per bagian bersifat inklusif: bagian yang
+# bersarang juga dihitung di bagian luarnya).
+def selesai_rerun(halaman=None):
+    rerun = _rerun()
+    if rerun is None:
+        return None
+    _lokal.rerun = None
+    total = time.perf_counter() - rerun["mulai"]
+    catat_durasi("rerun", total)
+
+    rekaman = {
+        "waktu": rerun["waktu"],
+        "aplikasi": rerun["aplikasi"],
+        "halaman": halaman,
+        "total_ms": total * 1000,
+        "bagian_ms": {nama: detik * 1000 for nama, detik in rerun["bagian"].most_common()},
+        "panggilan": dict(rerun["panggilan"]),
+        "penghitung": dict(rerun["penghitung"]),
+    }
+    if METRIK_JSONL:
+        tulis_jsonl(rekaman, METRIK_JSONL)
+    if METRIK_PROM and time.monotonic() - _prom_terakhir[0] >= INTERVAL_PROM:
+        _prom_terakhir[0] = time.monotonic()
+        tulis_prometheus(METRIK_PROM)
+    return rekaman
+
+
+def _persentil(sampel_urut, p):
+    if not sampel_urut:
+        return None
+    return sampel_urut[min(len(sampel_urut) - 1, int(p / 100 * len(sampel_urut)))]
+
+
+def persentil(nama, p):
+    with _lock:
+        sampel = sorted(_sampel.get(nama, ()))
+    return _persentil(sampel, p)
+
+
+# Statistik semua metrik durasi: jumlah panggilan, total, p50 dan p99 (detik)
+def statistik():
+    with _lock:
+        data = [(nama, _jumlah[nama], _total[nama], sorted(_sampel[nama])) for nama in sorted(_jumlah)]
+    return [
+        {"nama": nama, "jumlah": jumlah, "total": total, "p50": _persentil(sampel, 50), "p99": _persentil(sampel, 99)}
+        for nama, jumlah, total, sampel in data
+    ]
+
+
+def penghitung():
+    with _lock:
+        return dict(_penghitung)
+
+
+def reset():
+    with _lock:
+        for data in (_sampel, _jumlah, _total, _bucket, _penghitung):
+            data.clear()
+
+
+def tulis_jsonl(rekaman, path):
+    baris = json.dumps(rekaman, separators=(",", ":")) + "\n"
+    with _lock, open(path, "a", encoding="utf-8") as f:
+        f.write(baris)
+
+
+def _label(nama):
+    return nama.replace("\\", "\\\\").replace('"', '\\"')
+
+
+def teks_prometheus():
+    baris = [
+        "# HELP aplikasi_durasi_detik Durasi operasi dan rerun aplikasi.",
+        "# TYPE aplikasi_durasi_detik histogram",
+    ]
+    with _lock:
+        for nama in sorted(_jumlah):
+            label = _label(nama)
+            # Bucket sudah kumulatif: setiap durasi dihitung di semua bucket yang memuatnya
+            for batas, n in zip(BUCKET_DETIK, _bucket[nama]):
+                baris.append(f'aplikasi_durasi_detik_bucket{{nama="{label}",le="{batas}"}} {n}')
+            baris.append(f'aplikasi_durasi_detik_bucket{{nama="{label}",le="+Inf"}} {_jumlah[nama]}')
+            baris.append(f'aplikasi_durasi_detik_sum{{nama="{label}"}} {_total[nama]}')
+            baris.append(f'aplikasi_durasi_detik_count{{nama="{label}"}} {_jumlah[nama]}')
+        baris.append("# HELP aplikasi_kejadian_total Penghitung kejadian (misalnya cache hit/miss).")
+        baris.append("# TYPE aplikasi_kejadian_total counter")
+        for nama in sorted(_penghitung):
+            baris.append(f'aplikasi_kejadian_total{{nama="{_label(nama)}"}} {_penghitung[nama]}')
+    return "\n".join(baris) + "\n"
+
+
+# Tulis atomik agar collector tidak pernah membaca file setengah jadi
+def tulis_prometheus(path):
+    sementara = f"{path}.{os.getpid()}.tmp"
+    with open(sementara, "w", encoding="utf-8") as f:
+        f.write(teks_prometheus())
+    os.replace(sementara, path)
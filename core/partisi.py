@@ -0,0 +1,151 @@
+import argparse
+import multiprocessing
+import os
+import subprocess
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+
+from core._malas import pd
+from core.kubus import sel_harian
+from core.metrik import diukur
+from core.penyimpanan import LedgerBulanan, PenjualanSQLite
+from core.ringkasan import RingkasanBerjalan
+
+# Folder paket aplikasi, untuk menjalankan `python -m core.partisi` dari folder mana pun
+AKAR_PAKET = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+# Bulan berjalan masih menerima transaksi sehingga tidak ikut ditutup
+def bulan_berjalan():
+    return date.today().strftime("%Y-%m")
+
+
+# Sel harian satu partisi; dijalankan di proses pekerja (argumen dari tugas_partisi)
+def _sel_partisi(baca, argumen, ubah):
+    data = baca(*argumen)
+    return sel_harian(ubah(data) if ubah is not None and not data.empty else data)
+
+
+# Bulan yang ditutup: sudah lewat dan belum tersegel (semua yang sudah lewat jika hitung_ulang)
+def bulan_untuk_ditutup(penyimpanan, hitung_ulang=False):
+    tersegel = set(penyimpanan.ringkasan_tersegel.daftar())
+    return [
+        b for b in penyimpanan.daftar_bulan()
+        if b < bulan_berjalan() and (hitung_ulang or b not in tersegel)
+    ]
+
+
+# Tutup buku akhir bulan untuk penyimpanan berpartisi (LedgerBulanan, PenjualanSQLite):
+# sel harian setiap bulan yang ditutup dihitung paralel di process pool, satu bulan per
+# tugas, lalu disegel sebagai ringkasan partisinya dan jurnalnya dipadatkan. Pool memakai
+# "spawn" agar pekerja tidak mewarisi thread dan lock proses pemanggil. Selama tutup buku,
+# kunci antarproses penyimpanan dipegang sehingga penulisan dari aplikasi menunggu dan
+# tidak ada baris yang masuk ke bulan di antara dibaca dan disegel. Mengembalikan bulan
+# yang ditutup.
+@diukur("partisi.tutup_buku")
+def tutup_buku(penyimpanan, hitung_ulang=False, pekerja=None):
+    with penyimpanan.kunci:
+        bulan = bulan_untuk_ditutup(penyimpanan, hitung_ulang)
+        if not bulan:
+            return []
+        # Jurnal di-fsync agar pekerja membaca semua baris yang sudah dicatat
+        penyimpanan.sinkron()
+        tugas = [penyimpanan.tugas_partisi(b) for b in bulan]
+        pekerja = min(pekerja or os.cpu_count() or 1, len(bulan))
+        with ProcessPoolExecutor(pekerja, mp_context=multiprocessing.get_context("spawn")) as pool:
+            for b, sel in zip(bulan, pool.map(_sel_partisi, *zip(*tugas))):
+                penyimpanan.ringkasan_tersegel.tulis(b, sel)
+        # Bulan yang ditutup jarang berubah lagi: jurnalnya digabung ke snapshot sekali
+        penyimpanan.kompaksi(bulan)
+        return bulan
+
+
+# Streamlit menjalankan skrip aplikasi sebagai modul __main__, dan pekerja "spawn" menjalankan
+# ulang modul __main__ (seluruh halaman) sebelum mengerjakan tugasnya. Dari aplikasi, tutup
+# buku dijalankan sebagai proses terpisah (python -m core.partisi) dengan pool-nya sendiri.
+@diukur("partisi.tutup_buku_terpisah")
+def tutup_buku_terpisah(penyimpanan, hitung_ulang=False, pekerja=None):
+    bulan = bulan_untuk_ditutup(penyimpanan, hitung_ulang)
+    if not bulan:
+        return []
+    penyimpanan.sinkron()
+    perintah = [sys.executable, "-m", "core.partisi"]
+    if isinstance(penyimpanan, LedgerBulanan):
+        perintah += ["--ledger", penyimpanan.folder]
+    else:
+        perintah += ["--penjualan", penyimpanan.path_db]
+    if hitung_ulang:
+        perintah.append("--hitung-ulang")
+    if pekerja:
+        perintah += ["--pekerja", str(pekerja)]
+    # Folder kerja aplikasi (tempat file data) belum tentu folder paket
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [AKAR_PAKET, os.environ.get("PYTHONPATH")])))
+    hasil = subprocess.run(perintah, capture_output=True, text=True, env=env)
+    if hasil.returncode != 0:
+        galat = hasil.stderr.strip().splitlines()
+        raise RuntimeError(galat[-1] if galat else f"tutup buku gagal (kode {hasil.returncode})")
+    return bulan
+
+
+# Ringkasan berjalan seluruh riwayat dari ringkasan tersegel setiap partisi; hanya
+# partisi yang belum ditutup (biasanya bulan berjalan) yang dibaca barisnya. Sel semua
+# partisi digabung, jadi hasilnya sama dengan ringkasan dari seluruh baris.
+@diukur("partisi.ringkasan_partisi")
+def ringkasan_partisi(penyimpanan):
+    sel = []
+    for kunci in penyimpanan.daftar_partisi():
+        tersegel = penyimpanan.ringkasan_tersegel.baca(kunci)
+        sel.append(tersegel if tersegel is not None else _sel_partisi(*penyimpanan.tugas_partisi(kunci)))
+    sel = [s for s in sel if not s.empty]
+    if not sel:
+        return RingkasanBerjalan()
+    return RingkasanBerjalan.dari_sel(pd.concat(sel, ignore_index=True))
+
+
+# Ringkasan berjalan dari ringkasan tersegel partisi yang sudah ditutup ditambah baris
+# `data` yang partisinya belum ditutup (misalnya hasil LedgerBulanan.muat_terbuka).
+# Baris `data` di bulan yang sudah tersegel dilewati karena sudah tercakup segelnya.
+@diukur("partisi.ringkasan_terbuka")
+def ringkasan_terbuka(penyimpanan, data):
+    tersegel = set(penyimpanan.ringkasan_tersegel.daftar())
+    sel = [penyimpanan.ringkasan_tersegel.baca(kunci) for kunci in penyimpanan.daftar_partisi() if kunci in tersegel]
+    sel = [s for s in sel if s is not None and not s.empty]
+    ringkasan = RingkasanBerjalan.dari_sel(pd.concat(sel, ignore_index=True)) if sel else RingkasanBerjalan()
+    ringkasan.tambah_ledger(penyimpanan.saring_terbuka(data))
+    return ringkasan
+
+
+# Tutup buku dari cron atau terminal, misalnya setiap tanggal 1 (tanpa --ledger/--penjualan:
+# ledger bulanan dan riwayat penjualan clothing di lokasi default):
+#
+#   python -m core.partisi --hitung-ulang --arsipkan-sebelum 2023
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m core.partisi")
+    parser.add_argument("--ledger", help="folder ledger bulanan")
+    parser.add_argument("--penjualan", help="database riwayat penjualan")
+    parser.add_argument("--hitung-ulang", action="store_true", help="hitung ulang semua bulan yang sudah lewat")
+    parser.add_argument("--pekerja", type=int, default=None, help="banyak proses (default: jumlah CPU)")
+    parser.add_argument("--arsipkan-sebelum", type=int, default=None, help="arsipkan ledger sampai sebelum tahun ini")
+    argumen = parser.parse_args(argv)
+
+    if argumen.ledger is None and argumen.penjualan is None:
+        from core.ledger import LEDGER_FOLDER
+        from core.sales import CLOTHING_SALES_DB
+        argumen.ledger, argumen.penjualan = LEDGER_FOLDER, CLOTHING_SALES_DB
+
+    if argumen.ledger is not None:
+        ledger = LedgerBulanan(argumen.ledger)
+        print(f"ledger: {len(tutup_buku(ledger, argumen.hitung_ulang, argumen.pekerja))} bulan ditutup")
+        if argumen.arsipkan_sebelum is not None:
+            for tahun in sorted({b[:4] for b in ledger.daftar_bulan()}):
+                if int(tahun) < argumen.arsipkan_sebelum:
+                    print(f"ledger: {ledger.arsipkan(tahun):,} baris tahun {tahun} diarsipkan")
+        ledger.tutup()
+    if argumen.penjualan is not None:
+        penjualan = PenjualanSQLite(argumen.penjualan)
+        print(f"penjualan: {len(tutup_buku(penjualan, argumen.hitung_ulang, argumen.pekerja))} bulan ditutup")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+import re
+import threading
+from collections import OrderedDict, defaultdict
+
+from core._malas import np, pd
+from core.metrik import diukur
+
+# Panjang n-gram untuk istilah pencarian; istilah yang lebih pendek dicari lewat indeks awalan
+PANJANG_NGRAM = 3
+# Banyak hasil pencarian yang ditampilkan secara default
+K_HASIL = 10
+# Banyak istilah terakhir yang token cocoknya disimpan untuk type-ahead
+UKURAN_CACHE = 256
+
+
+def _token(teks):
+    return re.findall(r"\w+", str(teks).lower())
+
+
+def _ngram(istilah):
+    return {istilah[i:i + PANJANG_NGRAM] for i in range(len(istilah) - PANJANG_NGRAM + 1)}
+
+
+# Istilah pendek cocok dengan awal token, istilah sepanjang n-gram atau lebih dengan
+# bagian mana pun dari token
+def _cocok(token, istilah):
+    return token.startswith(istilah) if len(istilah) < PANJANG_NGRAM else istilah in token
+
+
+# Semua token yang cocok dengan istilah `baru` juga cocok dengan istilah `lama`
+def _lebih_umum(lama, baru):
+    if len(lama) < PANJANG_NGRAM:
+        return len(baru) < PANJANG_NGRAM and baru.startswith(lama)
+    return lama in baru
+
+
+# Indeks pencarian produk untuk katalog besar. Teks kolom (nama, merek, ukuran, warna)
+# dipecah menjadi token; setiap token kosakata menyimpan posisi produk yang memuatnya, dan
+# kosakata diindeks per awalan pendek (1 sampai PANJANG_NGRAM - 1 huruf) dan per n-gram.
+# Kueri dijawab dengan mencari token yang cocok di kosakata (jauh lebih kecil dari katalog)
+# lalu menggabungkan posisi produknya. Produk yang cocok dengan semua kata kueri diurutkan
+# menurut banyak kata yang cocok di awal token, lalu urutan katalog, dan hanya k teratas
+# yang dikembalikan. Token cocok per istilah disimpan sehingga mengetik satu huruf lagi
+# ("jea" -> "jean") cukup menyaring hasil istilah sebelumnya.
+class IndeksProduk:
+    def __init__(self, data, kolom_kode, kolom_teks, ukuran_cache=UKURAN_CACHE):
+        self.kolom_kode = kolom_kode
+        self.kolom_teks = list(kolom_teks)
+        self.ukuran_cache = ukuran_cache
+        self._kode = []       # posisi -> kode produk (urutan katalog)
+        self._kosakata = {}   # token -> id token
+        self._token = []      # id token -> token
+        self._posisi = []     # id token -> list array posisi produk
+        self._awalan = defaultdict(set)  # awalan pendek -> id token
+        self._ngram = defaultdict(set)   # n-gram -> id token
+        self._cache = OrderedDict()      # istilah -> (id token cocok, id token yang diawali istilah)
+        self._lock = threading.Lock()
+        self.tambah_data(data)
+
+    def __len__(self):
+        return len(self._kode)
+
+    def _id_token(self, token):
+        id_token = self._kosakata.get(token)
+        if id_token is None:
+            id_token = self._kosakata[token] = len(self._token)
+            self._token.append(token)
+            self._posisi.append([])
+            for panjang in range(1, min(len(token), PANJANG_NGRAM - 1) + 1):
+                self._awalan[token[:panjang]].add(id_token)
+            for gram in _ngram(token):
+                self._ngram[gram].add(id_token)
+        return id_token
+
+    # Tokenisasi per nilai unik kolom (kolom katalog berkardinalitas rendah), bukan per baris
+    def _tambah_kolom(self, nilai, awal):
+        kode_nilai, unik = pd.factorize(nilai)
+        urutan = np.argsort(kode_nilai, kind="stable")
+        batas = np.searchsorted(kode_nilai[urutan], np.arange(len(unik) + 1))
+        for i, teks in enumerate(unik):
+            posisi = urutan[batas[i]:batas[i + 1]] + awal
+            for token in set(_token(teks)):
+                self._posisi[self._id_token(token)].append(posisi)
+
+    @diukur("pencarian.tambah_data")
+    def tambah_data(self, data):
+        with self._lock:
+            awal = len(self._kode)
+            self._kode.extend(data[self.kolom_kode].tolist())
+            for kolom in self.kolom_teks:
+                self._tambah_kolom(data[kolom], awal)
+            self._cache.clear()
+
+    # Tambah satu produk (dict kolom -> nilai)
+    def tambah(self, produk):
+        self.tambah_data(pd.DataFrame([produk]))
+
+    # Token kosakata yang cocok dengan satu istilah
+    def _token_cocok(self, istilah):
+        if istilah in self._cache:
+            self._cache.move_to_end(istilah)
+            return self._cache[istilah]
+        kandidat = None
+        for lama, (cocok, _) in self._cache.items():
+            if _lebih_umum(lama, istilah) and (kandidat is None or len(cocok) < len(kandidat)):
+                kandidat = cocok
+        if kandidat is None:
+            if len(istilah) < PANJANG_NGRAM:
+                kandidat = self._awalan.get(istilah, ())
+            else:
+                kandidat = set.intersection(*sorted((self._ngram.get(gram, set()) for gram in _ngram(istilah)), key=len))
+        cocok = [i for i in kandidat if _cocok(self._token[i], istilah)]
+        hasil = (cocok, [i for i in cocok if self._token[i].startswith(istilah)])
+        self._cache[istilah] = hasil
+        if len(self._cache) > self.ukuran_cache:
+            self._cache.popitem(last=False)
+        return hasil
+
+    def _mask(self, id_token):
+        mask = np.zeros(len(self._kode), dtype=bool)
+        posisi = [p for i in id_token for p in self._posisi[i]]
+        if posisi:
+            mask[np.concatenate(posisi)] = True
+        return mask
+
+    # Mask produk yang cocok dengan semua istilah, dan banyak istilah yang cocok di awal token
+    def _cocokkan(self, istilah):
+        hasil = np.ones(len(self._kode), dtype=bool)
+        skor = np.zeros(len(self._kode), dtype=np.int16)
+        for i in istilah:
+            cocok, di_awal = self._token_cocok(i)
+            hasil &= self._mask(cocok)
+            skor += self._mask(di_awal)
+        return hasil, skor
+
+    # Paling banyak k kode produk yang cocok dengan semua kata di `kueri`, terbaik lebih dulu
+    @diukur("pencarian.cari")
+    def cari(self, kueri, k=K_HASIL):
+        istilah = tuple(dict.fromkeys(_token(kueri)))
+        if not istilah:
+            return []
+        with self._lock:
+            hasil, skor = self._cocokkan(istilah)
+            posisi = []
+            for s in range(len(istilah), -1, -1):
+                posisi.extend(np.flatnonzero(hasil & (skor == s))[:k - len(posisi)].tolist())
+                if len(posisi) >= k:
+                    break
+            return [self._kode[p] for p in posisi]
+
+    # Banyak produk yang cocok dengan kueri
+    def hitung(self, kueri):
+        istilah = tuple(dict.fromkeys(_token(kueri)))
+        if not istilah:
+            return 0
+        with self._lock:
+            return int(self._cocokkan(istilah)[0].sum())
@@ -0,0 +1,167 @@
+import atexit
+import queue
+import threading
+import time
+
+from core.metrik import hitung, ukur
+
+# Banyak penulisan (kunci berbeda) yang boleh tertunda; jika penuh, pemanggil menunggu
+UKURAN_ANTREAN = 64
+# Penulisan yang gagal dicoba lagi sampai BATAS_ULANG kali, dengan jeda JEDA_ULANG detik
+# yang berlipat dua setiap kali
+BATAS_ULANG = 3
+JEDA_ULANG = 0.5
+
+
+# Penulis latar (write-behind): penulisan file dijalankan oleh satu thread di belakang
+# sehingga handler tombol cukup memperbarui data di memori. Setiap penulisan punya kunci
+# (misalnya path file); penulisan dengan kunci yang sama yang masih tertunda digabung dan
+# hanya yang terakhir dijalankan, sehingga tabel stok yang berubah beberapa kali
+# berturut-turut cukup ditulis sekali. Satu thread menjaga urutan penulisan per kunci.
+# File ditulis oleh fungsinya sendiri (tulis_tabel: file sementara + rename atomik).
+# Penulisan yang gagal dijadwalkan ulang kecuali sudah ada penulisan lebih baru untuk
+# kuncinya; galatnya tetap di `status()` sampai kunci itu berhasil ditulis.
+class PenulisLatar:
+    def __init__(self, ukuran_antrean=UKURAN_ANTREAN, batas_ulang=BATAS_ULANG, jeda_ulang=JEDA_ULANG):
+        self._antrean = queue.Queue(ukuran_antrean)  # kunci yang menunggu, None = berhenti
+        self._tugas = {}  # kunci -> fungsi tulis terbaru yang belum dijalankan
+        self._percobaan = {}  # kunci -> percobaan ke berapa untuk tugas yang tertunda
+        self._ulang = {}  # kunci -> timer percobaan ulang yang belum jalan
+        self.batas_ulang = batas_ulang
+        self.jeda_ulang = jeda_ulang
+        self._lock = threading.Lock()
+        self._kosong = threading.Condition(self._lock)
+        self._berjalan = 0
+        self._thread = None
+        self._tutup = False
+        self.ditulis = 0
+        self.digabung = 0
+        self.diulang = 0
+        self.terakhir = None  # waktu penulisan terakhir selesai
+        self.galat = {}       # kunci -> exception penulisan terakhir yang gagal
+
+    def _mulai(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._jalankan, name="penulis-latar", daemon=True)
+            self._thread.start()
+
+    # Jadwalkan `tulis()` dengan kunci `kunci`. Setelah ditutup, ditulis langsung.
+    def kirim(self, kunci, tulis):
+        with self._lock:
+            if self._tutup:
+                antre = False
+            else:
+                antre = kunci not in self._tugas
+                if not antre:
+                    self.digabung += 1
+                    hitung("penulis.digabung")
+                # Penulisan baru menggantikan percobaan ulang yang lama
+                timer = self._ulang.pop(kunci, None)
+                if timer is not None:
+                    timer.cancel()
+                self._percobaan.pop(kunci, None)
+                self._tugas[kunci] = tulis
+                self._mulai()
+        if self._tutup:
+            self._tulis(kunci, tulis)
+        elif antre:
+            self._antrean.put(kunci)
+
+    def _tulis(self, kunci, tulis, percobaan=1):
+        try:
+            with ukur("penulis.tulis"):
+                tulis()
+        except Exception as e:
+            galat = e
+        else:
+            galat = None
+        with self._lock:
+            self.ditulis += 1
+            self.terakhir = time.time()
+            if galat is None:
+                self.galat.pop(kunci, None)
+            else:
+                self.galat[kunci] = galat
+                if percobaan < self.batas_ulang and not self._tutup and kunci not in self._tugas:
+                    timer = threading.Timer(
+                        self.jeda_ulang * 2 ** (percobaan - 1), self._ulangi, (kunci, tulis, percobaan + 1)
+                    )
+                    timer.daemon = True
+                    self._ulang[kunci] = timer
+                    timer.start()
+
+    # Dijalankan timer: masukkan lagi penulisan yang gagal ke antrean
+    def _ulangi(self, kunci, tulis, percobaan):
+        with self._lock:
+            # Sudah digantikan penulisan baru atau diambil alih oleh tutup()
+            if self._ulang.get(kunci) is not threading.current_thread():
+                return
+            del self._ulang[kunci]
+            self.diulang += 1
+            hitung("penulis.diulang")
+            self._tugas[kunci] = tulis
+            self._percobaan[kunci] = percobaan
+        self._antrean.put(kunci)
+
+    def _jalankan(self):
+        while True:
+            kunci = self._antrean.get()
+            with self._lock:
+                if kunci is None:
+                    # Ditutup: jalankan juga tugas yang didaftarkan tepat sebelum ditutup
+                    sisa, self._tugas = self._tugas, {}
+                else:
+                    sisa = {kunci: self._tugas.pop(kunci, None)}
+                sisa = [(k, tulis, self._percobaan.pop(k, 1)) for k, tulis in sisa.items()]
+                self._berjalan += 1
+            for kunci_sisa, tulis, percobaan in sisa:
+                if tulis is not None:
+                    self._tulis(kunci_sisa, tulis, percobaan)
+            with self._lock:
+                self._berjalan -= 1
+                self._kosong.notify_all()
+            if kunci is None:
+                return
+
+    # Banyak penulisan yang belum selesai (tertunda, sedang berjalan atau menunggu diulang)
+    def tertunda(self):
+        with self._lock:
+            return len(self._tugas) + self._berjalan + len(self._ulang)
+
+    def status(self):
+        with self._lock:
+            return {
+                "tertunda": len(self._tugas) + self._berjalan + len(self._ulang),
+                "menunggu_ulang": list(self._ulang),
+                "ditulis": self.ditulis,
+                "digabung": self.digabung,
+                "diulang": self.diulang,
+                "terakhir": self.terakhir,
+                "galat": dict(self.galat),
+            }
+
+    # Tunggu sampai semua penulisan selesai; False jika `batas_waktu` (detik) habis
+    def tunggu(self, batas_waktu=None):
+        with self._lock:
+            return self._kosong.wait_for(lambda: not self._tugas and not self._berjalan and not self._ulang, batas_waktu)
+
+    # Selesaikan semua penulisan lalu hentikan thread; dipanggil saat proses berhenti.
+    # Percobaan ulang yang masih menunggu dijalankan sekali lagi tanpa jeda.
+    def tutup(self):
+        with self._lock:
+            if self._tutup:
+                return
+            self._tutup = True
+            for kunci, timer in self._ulang.items():
+                timer.cancel()
+                self._tugas.setdefault(kunci, timer.args[1])
+            self._ulang = {}
+            thread = self._thread
+        if thread is not None:
+            self._antrean.put(None)
+            thread.join()
+
+
+# Penulis latar bersama untuk proses ini; semua penulisan selesai sebelum proses keluar
+penulis = PenulisLatar()
+atexit.register(penulis.tutup)
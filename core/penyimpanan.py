@@ -0,0 +1,1186 @@
+import importlib.util
+import json
+import os
+import re
+import sqlite3
+import threading
+from contextlib import closing, nullcontext
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+from core._malas import np, pd
+from core.kubus import sel_harian
+from core.metrik import diukur
+from core.ringkasan import baris_penjualan
+from core.skema import SKEMA_LEDGER, SKEMA_PENJUALAN, terapkan_skema
+
+KOLOM_KEUANGAN = ["Tanggal", "Kategori", "Tipe", "Jumlah", "Keterangan"]
+KOLOM_PENJUALAN = ["Date", "IdProduk", "NamaProduk", "Quantity", "TotalPrice", "CustomerId"]
+
+# Jumlah baris jurnal sebelum digabung (kompaksi) ke file snapshot
+BATAS_KOMPAKSI = 5000
+# Jumlah segmen (batch besar) sebelum digabung ke file snapshot
+BATAS_SEGMEN = 8
+
+
+# Ubah nilai numpy/pandas menjadi tipe yang bisa ditulis ke JSON
+def _ke_json(nilai):
+    if hasattr(nilai, "isoformat"):
+        return nilai.isoformat()
+    if hasattr(nilai, "item"):
+        return nilai.item()
+    raise TypeError(f"Tipe {type(nilai).__name__} tidak bisa disimpan ke jurnal")
+
+
+# Format file snapshot. CSV tetap didukung; Arrow (Feather tanpa kompresi) dibaca
+# lewat memory map sehingga kolom numerik tidak perlu di-parse ulang saat start.
+class FormatCSV:
+    nama = "csv"
+
+    def baca(self, path, kolom_tanggal=()):
+        return pd.read_csv(path, parse_dates=list(kolom_tanggal) or False)
+
+    def tulis(self, data, f):
+        data.to_csv(f, index=False)
+
+
+class FormatArrow:
+    nama = "arrow"
+
+    def baca(self, path, kolom_tanggal=()):
+        from pyarrow import feather
+        return feather.read_table(path, memory_map=True).to_pandas()
+
+    def tulis(self, data, f):
+        from pyarrow import feather
+        feather.write_feather(data.reset_index(drop=True), f, compression="uncompressed")
+
+
+class FormatParquet:
+    nama = "parquet"
+
+    def baca(self, path, kolom_tanggal=()):
+        return pd.read_parquet(path, memory_map=True)
+
+    def tulis(self, data, f):
+        data.to_parquet(f, index=False)
+
+
+FORMAT = {f.nama: f for f in (FormatCSV(), FormatArrow(), FormatParquet())}
+
+
+# Arrow dipakai jika pyarrow terpasang, selain itu tetap CSV
+def format_default():
+    return "arrow" if importlib.util.find_spec("pyarrow") is not None else "csv"
+
+
+def format_dari_path(path):
+    ekstensi = os.path.splitext(path)[1].lstrip(".")
+    return FORMAT.get(ekstensi, FORMAT["csv"])
+
+
+@diukur("penyimpanan.baca_tabel")
+def baca_tabel(path, kolom_tanggal=()):
+    return format_dari_path(path).baca(path, kolom_tanggal)
+
+
+# Tulis tabel ke file sementara lalu rename atomik, agar file lama tetap utuh jika gagal
+@diukur("penyimpanan.tulis_tabel")
+def tulis_tabel(data, path):
+    sementara = path + ".tmp"
+    with open(sementara, "wb") as f:
+        format_dari_path(path).tulis(data, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(sementara, path)
+
+
+# Tipe kolom ledger menurut skema: Tanggal datetime64, Kategori/Tipe kategorikal dan
+# Jumlah int64 rupiah. Kolom yang tipenya sudah benar (misalnya dari snapshot Arrow)
+# tidak disalin ulang.
+def rapikan_ledger(data):
+    return terapkan_skema(data, SKEMA_LEDGER)
+
+
+# Ledger tanpa baris dengan tipe kolom yang sama seperti ledger berisi
+def ledger_kosong(kolom=KOLOM_KEUANGAN):
+    return rapikan_ledger(pd.DataFrame({k: pd.Series(dtype="datetime64[us]" if k == "Tanggal" else "str") for k in kolom}))
+
+
+# Migrasi satu kali dari file lama (misalnya CSV + jurnalnya) ke format baru.
+# File lama tidak dihapus agar masih bisa dipakai untuk rollback.
+def migrasi_ledger(path_lama, path_baru):
+    if os.path.exists(path_baru) or path_lama == path_baru:
+        return
+    if not os.path.exists(path_lama) and not os.path.exists(path_lama + ".jurnal"):
+        return
+    data = JurnalKeuangan(path_lama).muat()
+    if path_baru.endswith(".db"):
+        LedgerSQLite(path_baru).tambah(data.to_dict("records"))
+    else:
+        tulis_tabel(data, path_baru)
+
+
+# Nama kolom ledger -> kolom tabel SQLite
+KOLOM_SQL = {"Tanggal": "tanggal", "Kategori": "kategori", "Tipe": "tipe", "Jumlah": "jumlah", "Keterangan": "keterangan"}
+
+
+def _ke_teks_tanggal(tanggal):
+    return pd.Timestamp(tanggal).isoformat()
+
+
+def _ke_sql(nilai):
+    return nilai.item() if hasattr(nilai, "item") else nilai
+
+
+# Migrasi satu kali dari ledger satu file ke ledger berpartisi yang masih kosong
+def migrasi_partisi(path_lama, ledger):
+    if ledger.daftar_partisi():
+        return
+    if not os.path.exists(path_lama) and not os.path.exists(path_lama + ".jurnal"):
+        return
+    data = JurnalKeuangan(path_lama).muat()
+    if not data.empty:
+        ledger.tambah_data(data)
+
+
+def migrasi_tabel(path_lama, path_baru):
+    if os.path.exists(path_baru) or path_lama == path_baru or not os.path.exists(path_lama):
+        return
+    tulis_tabel(baca_tabel(path_lama), path_baru)
+
+
+def _kunci_fd(fd):
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        return
+    os.lseek(fd, 0, os.SEEK_SET)
+    while True:
+        try:
+            msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+            return
+        except OSError:
+            # LK_LOCK menyerah setelah sekitar 10 detik; terus tunggu
+            continue
+
+
+def _lepas_fd(fd):
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+    else:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+
+# Kunci antarproses berbasis file untuk penulis yang berbagi file yang sama, misalnya
+# aplikasi dan CLI impor pada satu jurnal, atau tutup buku dan kasir pada satu ledger.
+# Bisa dimasuki ulang oleh thread yang sama. File kunci juga menyimpan satu nilai teks
+# (baca/tulis, hanya selama kunci dipegang) untuk memberi tahu penulis lain bahwa isi
+# file yang dilindungi sudah berubah.
+class KunciProses:
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.RLock()
+        self._kedalaman = 0
+        self._fd = None
+
+    def __enter__(self):
+        self._lock.acquire()
+        if self._kedalaman == 0:
+            try:
+                fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o666)
+                try:
+                    _kunci_fd(fd)
+                except BaseException:
+                    os.close(fd)
+                    raise
+            except BaseException:
+                self._lock.release()
+                raise
+            self._fd = fd
+        self._kedalaman += 1
+        return self
+
+    def __exit__(self, *galat):
+        self._kedalaman -= 1
+        if self._kedalaman == 0:
+            fd, self._fd = self._fd, None
+            try:
+                _lepas_fd(fd)
+            finally:
+                os.close(fd)
+        self._lock.release()
+
+    def baca(self):
+        os.lseek(self._fd, 0, os.SEEK_SET)
+        return os.read(self._fd, 64).decode()
+
+    def tulis(self, nilai):
+        os.ftruncate(self._fd, 0)
+        os.lseek(self._fd, 0, os.SEEK_SET)
+        os.write(self._fd, str(nilai).encode())
+
+
+# Penyimpanan ledger: snapshot (CSV/Arrow/Parquet) + jurnal append-only (satu baris JSON per transaksi).
+# Setiap record jurnal menyimpan nomor barisnya di ledger ("no"), sehingga record
+# yang sudah ikut masuk snapshot (misalnya karena kompaksi terputus) dilewati saat dimuat.
+# Batch besar ditulis sebagai segmen, file tabel berformat snapshot yang namanya memuat
+# nomor baris pertamanya ("data.arrow.segmen.000000120000.arrow"), dengan aturan yang sama.
+# Dengan `penulis` (PenulisLatar), fsync dan kompaksi dijalankan di belakang: pemanggil
+# hanya menunggu baris jurnal ditulis dan di-flush ke OS, dan fsync beruntun digabung.
+# hanya_baca=True untuk pembaca di proses lain: potongan jurnal yang belum lengkap
+# dilewati tanpa memotong file, karena bisa jadi sedang ditulis.
+# Penulis di proses berbeda (aplikasi, CLI impor) bergantian lewat KunciProses
+# ("data.arrow.kunci"). File kunci menyimpan jumlah baris ledger setelah penulisan
+# terakhir; penulis yang melihat jumlah lain memuat ulang sebelum menulis, sehingga nomor
+# barisnya melanjutkan baris proses lain dan tidak ada baris yang dilewati saat dimuat.
+class JurnalKeuangan:
+    def __init__(self, path_snapshot, kolom=KOLOM_KEUANGAN, batas_kompaksi=BATAS_KOMPAKSI, fsync_setiap=1, penulis=None,
+                 hanya_baca=False, batas_segmen=BATAS_SEGMEN):
+        self.path_snapshot = path_snapshot
+        self.path_jurnal = path_snapshot + ".jurnal"
+        self.kolom = list(kolom)
+        self.batas_kompaksi = batas_kompaksi
+        self.batas_segmen = batas_segmen
+        self.fsync_setiap = fsync_setiap
+        self.penulis = penulis
+        self.hanya_baca = hanya_baca
+        self._lock = threading.RLock()
+        self._kunci = KunciProses(path_snapshot + ".kunci")
+        self._file = None
+        self._jumlah_baris = None
+        self._baris_jurnal = 0
+        self._belum_sinkron = 0
+        self._baris_snapshot = 0
+        self._segmen = 0
+        self._baris_segmen = 0
+
+    def _path_segmen(self, awal):
+        return f"{self.path_snapshot}.segmen.{awal:012d}.{format_dari_path(self.path_snapshot).nama}"
+
+    # Segmen yang ada sebagai (nomor baris pertama, path), terurut
+    def daftar_segmen(self):
+        folder = os.path.dirname(self.path_snapshot) or "."
+        pola = re.compile(
+            rf"{re.escape(os.path.basename(self.path_snapshot))}\.segmen\.(\d{{12}})\.{format_dari_path(self.path_snapshot).nama}"
+        )
+        try:
+            nama = os.listdir(folder)
+        except FileNotFoundError:
+            return []
+        return sorted((int(m.group(1)), os.path.join(folder, m.group(0))) for m in map(pola.fullmatch, nama) if m)
+
+    # Ada baris di luar snapshot (jurnal atau segmen) yang belum digabung
+    def belum_dipadatkan(self):
+        return (os.path.exists(self.path_jurnal) and os.path.getsize(self.path_jurnal) > 0) or bool(self.daftar_segmen())
+
+    def _baca_snapshot(self):
+        try:
+            return baca_tabel(self.path_snapshot, kolom_tanggal=["Tanggal"])
+        except FileNotFoundError:
+            return pd.DataFrame(columns=self.kolom)
+
+    # Baca record jurnal; potongan terakhir yang tidak lengkap (crash saat menulis) dibuang
+    def _baca_jurnal(self):
+        try:
+            with open(self.path_jurnal, "rb") as f:
+                isi = f.read()
+        except FileNotFoundError:
+            return []
+
+        records = []
+        posisi = 0
+        for baris in isi.split(b"\n"):
+            if not baris.strip():
+                posisi += len(baris) + 1
+                continue
+            try:
+                records.append(json.loads(baris))
+            except ValueError:
+                break
+            posisi += len(baris) + 1
+
+        if posisi < len(isi) and not self.hanya_baca:
+            with open(self.path_jurnal, "r+b") as f:
+                f.truncate(posisi)
+        return records
+
+    # Snapshot dan segmen yang belum tercakup snapshot. Segmen yang hilang di antara
+    # keduanya berarti kompaksi (di proses lain) baru mengganti snapshot: baca ulang.
+    def _baca_snapshot_segmen(self):
+        while True:
+            snapshot = self._baca_snapshot()
+            try:
+                segmen = [
+                    (awal, baca_tabel(path, kolom_tanggal=["Tanggal"]))
+                    for awal, path in self.daftar_segmen() if awal >= len(snapshot)
+                ]
+            except FileNotFoundError:
+                continue
+            return snapshot, segmen
+
+    @diukur("jurnal.muat")
+    def muat(self):
+        # Pembaca hanya-baca tidak memotong jurnal sehingga tidak perlu kunci antarproses
+        with self._lock, (nullcontext() if self.hanya_baca else self._kunci):
+            snapshot, segmen = self._baca_snapshot_segmen()
+            records = [r for r in self._baca_jurnal() if r.get("no", 0) >= len(snapshot)]
+            self._baris_jurnal = len(records)
+            self._baris_snapshot = len(snapshot)
+            self._segmen = len(segmen)
+            self._baris_segmen = sum(len(bagian) for _, bagian in segmen)
+
+            # Segmen dan record jurnal disusun menurut nomor baris ledgernya
+            bagian = [bagian[self.kolom] for _, bagian in segmen]
+            nomor = [np.arange(awal, awal + len(bagian)) for awal, bagian in segmen]
+            if records:
+                jurnal = pd.DataFrame.from_records(records)
+                jurnal["Tanggal"] = pd.to_datetime(jurnal["Tanggal"])
+                bagian.append(jurnal[self.kolom])
+                nomor.append(jurnal["no"].to_numpy())
+            if len(bagian) > 1:
+                nomor = np.concatenate(nomor)
+                ekor = pd.concat(bagian, ignore_index=True)
+                if (np.diff(nomor) < 0).any():
+                    ekor = ekor.take(np.argsort(nomor, kind="stable")).reset_index(drop=True)
+            else:
+                ekor = bagian[0] if bagian else None
+
+            if ekor is None:
+                data = snapshot
+            else:
+                data = pd.concat([snapshot, ekor], ignore_index=True) if not snapshot.empty else ekor
+            data = rapikan_ledger(data) if not data.empty else ledger_kosong(self.kolom)
+
+            self._jumlah_baris = len(data)
+            return data
+
+    def _buka(self):
+        if self._file is None:
+            self._file = open(self.path_jurnal, "a", encoding="utf-8")
+        return self._file
+
+    # Dipanggil di bawah kunci antarproses: muat ulang jika proses lain sudah menulis
+    # sejak jumlah baris yang diketahui proses ini (file kunci kosong: belum ada penulis)
+    def _segarkan(self):
+        if self._jumlah_baris is None or self._kunci.baca() not in ("", str(self._jumlah_baris)):
+            self.muat()
+
+    # Tambahkan record ke jurnal. Satu panggilan = satu flush; fsync dilakukan
+    # setiap `fsync_setiap` panggilan sehingga satu transaksi multi-baris cukup satu fsync.
+    @diukur("jurnal.tambah")
+    def tambah(self, records):
+        with self._lock, self._kunci:
+            self._segarkan()
+
+            f = self._buka()
+            for record in records:
+                baris = {"no": self._jumlah_baris}
+                baris.update({kolom: record.get(kolom) for kolom in self.kolom})
+                f.write(json.dumps(baris, default=_ke_json) + "\n")
+                self._jumlah_baris += 1
+                self._baris_jurnal += 1
+            f.flush()
+            self._kunci.tulis(self._jumlah_baris)
+
+            self._belum_sinkron += 1
+            if self._belum_sinkron >= self.fsync_setiap:
+                self._jalankan("sinkron", self.sinkron)
+
+            if self._baris_jurnal >= self.batas_kompaksi:
+                self._jalankan("kompaksi", self.kompaksi)
+
+    # Jalankan langsung, atau di belakang lewat penulis latar jika ada
+    def _jalankan(self, nama, fungsi):
+        if self.penulis is None:
+            fungsi()
+        else:
+            self.penulis.kirim((nama, self.path_jurnal), fungsi)
+
+    def sinkron(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.flush()
+                os.fsync(self._file.fileno())
+            self._belum_sinkron = 0
+
+    # Tambahkan banyak baris sekaligus dari DataFrame. Batch sebesar batas kompaksi atau
+    # lebih ditulis sebagai satu segmen tanpa melewati jurnal JSON dan tanpa menulis ulang
+    # snapshot; batch kecil dicatat ke jurnal seperti biasa. Segmen digabung ke snapshot
+    # setelah `batas_segmen` segmen, atau setelah barisnya sebanyak isi snapshot (sehingga
+    # impor besar per chunk menulis ulang snapshot hanya O(log n) kali).
+    @diukur("jurnal.tambah_data")
+    def tambah_data(self, data):
+        if len(data) < self.batas_kompaksi:
+            self.tambah(data.to_dict("records"))
+            return
+        with self._lock, self._kunci:
+            self._segarkan()
+            # Record jurnal sebelum segmen ini sudah di disk saat segmennya ada
+            self.sinkron()
+            tulis_tabel(rapikan_ledger(data[self.kolom].reset_index(drop=True)), self._path_segmen(self._jumlah_baris))
+            self._jumlah_baris += len(data)
+            self._kunci.tulis(self._jumlah_baris)
+            self._segmen += 1
+            self._baris_segmen += len(data)
+            if self._segmen >= self.batas_segmen or self._baris_segmen >= self._baris_snapshot:
+                self._jalankan("kompaksi", self.kompaksi)
+
+    # Gabungkan jurnal dan segmen ke snapshot baru (tulis ke file sementara lalu rename
+    # atomik), kemudian kosongkan jurnal dan hapus segmennya.
+    @diukur("jurnal.kompaksi")
+    def kompaksi(self):
+        with self._lock, self._kunci:
+            self._ganti_snapshot(self.muat())
+
+    # Jika proses berhenti setelah snapshot diganti tapi sebelum jurnal dikosongkan,
+    # record jurnal dan segmen yang tersisa sudah tercakup snapshot dan dilewati saat dimuat.
+    def _ganti_snapshot(self, data):
+        tulis_tabel(data, self.path_snapshot)
+
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        with open(self.path_jurnal, "w", encoding="utf-8"):
+            pass
+        for _, path in self.daftar_segmen():
+            os.remove(path)
+        self._jumlah_baris = len(data)
+        self._baris_jurnal = 0
+        self._belum_sinkron = 0
+        self._baris_snapshot = len(data)
+        self._segmen = 0
+        self._baris_segmen = 0
+
+    # Hapus snapshot, jurnal, segmen dan file kuncinya (misalnya setelah partisinya
+    # diarsipkan; penulisan ke partisi yang diarsipkan sudah ditolak sebelum sampai ke sini)
+    def hapus(self):
+        with self._lock:
+            with self._kunci:
+                self.tutup()
+                for path in [self.path_snapshot, self.path_jurnal] + [path for _, path in self.daftar_segmen()]:
+                    if os.path.exists(path):
+                        os.remove(path)
+                self._jumlah_baris = None
+            os.remove(self._kunci.path)
+
+    def tutup(self):
+        with self._lock:
+            if self._file is not None:
+                self.sinkron()
+                self._file.close()
+                self._file = None
+
+
+# Penyimpanan ledger alternatif di SQLite (stdlib) dengan indeks pada tanggal, tipe dan
+# kategori (nama produk untuk pemasukan), sehingga laporan per tanggal cukup membaca
+# baris yang cocok lewat indeks. Antarmukanya sama dengan JurnalKeuangan.
+class LedgerSQLite:
+    def __init__(self, path_db, kolom=KOLOM_KEUANGAN, timeout=30):
+        self.path_db = path_db
+        self.kolom = list(kolom)
+        self.timeout = timeout
+        with closing(self._koneksi()) as db:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.executescript(
+                "CREATE TABLE IF NOT EXISTS transaksi ("
+                " id INTEGER PRIMARY KEY,"
+                " tanggal TEXT NOT NULL,"
+                " kategori TEXT,"
+                " tipe TEXT NOT NULL,"
+                " jumlah NUMERIC NOT NULL,"
+                " keterangan TEXT);"
+                "CREATE INDEX IF NOT EXISTS transaksi_tanggal ON transaksi (tanggal);"
+                "CREATE INDEX IF NOT EXISTS transaksi_tipe_tanggal ON transaksi (tipe, tanggal);"
+                "CREATE INDEX IF NOT EXISTS transaksi_kategori_tanggal ON transaksi (kategori, tanggal);"
+            )
+
+    def _koneksi(self):
+        return sqlite3.connect(self.path_db, timeout=self.timeout, isolation_level=None)
+
+    def _ke_frame(self, baris):
+        data = pd.DataFrame(baris, columns=self.kolom)
+        return rapikan_ledger(data) if not data.empty else ledger_kosong(self.kolom)
+
+    def muat(self):
+        return self.query()
+
+    # Terjemahkan filter menjadi klausa WHERE yang memakai indeks. Batas tanggal inklusif.
+    def _where(self, tanggal_awal=None, tanggal_akhir=None, tipe=None, kategori=None):
+        syarat, parameter = [], []
+        if tanggal_awal is not None:
+            syarat.append("tanggal >= ?")
+            parameter.append(_ke_teks_tanggal(tanggal_awal))
+        if tanggal_akhir is not None:
+            syarat.append("tanggal <= ?")
+            parameter.append(_ke_teks_tanggal(tanggal_akhir))
+        if tipe is not None:
+            syarat.append("tipe = ?")
+            parameter.append(tipe)
+        if kategori is not None:
+            syarat.append("kategori = ?")
+            parameter.append(kategori)
+        return (" WHERE " + " AND ".join(syarat) if syarat else ""), parameter
+
+    @diukur("sqlite.query")
+    def query(self, **filter):
+        where, parameter = self._where(**filter)
+        sql = "SELECT tanggal, kategori, tipe, jumlah, keterangan FROM transaksi" + where + " ORDER BY id"
+        with closing(self._koneksi()) as db:
+            return self._ke_frame(db.execute(sql, parameter).fetchall())
+
+    # Hasil query per chunk tanpa memuat seluruh hasil ke memori
+    def iter_query(self, ukuran_chunk, **filter):
+        where, parameter = self._where(**filter)
+        sql = "SELECT tanggal, kategori, tipe, jumlah, keterangan FROM transaksi" + where + " ORDER BY id"
+        with closing(self._koneksi()) as db:
+            kursor = db.execute(sql, parameter)
+            while True:
+                baris = kursor.fetchmany(ukuran_chunk)
+                if not baris:
+                    break
+                yield self._ke_frame(baris)
+
+    @diukur("sqlite.hitung")
+    def hitung(self, **filter):
+        where, parameter = self._where(**filter)
+        with closing(self._koneksi()) as db:
+            return db.execute("SELECT COUNT(*) FROM transaksi" + where, parameter).fetchone()[0]
+
+    # Satu halaman hasil query; urut=None berarti urutan pencatatan
+    @diukur("sqlite.halaman")
+    def halaman(self, offset, limit, urut=None, menurun=True, **filter):
+        where, parameter = self._where(**filter)
+        kolom = "id" if urut is None else KOLOM_SQL[urut]
+        arah = "DESC" if menurun else "ASC"
+        sql = (
+            "SELECT tanggal, kategori, tipe, jumlah, keterangan FROM transaksi" + where
+            + f" ORDER BY {kolom} {arah}, id {arah} LIMIT ? OFFSET ?"
+        )
+        with closing(self._koneksi()) as db:
+            return self._ke_frame(db.execute(sql, parameter + [int(limit), int(offset)]).fetchall())
+
+    @diukur("sqlite.tambah")
+    def tambah(self, records):
+        baris = [
+            (_ke_teks_tanggal(r["Tanggal"]), r.get("Kategori"), r["Tipe"], _ke_sql(r["Jumlah"]), r.get("Keterangan"))
+            for r in records
+        ]
+        with closing(self._koneksi()) as db:
+            db.execute("BEGIN IMMEDIATE")
+            db.executemany(
+                "INSERT INTO transaksi (tanggal, kategori, tipe, jumlah, keterangan) VALUES (?, ?, ?, ?, ?)",
+                baris,
+            )
+            db.execute("COMMIT")
+
+    @diukur("sqlite.tambah_data")
+    def tambah_data(self, data):
+        tanggal = [t.isoformat() for t in pd.to_datetime(data["Tanggal"])]
+        keterangan = data["Keterangan"] if "Keterangan" in data.columns else [None] * len(data)
+        baris = zip(tanggal, data["Kategori"].tolist(), data["Tipe"].tolist(), data["Jumlah"].tolist(), list(keterangan))
+        with closing(self._koneksi()) as db:
+            db.execute("BEGIN IMMEDIATE")
+            db.executemany(
+                "INSERT INTO transaksi (tanggal, kategori, tipe, jumlah, keterangan) VALUES (?, ?, ?, ?, ?)",
+                baris,
+            )
+            db.execute("COMMIT")
+
+    # SQLite sudah durable per transaksi; tidak ada jurnal terpisah untuk digabung
+    def sinkron(self):
+        pass
+
+    def kompaksi(self):
+        pass
+
+    def tutup(self):
+        pass
+
+
+# Kunci partisi bulan ("2024-03") untuk satu tanggal
+def kunci_bulan(tanggal):
+    return pd.Timestamp(tanggal).strftime("%Y-%m")
+
+
+# Kunci partisi bulan untuk setiap baris (Series tanggal); dihitung dari tahun dan bulan
+# sebagai angka, lebih cepat daripada strftime per baris
+def _kunci_bulan_series(tanggal):
+    tanggal = pd.to_datetime(tanggal)
+    angka = tanggal.dt.year * 100 + tanggal.dt.month
+    return angka.map({a: f"{a // 100:04d}-{a % 100:02d}" for a in angka.unique()})
+
+
+# Ringkasan tersegel per partisi (bulan "2024-03" atau arsip tahunan "2023"): sel harian
+# kubus (lihat kubus.sel_harian) yang dihitung saat tutup buku, satu file per partisi.
+# Saat partisi yang sudah ditutup menerima baris baru, sel baris barunya digabung ke
+# dalamnya, sehingga ringkasan yang ada selalu sesuai dengan isi partisinya.
+class RingkasanTersegel:
+    def __init__(self, folder, format=None):
+        self.folder = folder
+        self.format = format or format_default()
+        os.makedirs(folder, exist_ok=True)
+
+    def _path(self, kunci):
+        return os.path.join(self.folder, f"{kunci}.{self.format}")
+
+    def daftar(self):
+        pola = re.compile(rf"(\d{{4}}(?:-\d{{2}})?)\.{self.format}")
+        return sorted(m.group(1) for m in map(pola.fullmatch, os.listdir(self.folder)) if m)
+
+    def ada(self, kunci):
+        return os.path.exists(self._path(kunci))
+
+    # Sel tersegel satu partisi, atau None jika partisi belum ditutup
+    def baca(self, kunci):
+        try:
+            return baca_tabel(self._path(kunci), kolom_tanggal=["Periode"])
+        except FileNotFoundError:
+            return None
+
+    def tulis(self, kunci, sel):
+        tulis_tabel(sel.reset_index(drop=True), self._path(kunci))
+
+    # Gabungkan sel baris baru ke ringkasan yang sudah tersegel; semua ukuran sel berupa
+    # jumlah sehingga sel cukup disambung tanpa diagregasi ulang
+    def tambah(self, kunci, sel):
+        lama = self.baca(kunci)
+        if lama is not None and not sel.empty:
+            self.tulis(kunci, pd.concat([lama, sel], ignore_index=True) if not lama.empty else sel)
+
+    # Buka segel: partisi berubah sehingga ringkasannya harus dihitung ulang
+    def buka(self, kunci):
+        try:
+            os.remove(self._path(kunci))
+        except FileNotFoundError:
+            pass
+
+
+# Ringkasan tersegel riwayat penjualan, disimpan di database riwayatnya sendiri (tabel
+# segel dan ringkasan_sel) sehingga penjualan baru dan penggabungan selnya ke segel bulan
+# yang sudah ditutup berada dalam satu transaksi. daftar/ada/baca/tulis sama dengan
+# RingkasanTersegel.
+class RingkasanSQLite:
+    def __init__(self, path_db, timeout=30):
+        self.path_db = path_db
+        self.timeout = timeout
+        with closing(self._koneksi()) as db:
+            db.executescript(
+                "CREATE TABLE IF NOT EXISTS segel (partisi TEXT PRIMARY KEY);"
+                "CREATE TABLE IF NOT EXISTS ringkasan_sel ("
+                " partisi TEXT NOT NULL,"
+                " periode TEXT NOT NULL,"
+                " tipe TEXT, kategori TEXT, produk, pelanggan TEXT,"
+                " jumlah NUMERIC NOT NULL, unit INTEGER NOT NULL, transaksi INTEGER NOT NULL);"
+                "CREATE INDEX IF NOT EXISTS ringkasan_sel_partisi ON ringkasan_sel (partisi);"
+            )
+
+    def _koneksi(self):
+        return sqlite3.connect(self.path_db, timeout=self.timeout, isolation_level=None)
+
+    def daftar(self, db=None):
+        with closing(self._koneksi()) if db is None else nullcontext(db) as db:
+            return [p for (p,) in db.execute("SELECT partisi FROM segel ORDER BY 1")]
+
+    def ada(self, kunci):
+        return kunci in self.daftar()
+
+    def baca(self, kunci):
+        with closing(self._koneksi()) as db:
+            if db.execute("SELECT 1 FROM segel WHERE partisi = ?", (kunci,)).fetchone() is None:
+                return None
+            baris = db.execute(
+                "SELECT periode, tipe, kategori, produk, pelanggan, jumlah, unit, transaksi"
+                " FROM ringkasan_sel WHERE partisi = ?", (kunci,)
+            ).fetchall()
+        sel = pd.DataFrame(baris, columns=["Periode", "Tipe", "Kategori", "Produk", "Pelanggan", "Jumlah", "Unit", "Transaksi"])
+        sel["Periode"] = pd.to_datetime(sel["Periode"], format="ISO8601").astype("datetime64[us]")
+        return sel.astype({"Jumlah": "int64", "Unit": "int64", "Transaksi": "int64"})
+
+    # Sisipkan sel ke ringkasan partisi `kunci` di dalam transaksi `db` yang sedang berjalan
+    # (ringkasan_sel hanya dijumlahkan, jadi sel baris baru cukup disisipkan)
+    def sisipkan(self, db, kunci, sel):
+        db.executemany(
+            "INSERT INTO ringkasan_sel (partisi, periode, tipe, kategori, produk, pelanggan, jumlah, unit, transaksi)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                (kunci, _ke_teks_tanggal(b.Periode), b.Tipe, b.Kategori, _ke_sql(b.Produk), b.Pelanggan,
+                 _ke_sql(b.Jumlah), int(b.Unit), int(b.Transaksi))
+                for b in sel.astype({"Tipe": object, "Kategori": object, "Pelanggan": object}).itertuples(index=False)
+            ),
+        )
+
+    def tulis(self, kunci, sel):
+        with closing(self._koneksi()) as db:
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                db.execute("DELETE FROM ringkasan_sel WHERE partisi = ?", (kunci,))
+                self.sisipkan(db, kunci, sel)
+                db.execute("INSERT OR IGNORE INTO segel (partisi) VALUES (?)", (kunci,))
+                db.execute("COMMIT")
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+
+
+# Baca satu partisi ledger (bulan: snapshot + jurnal, atau arsip tahunan). Dipakai juga
+# oleh proses pekerja tutup buku sehingga jurnal dibaca tanpa diubah.
+def baca_partisi_ledger(path, kolom, arsip):
+    if arsip:
+        return rapikan_ledger(baca_tabel(path, kolom_tanggal=["Tanggal"]))
+    return JurnalKeuangan(path, kolom, hanya_baca=True).muat()
+
+
+def _saring_ledger(data, tanggal_awal=None, tanggal_akhir=None, tipe=None, kategori=None):
+    cocok = pd.Series(True, index=data.index)
+    if tanggal_awal is not None:
+        cocok &= data["Tanggal"] >= pd.Timestamp(tanggal_awal)
+    if tanggal_akhir is not None:
+        cocok &= data["Tanggal"] <= pd.Timestamp(tanggal_akhir)
+    if tipe is not None:
+        cocok &= data["Tipe"] == tipe
+    if kategori is not None:
+        cocok &= data["Kategori"] == kategori
+    return data if cocok.all() else data[cocok]
+
+
+# Ledger yang dipartisi per bulan di `folder`: setiap bulan adalah JurnalKeuangan sendiri
+# ("2024-03.arrow" + jurnalnya) dengan ringkasan tersegel di "ringkasan/" setelah tutup
+# buku, dan tahun lama bisa dipadatkan menjadi arsip hanya-baca ("arsip/2022.arrow").
+# Query dengan rentang tanggal hanya membaca partisi yang beririsan dengan rentang itu,
+# dan penulisan hanya menyentuh jurnal bulannya. Hitungan dan halaman riwayat memakai
+# ringkasan tersegel bulan yang sudah ditutup dan hanya membaca partisi yang diperlukan.
+# Penulisan, arsip dan tutup buku (mungkin dari proses lain) bergantian lewat KunciProses
+# ("ledger.kunci"), sehingga segel tidak pernah ditulis tanpa baris yang masuk selagi
+# bulannya dibaca. Antarmukanya sama dengan JurnalKeuangan.
+class LedgerBulanan:
+    def __init__(self, folder, kolom=KOLOM_KEUANGAN, format=None, penulis=None):
+        self.folder = folder
+        self.kolom = list(kolom)
+        self.format = format or format_default()
+        self.penulis = penulis
+        self.folder_arsip = os.path.join(folder, "arsip")
+        os.makedirs(self.folder_arsip, exist_ok=True)
+        self.ringkasan_tersegel = RingkasanTersegel(os.path.join(folder, "ringkasan"), self.format)
+        self._partisi = {}  # bulan -> JurnalKeuangan yang sudah dibuka
+        self._lock = threading.RLock()
+        self.kunci = KunciProses(os.path.join(folder, "ledger.kunci"))
+
+    def _path(self, bulan):
+        return os.path.join(self.folder, f"{bulan}.{self.format}")
+
+    def _path_arsip(self, tahun):
+        return os.path.join(self.folder_arsip, f"{tahun}.{self.format}")
+
+    def daftar_arsip(self):
+        pola = re.compile(rf"(\d{{4}})\.{self.format}")
+        return sorted(m.group(1) for m in map(pola.fullmatch, os.listdir(self.folder_arsip)) if m)
+
+    # Bulan yang masih bisa ditulis (belum diarsipkan), terurut
+    def daftar_bulan(self):
+        pola = re.compile(rf"(\d{{4}}-\d{{2}})\.{self.format}(?:\.jurnal|\.segmen\.\d{{12}}\.{self.format})?")
+        bulan = {m.group(1) for m in map(pola.fullmatch, os.listdir(self.folder)) if m}
+        # Arsip yang sudah ditulis menggantikan bulan-bulannya, meski file bulan belum terhapus
+        arsip = set(self.daftar_arsip())
+        return sorted(b for b in bulan if b[:4] not in arsip)
+
+    # Semua partisi (arsip tahunan dan bulan) dalam urutan waktu
+    def daftar_partisi(self):
+        return sorted(self.daftar_arsip() + self.daftar_bulan())
+
+    # Fungsi dan argumen (bisa di-pickle) untuk membaca satu partisi di proses lain
+    def tugas_partisi(self, kunci):
+        arsip = len(kunci) == 4
+        return baca_partisi_ledger, (self._path_arsip(kunci) if arsip else self._path(kunci), self.kolom, arsip), None
+
+    def _jurnal(self, bulan):
+        with self._lock:
+            if bulan not in self._partisi:
+                self._partisi[bulan] = JurnalKeuangan(self._path(bulan), self.kolom, penulis=self.penulis)
+            return self._partisi[bulan]
+
+    def _baca(self, kunci):
+        if len(kunci) == 4:
+            return baca_partisi_ledger(self._path_arsip(kunci), self.kolom, True)
+        return self._jurnal(kunci).muat()
+
+    # Partisi yang beririsan dengan rentang tanggal (pemangkasan partisi)
+    def _partisi_dalam(self, tanggal_awal=None, tanggal_akhir=None):
+        awal = kunci_bulan(tanggal_awal) if tanggal_awal is not None else None
+        akhir = kunci_bulan(tanggal_akhir) if tanggal_akhir is not None else None
+        return [
+            kunci for kunci in self.daftar_partisi()
+            if (awal is None or kunci >= awal[:len(kunci)]) and (akhir is None or kunci <= akhir[:len(kunci)])
+        ]
+
+    def muat(self):
+        return self.query()
+
+    # Baris partisi yang belum ditutup (biasanya bulan berjalan). Bulan yang sudah ditutup
+    # diwakili ringkasan tersegelnya (lihat partisi.ringkasan_terbuka).
+    @diukur("bulanan.muat_terbuka")
+    def muat_terbuka(self):
+        tersegel = set(self.ringkasan_tersegel.daftar())
+        bagian = [self._baca(kunci) for kunci in self.daftar_partisi() if kunci not in tersegel]
+        return self._sambung([data for data in bagian if not data.empty])
+
+    # Baris `data` yang partisinya belum ditutup
+    def saring_terbuka(self, data):
+        if data.empty:
+            return data
+        tersegel = list(self.ringkasan_tersegel.daftar())
+        bulan = _kunci_bulan_series(data["Tanggal"])
+        terbuka = ~(bulan.isin(tersegel) | bulan.str[:4].isin(tersegel))
+        return data if terbuka.all() else data[terbuka.to_numpy()]
+
+    def _sambung(self, bagian):
+        if not bagian:
+            return ledger_kosong(self.kolom)
+        return rapikan_ledger(pd.concat(bagian, ignore_index=True)) if len(bagian) > 1 else bagian[0].reset_index(drop=True)
+
+    @diukur("bulanan.query")
+    def query(self, tanggal_awal=None, tanggal_akhir=None, **filter):
+        bagian = [
+            _saring_ledger(self._baca(kunci), tanggal_awal, tanggal_akhir, **filter)
+            for kunci in self._partisi_dalam(tanggal_awal, tanggal_akhir)
+        ]
+        return self._sambung([data for data in bagian if not data.empty])
+
+    # Hasil query per chunk, partisi demi partisi
+    def iter_query(self, ukuran_chunk, tanggal_awal=None, tanggal_akhir=None, **filter):
+        for kunci in self._partisi_dalam(tanggal_awal, tanggal_akhir):
+            data = _saring_ledger(self._baca(kunci), tanggal_awal, tanggal_akhir, **filter)
+            for awal in range(0, len(data), ukuran_chunk):
+                yield data.iloc[awal:awal + ukuran_chunk].reset_index(drop=True)
+
+    # Partisi seluruhnya berada di dalam rentang tanggal
+    def _tercakup(self, kunci, tanggal_awal=None, tanggal_akhir=None):
+        awal = pd.Timestamp(f"{kunci}-01" if len(kunci) == 7 else f"{kunci}-01-01")
+        berikut = awal + (pd.DateOffset(months=1) if len(kunci) == 7 else pd.DateOffset(years=1))
+        return (
+            (tanggal_awal is None or pd.Timestamp(tanggal_awal) <= awal)
+            and (tanggal_akhir is None or pd.Timestamp(tanggal_akhir) >= berikut)
+        )
+
+    # Banyak baris satu partisi yang cocok dengan filter. Partisi tersegel yang seluruhnya
+    # masuk rentang dihitung dari kolom Transaksi sel ringkasannya tanpa membaca barisnya.
+    def _hitung_partisi(self, kunci, tanggal_awal=None, tanggal_akhir=None, tipe=None, kategori=None):
+        sel = self.ringkasan_tersegel.baca(kunci) if self._tercakup(kunci, tanggal_awal, tanggal_akhir) else None
+        if sel is None:
+            return len(_saring_ledger(self._baca(kunci), tanggal_awal, tanggal_akhir, tipe, kategori))
+        cocok = pd.Series(True, index=sel.index)
+        if tipe is not None:
+            cocok &= sel["Tipe"] == tipe
+        if kategori is not None:
+            cocok &= sel["Kategori"] == kategori
+        return int(sel.loc[cocok, "Transaksi"].sum())
+
+    @diukur("bulanan.hitung")
+    def hitung(self, tanggal_awal=None, tanggal_akhir=None, **filter):
+        return sum(
+            self._hitung_partisi(kunci, tanggal_awal, tanggal_akhir, **filter)
+            for kunci in self._partisi_dalam(tanggal_awal, tanggal_akhir)
+        )
+
+    # Satu halaman hasil query; urut=None berarti urutan pencatatan (partisi demi partisi).
+    # Tanpa urutan kolom, partisi dilewati dengan hitungannya dan hanya partisi yang
+    # beririsan dengan halaman yang dibaca; dengan urutan kolom seluruh hasil query diurutkan.
+    @diukur("bulanan.halaman")
+    def halaman(self, offset, limit, urut=None, menurun=True, tanggal_awal=None, tanggal_akhir=None, **filter):
+        if urut is not None:
+            data = self.query(tanggal_awal, tanggal_akhir, **filter)
+            if pd.api.types.is_numeric_dtype(data[urut]) or pd.api.types.is_datetime64_any_dtype(data[urut]):
+                ambil = data.nlargest if menurun else data.nsmallest
+                return ambil(offset + limit, urut).iloc[offset:].reset_index(drop=True)
+            return data.sort_values(urut, ascending=not menurun, kind="stable").iloc[offset:offset + limit].reset_index(drop=True)
+
+        partisi = self._partisi_dalam(tanggal_awal, tanggal_akhir)
+        bagian = []
+        for kunci in reversed(partisi) if menurun else partisi:
+            if limit <= 0:
+                break
+            jumlah = self._hitung_partisi(kunci, tanggal_awal, tanggal_akhir, **filter)
+            if offset >= jumlah:
+                offset -= jumlah
+                continue
+            data = _saring_ledger(self._baca(kunci), tanggal_awal, tanggal_akhir, **filter)
+            if menurun:
+                akhir = len(data) - offset
+                potongan = data.iloc[max(akhir - limit, 0):max(akhir, 0)].iloc[::-1]
+            else:
+                potongan = data.iloc[offset:offset + limit]
+            bagian.append(potongan)
+            limit -= len(potongan)
+            offset = 0
+        return self._sambung(bagian)
+
+    def _cek_arsip(self, bulan):
+        arsip = set(self.daftar_arsip())
+        ditolak = sorted({b for b in bulan if b[:4] in arsip})
+        if ditolak:
+            raise ValueError(f"Periode {', '.join(ditolak)} sudah diarsipkan dan hanya bisa dibaca")
+
+    @diukur("bulanan.tambah")
+    def tambah(self, records):
+        per_bulan = {}
+        for record in records:
+            per_bulan.setdefault(kunci_bulan(record["Tanggal"]), []).append(record)
+        with self._lock, self.kunci:
+            self._cek_arsip(per_bulan)
+            for bulan, isi in per_bulan.items():
+                self._jurnal(bulan).tambah(isi)
+                if self.ringkasan_tersegel.ada(bulan):
+                    self.ringkasan_tersegel.tambah(bulan, sel_harian(pd.DataFrame.from_records(isi)))
+
+    @diukur("bulanan.tambah_data")
+    def tambah_data(self, data):
+        bulan = _kunci_bulan_series(data["Tanggal"])
+        with self._lock, self.kunci:
+            self._cek_arsip(bulan.unique())
+            for kunci, bagian in data.groupby(bulan.to_numpy(), sort=True):
+                self._jurnal(kunci).tambah_data(bagian)
+                # Bulan yang sudah ditutup tetap tersegel: sel baris barunya digabung ke segelnya
+                if self.ringkasan_tersegel.ada(kunci):
+                    self.ringkasan_tersegel.tambah(kunci, sel_harian(bagian))
+
+    # Padatkan semua bulan tahun `tahun` menjadi satu arsip hanya-baca beserta ringkasan
+    # tersegelnya, lalu hapus file bulanannya. Semua bulannya harus sudah ditutup.
+    # Ringkasan ditulis sebelum arsip: arsip yang ada selalu punya ringkasan, dan selama
+    # file bulan belum terhapus, bulan itu diabaikan karena arsipnya sudah ada.
+    # Mengembalikan banyak baris yang diarsipkan.
+    @diukur("bulanan.arsipkan")
+    def arsipkan(self, tahun):
+        tahun = str(tahun)
+        with self._lock, self.kunci:
+            bulan = [b for b in self.daftar_bulan() if b[:4] == tahun]
+            if not bulan:
+                return 0
+            tersegel = set(self.ringkasan_tersegel.daftar())
+            belum = [b for b in bulan if b not in tersegel]
+            if belum:
+                raise ValueError(f"Bulan {', '.join(belum)} belum ditutup")
+            # Sinkron/kompaksi yang masih tertunda di penulis latar selesai lebih dulu
+            if self.penulis is not None:
+                self.penulis.tunggu()
+
+            data = pd.concat([self._jurnal(b).muat() for b in bulan], ignore_index=True)
+            self.ringkasan_tersegel.tulis(tahun, pd.concat([self.ringkasan_tersegel.baca(b) for b in bulan], ignore_index=True))
+            path = self._path_arsip(tahun)
+            tulis_tabel(rapikan_ledger(data), path)
+            os.chmod(path, 0o444)
+
+            for b in bulan:
+                jurnal = self._partisi.pop(b, None) or JurnalKeuangan(self._path(b), self.kolom)
+                jurnal.hapus()
+                self.ringkasan_tersegel.buka(b)
+            return len(data)
+
+    def sinkron(self):
+        with self._lock:
+            for jurnal in self._partisi.values():
+                jurnal.sinkron()
+
+    # Gabungkan jurnal dan segmen bulan-bulan `bulan` (default: semua yang sudah dibuka) ke snapshotnya
+    def kompaksi(self, bulan=None):
+        with self._lock:
+            for b in list(self._partisi if bulan is None else bulan):
+                jurnal = self._jurnal(b)
+                if jurnal.belum_dipadatkan():
+                    jurnal.kompaksi()
+
+    def tutup(self):
+        with self._lock:
+            for jurnal in self._partisi.values():
+                jurnal.tutup()
+
+
+# Nama kolom penjualan -> kolom tabel SQLite
+KOLOM_SQL_PENJUALAN = {
+    "Date": "tanggal", "IdProduk": "id_produk", "NamaProduk": "nama_produk",
+    "Quantity": "jumlah", "TotalPrice": "total", "CustomerId": "customer_id",
+}
+
+
+# Riwayat penjualan clothing di SQLite, dipakai bersama oleh semua sesi. Indeks pada
+# pelanggan dan tanggal membuat riwayat per pelanggan dan filter tanggal cukup membaca
+# baris yang cocok. Kolom id_produk sengaja tanpa tipe
+# agar kode produk tersimpan apa adanya (angka tetap angka, teks tetap teks).
+# Riwayat dipartisi per bulan lewat indeks tanggal: setiap bulan yang sudah ditutup punya
+# ringkasan tersegel (RingkasanSQLite) di database yang sama, sehingga ringkasan sesi baru
+# cukup membaca baris bulan yang belum ditutup. Penulisan dan tutup buku bergantian lewat
+# KunciProses ("<nama db>.kunci") agar tutup buku tidak menyegel bulan tanpa baris yang
+# ditambahkan selagi bulannya dibaca.
+class PenjualanSQLite:
+    def __init__(self, path_db, timeout=30):
+        self.path_db = path_db
+        self.kolom = list(KOLOM_PENJUALAN)
+        self.timeout = timeout
+        self.kunci = KunciProses(path_db + ".kunci")
+        with closing(self._koneksi()) as db:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.executescript(
+                "CREATE TABLE IF NOT EXISTS penjualan ("
+                " id INTEGER PRIMARY KEY,"
+                " tanggal TEXT NOT NULL,"
+                " id_produk NOT NULL,"
+                " nama_produk TEXT,"
+                " jumlah INTEGER NOT NULL,"
+                " total NUMERIC NOT NULL,"
+                " customer_id TEXT);"
+                "CREATE INDEX IF NOT EXISTS penjualan_tanggal ON penjualan (tanggal);"
+                "CREATE INDEX IF NOT EXISTS penjualan_customer ON penjualan (customer_id, tanggal);"
+            )
+        self.ringkasan_tersegel = RingkasanSQLite(path_db, timeout)
+
+    def _koneksi(self):
+        return sqlite3.connect(self.path_db, timeout=self.timeout, isolation_level=None)
+
+    def _ke_frame(self, baris):
+        data = pd.DataFrame(baris, columns=self.kolom)
+        data["Date"] = pd.to_datetime(data["Date"], format="ISO8601")
+        return terapkan_skema(data, SKEMA_PENJUALAN)
+
+    def muat(self):
+        return self.query()
+
+    # Batas tanggal per hari: tanggal_akhir mencakup seluruh hari itu
+    def _where(self, tanggal_awal=None, tanggal_akhir=None, id_produk=None, customer_id=None):
+        syarat, parameter = [], []
+        if tanggal_awal is not None:
+            syarat.append("tanggal >= ?")
+            parameter.append(_ke_teks_tanggal(pd.Timestamp(tanggal_awal).normalize()))
+        if tanggal_akhir is not None:
+            syarat.append("tanggal < ?")
+            parameter.append(_ke_teks_tanggal(pd.Timestamp(tanggal_akhir).normalize() + pd.Timedelta(days=1)))
+        if id_produk is not None:
+            syarat.append("id_produk = ?")
+            parameter.append(_ke_sql(id_produk))
+        if customer_id is not None:
+            syarat.append("customer_id = ?")
+            parameter.append(customer_id)
+        return (" WHERE " + " AND ".join(syarat) if syarat else ""), parameter
+
+    def _select(self, where):
+        return "SELECT tanggal, id_produk, nama_produk, jumlah, total, customer_id FROM penjualan" + where
+
+    @diukur("penjualan_sqlite.query")
+    def query(self, **filter):
+        where, parameter = self._where(**filter)
+        with closing(self._koneksi()) as db:
+            return self._ke_frame(db.execute(self._select(where) + " ORDER BY id", parameter).fetchall())
+
+    def iter_query(self, ukuran_chunk, **filter):
+        where, parameter = self._where(**filter)
+        with closing(self._koneksi()) as db:
+            kursor = db.execute(self._select(where) + " ORDER BY id", parameter)
+            while True:
+                baris = kursor.fetchmany(ukuran_chunk)
+                if not baris:
+                    break
+                yield self._ke_frame(baris)
+
+    @diukur("penjualan_sqlite.hitung")
+    def hitung(self, **filter):
+        where, parameter = self._where(**filter)
+        with closing(self._koneksi()) as db:
+            return db.execute("SELECT COUNT(*) FROM penjualan" + where, parameter).fetchone()[0]
+
+    def kosong(self):
+        with closing(self._koneksi()) as db:
+            return db.execute("SELECT 1 FROM penjualan LIMIT 1").fetchone() is None
+
+    # Satu halaman riwayat; urut=None berarti urutan pencatatan
+    @diukur("penjualan_sqlite.halaman")
+    def halaman(self, offset, limit, urut=None, menurun=True, **filter):
+        where, parameter = self._where(**filter)
+        kolom = "id" if urut is None else KOLOM_SQL_PENJUALAN[urut]
+        arah = "DESC" if menurun else "ASC"
+        sql = self._select(where) + f" ORDER BY {kolom} {arah}, id {arah} LIMIT ? OFFSET ?"
+        with closing(self._koneksi()) as db:
+            return self._ke_frame(db.execute(sql, parameter + [int(limit), int(offset)]).fetchall())
+
+    # Versi riwayat: id penjualan terakhir (baris hanya ditambahkan, tidak pernah diubah)
+    def versi(self):
+        with closing(self._koneksi()) as db:
+            return db.execute("SELECT COALESCE(MAX(id), 0) FROM penjualan").fetchone()[0]
+
+    # Penjualan yang dicatat setelah `versi`, beserta versi terbaru
+    @diukur("penjualan_sqlite.sejak")
+    def sejak(self, versi):
+        with closing(self._koneksi()) as db:
+            baris = db.execute(
+                "SELECT id, tanggal, id_produk, nama_produk, jumlah, total, customer_id FROM penjualan"
+                " WHERE id > ? ORDER BY id", (versi,)
+            ).fetchall()
+        return self._ke_frame([b[1:] for b in baris]), (baris[-1][0] if baris else versi)
+
+    # Bulan yang punya penjualan, terurut (dibaca dari indeks tanggal saja)
+    @diukur("penjualan_sqlite.daftar_bulan")
+    def daftar_bulan(self):
+        with closing(self._koneksi()) as db:
+            return [b for (b,) in db.execute("SELECT DISTINCT substr(tanggal, 1, 7) FROM penjualan ORDER BY 1")]
+
+    def daftar_partisi(self):
+        return self.daftar_bulan()
+
+    # Fungsi dan argumen (bisa di-pickle) untuk membaca satu bulan di proses lain,
+    # beserta pengubah baris penjualan menjadi baris ledger untuk ringkasan
+    def tugas_partisi(self, bulan):
+        return baca_bulan_penjualan, (self.path_db, bulan), baris_penjualan
+
+    # SQLite sudah durable per transaksi; tidak ada jurnal terpisah untuk digabung
+    def sinkron(self):
+        pass
+
+    def kompaksi(self, bulan=None):
+        pass
+
+    # Sisipkan baris penjualan. Sel baris yang masuk ke bulan yang sudah ditutup digabung
+    # ke segel bulannya di transaksi yang sama, sehingga segel selalu sesuai isi bulannya.
+    def _tulis(self, baris):
+        baris = list(baris)
+        with self.kunci, closing(self._koneksi()) as db:
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                db.executemany(
+                    "INSERT INTO penjualan (tanggal, id_produk, nama_produk, jumlah, total, customer_id)"
+                    " VALUES (?, ?, ?, ?, ?, ?)",
+                    baris,
+                )
+                tersegel = set(self.ringkasan_tersegel.daftar(db))
+                tertutup = [b for b in baris if b[0][:7] in tersegel]
+                if tertutup:
+                    sel = sel_harian(baris_penjualan(self._ke_frame(tertutup)))
+                    for kunci, bagian in sel.groupby(sel["Periode"].dt.strftime("%Y-%m")):
+                        self.ringkasan_tersegel.sisipkan(db, kunci, bagian)
+                db.execute("COMMIT")
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+
+    @diukur("penjualan_sqlite.tambah")
+    def tambah(self, records):
+        self._tulis(
+            (_ke_teks_tanggal(r["Date"]), _ke_sql(r["IdProduk"]), r.get("NamaProduk"),
+             int(r["Quantity"]), _ke_sql(r["TotalPrice"]), r.get("CustomerId"))
+            for r in records
+        )
+
+    @diukur("penjualan_sqlite.tambah_data")
+    def tambah_data(self, data):
+        tanggal = [t.isoformat() for t in pd.to_datetime(data["Date"])]
+        customer = data["CustomerId"].astype(object).where(data["CustomerId"].notna(), None) if "CustomerId" in data.columns else [None] * len(data)
+        self._tulis(zip(
+            tanggal, data["IdProduk"].tolist(), data["NamaProduk"].tolist(),
+            data["Quantity"].astype("int64").tolist(), data["TotalPrice"].tolist(), list(customer),
+        ))
+
+
+# Penjualan satu bulan; dipakai oleh proses pekerja tutup buku
+def baca_bulan_penjualan(path_db, bulan):
+    awal = pd.Timestamp(f"{bulan}-01")
+    return PenjualanSQLite(path_db).query(tanggal_awal=awal, tanggal_akhir=awal + pd.offsets.MonthEnd(0))
@@ -0,0 +1,126 @@
+import heapq
+import threading
+from bisect import insort
+from collections import Counter
+from datetime import date, timedelta
+from operator import itemgetter
+
+from core._malas import pd
+from core.metrik import diukur
+
+# Jendela waktu dalam hari (termasuk hari ini); None = sejak awal
+JENDELA = (1, 7, 30)
+# Jumlah produk teratas yang disimpan per jendela; K lebih besar dihitung langsung
+K_MAKS = 50
+
+
+def _ke_hari(tanggal):
+    return pd.Timestamp(tanggal).date()
+
+
+# Peringkat produk terlaris (unit terjual) yang diperbarui setiap penjualan dicatat.
+# Unit per produk disimpan per hari untuk jendela terpanjang; total per jendela
+# diperbarui saat penjualan masuk dan dikurangi saat hari lama keluar dari jendela.
+# Daftar K_MAKS teratas per jendela disimpan terurut sehingga menampilkan K produk
+# teratas hanya memotong daftar itu. Daftar hanya dihitung ulang (heap, O(n log K))
+# setelah ada pengurangan, yaitu saat jendela bergeser ke hari baru.
+# Jendela berakhir di hari ini menurut `jam` (default date.today) dan tidak pernah digeser
+# oleh tanggal penjualan. Penjualan bertanggal di depan hanya masuk total sejak awal;
+# unitnya disimpan per hari dan masuk jendela saat harinya tiba.
+class PeringkatProduk:
+    def __init__(self, jendela=JENDELA, k_maks=K_MAKS, jam=date.today):
+        self.jendela = tuple(sorted(jendela))
+        self.k_maks = k_maks
+        self.jam = jam
+        self.hari_ini = None
+        self.per_hari = {}  # tanggal -> Counter(produk -> unit), dalam jendela terpanjang atau di depan
+        self.unit = {j: Counter() for j in (None,) + self.jendela}
+        self._teratas = {}  # jendela -> [(-unit, produk)] terurut, paling banyak k_maks
+        self._lock = threading.Lock()
+
+    def _dalam_jendela(self, hari, jendela, hari_ini=None):
+        hari_ini = hari_ini or self.hari_ini
+        return jendela is None or hari_ini - timedelta(days=jendela) < hari <= hari_ini
+
+    # Majukan "hari ini" ke hari menurut jam (tidak pernah mundur). Hari yang keluar dari
+    # sebuah jendela dikurangkan dari totalnya; hari di depan yang sudah tiba ditambahkan.
+    def _geser(self):
+        hari = self.jam()
+        if self.hari_ini is None:
+            self.hari_ini = hari
+            return
+        if hari <= self.hari_ini:
+            return
+        lama, self.hari_ini = self.hari_ini, hari
+        for tanggal in sorted(self.per_hari):
+            for jendela in self.jendela:
+                dulu, kini = self._dalam_jendela(tanggal, jendela, lama), self._dalam_jendela(tanggal, jendela)
+                if dulu == kini:
+                    continue
+                unit = self.unit[jendela]
+                if kini:
+                    unit.update(self.per_hari[tanggal])
+                else:
+                    unit.subtract(self.per_hari[tanggal])
+                    for produk in self.per_hari[tanggal]:
+                        if unit[produk] <= 0:
+                            del unit[produk]
+                self._teratas.pop(jendela, None)
+            if tanggal <= hari - timedelta(days=self.jendela[-1]):
+                del self.per_hari[tanggal]
+
+    # Perbarui daftar teratas untuk satu produk yang unitnya baru saja naik
+    def _naikkan(self, jendela, produk, unit):
+        teratas = self._teratas.get(jendela)
+        if teratas is None:
+            return
+        for i, (_, p) in enumerate(teratas):
+            if p == produk:
+                del teratas[i]
+                break
+        else:
+            if len(teratas) >= self.k_maks and -unit >= teratas[-1][0]:
+                return
+        insort(teratas, (-unit, produk))
+        del teratas[self.k_maks:]
+
+    def tambah(self, produk, unit, tanggal):
+        hari = _ke_hari(tanggal)
+        with self._lock:
+            self._geser()
+            if hari > self.hari_ini - timedelta(days=self.jendela[-1]):
+                self.per_hari.setdefault(hari, Counter())[produk] += unit
+            for jendela, total in self.unit.items():
+                if self._dalam_jendela(hari, jendela):
+                    total[produk] += unit
+                    self._naikkan(jendela, produk, total[produk])
+
+    # Tambahkan banyak penjualan sekaligus (kolom Date, IdProduk, Quantity)
+    @diukur("peringkat.tambah_penjualan")
+    def tambah_penjualan(self, data):
+        if data.empty:
+            return
+        hari = pd.to_datetime(data["Date"]).dt.date
+        with self._lock:
+            self._geser()
+            self.unit[None].update(data.groupby("IdProduk")["Quantity"].sum().to_dict())
+            baru = hari > self.hari_ini - timedelta(days=self.jendela[-1])
+            per_hari = data.loc[baru].assign(Hari=hari[baru]).groupby(["Hari", "IdProduk"])["Quantity"].sum()
+            for (tanggal, produk), unit in per_hari.items():
+                self.per_hari.setdefault(tanggal, Counter())[produk] += unit
+                for jendela in self.jendela:
+                    if self._dalam_jendela(tanggal, jendela):
+                        self.unit[jendela][produk] += unit
+            self._teratas.clear()
+
+    # K produk teratas dalam jendela sebagai list (produk, unit), terbanyak lebih dulu
+    @diukur("peringkat.teratas")
+    def teratas(self, k=10, jendela=None):
+        with self._lock:
+            self._geser()
+            unit = self.unit[jendela]
+            if k > self.k_maks:
+                return heapq.nlargest(k, unit.items(), key=itemgetter(1))
+            if jendela not in self._teratas:
+                self._teratas[jendela] = sorted((-u, p) for p, u in heapq.nlargest(self.k_maks, unit.items(), key=itemgetter(1)))
+            return [(p, -u) for u, p in self._teratas[jendela][:k]]
@@ -0,0 +1,108 @@
+from datetime import datetime
+
+from core._malas import pd
+from core.metrik import diukur
+from core.grafik import grafik_garis
+
+
+# Fungsi untuk menghitung ringkasan
+@diukur("laporan.hitung_ringkasan")
+def hitung_ringkasan(data):
+    pemasukan = data[data["Tipe"] == "Pemasukan"]["Jumlah"].sum()
+    pengeluaran = data[data["Tipe"] == "Pengeluaran"]["Jumlah"].sum()
+    saldo = pemasukan - pengeluaran
+    return pemasukan, pengeluaran, saldo
+
+
+# Fungsi untuk membuat laporan berdasarkan rentang waktu. Jika `ledger` diberikan dan
+# mendukung query (SQLite, atau ledger bulanan yang hanya membaca partisi dalam rentang),
+# filter tanggal dijalankan di penyimpanan; `data` tidak dipakai karena bisa jadi hanya
+# berisi sebagian ledger (ledger bulanan hanya memuat bulan yang belum ditutup).
+@diukur("laporan.buat_laporan")
+def buat_laporan(data, periode, tanggal_awal=None, tanggal_akhir=None, ledger=None):
+    if hasattr(ledger, "query"):
+        if periode == "Harian":
+            hari_ini = pd.Timestamp(datetime.now().date())
+            return ledger.query(tanggal_awal=hari_ini, tanggal_akhir=hari_ini)
+        elif periode == "Rentang Tanggal" and tanggal_awal and tanggal_akhir:
+            return ledger.query(tanggal_awal=tanggal_awal, tanggal_akhir=tanggal_akhir)
+        return ledger.query()
+
+    if data.empty:
+        return pd.DataFrame()
+
+    # Data bisa berupa snapshot bersama; kolom diubah pada salinan dangkal
+    data = data.assign(Tanggal=pd.to_datetime(data["Tanggal"]))
+    if periode == "Harian":
+        return data[data["Tanggal"] == pd.Timestamp(datetime.now().date())]
+    elif periode == "Rentang Tanggal" and tanggal_awal and tanggal_akhir:
+        return data[(data["Tanggal"] >= pd.to_datetime(tanggal_awal)) & (data["Tanggal"] <= pd.to_datetime(tanggal_akhir))]
+    return data
+
+
+# Laporan agregat per hari/minggu/bulan dari kubus ringkasan berjalan, dirinci menurut
+# dimensi (Tipe, Kategori, Produk, Pelanggan) tanpa membaca baris ledger
+@diukur("laporan.laporan_agregat")
+def laporan_agregat(ringkasan, granularitas="bulan", tanggal_awal=None, tanggal_akhir=None, dimensi=(), **filter):
+    return ringkasan.kubus.query(granularitas, tanggal_awal, tanggal_akhir, dimensi, **filter)
+
+
+# Saring ledger di memori menurut tipe dan/atau kategori (None = semua)
+def filter_transaksi(data, tipe=None, kategori=None):
+    if tipe is not None:
+        data = data[data["Tipe"] == tipe]
+    if kategori is not None:
+        data = data[data["Kategori"] == kategori]
+    return data
+
+
+# Grafik pemasukan dan pengeluaran harian sebagai PNG. Jika `ringkasan` diberikan,
+# deret harian diambil dari ringkasan berjalan, bukan dari baris ledger.
+@diukur("laporan.grafik_keuangan")
+def grafik_keuangan(data, ringkasan=None):
+    if ringkasan is not None:
+        pemasukan = ringkasan.harian("Pemasukan")
+        pengeluaran = ringkasan.harian("Pengeluaran")
+    else:
+        tanggal = pd.to_datetime(data["Tanggal"])
+        pemasukan = data[data["Tipe"] == "Pemasukan"].groupby(tanggal)["Jumlah"].sum()
+        pengeluaran = data[data["Tipe"] == "Pengeluaran"].groupby(tanggal)["Jumlah"].sum()
+
+    # Gambar di-cache berdasarkan isi deret dan deret panjang dikelompokkan per periode
+    return grafik_garis(
+        {"Pemasukan": pemasukan, "Pengeluaran": pengeluaran},
+        "Grafik Pemasukan dan Pengeluaran", "Tanggal", "Jumlah"
+    )
+
+
+# Top products by quantity sold from the maintained leaderboard (window in days, None =
+# all time); only the K catalog rows are looked up through the catalog index
+@diukur("laporan.top_products")
+def top_products(ringkasan, katalog, k=10, window=None):
+    top = ringkasan.peringkat.teratas(k, window)
+    top_products_df = katalog.data.loc[katalog.labels([product_id for product_id, _ in top])].reset_index(drop=True)
+    top_products_df["Total Quantity Sold"] = [units for _, units in top]
+    return top_products_df
+
+
+# Total earnings per product from the running totals
+@diukur("laporan.earnings_by_product")
+def earnings_by_product(ringkasan, product_data):
+    total_sales = pd.Series(ringkasan.per_produk, name="TotalPrice").rename_axis("IdProduk").reset_index()
+    total_sales = total_sales.merge(product_data, on="IdProduk")[["IdProduk", "JenisProduk", "NamaProduk", "WarnaProduk", "TotalPrice"]]
+    return total_sales.rename(columns={"TotalPrice": "Total Earnings"})
+
+
+# Purchase history of one customer through the customer index
+@diukur("laporan.customer_sales")
+def customer_sales(sales, customer_id):
+    return sales.query(customer_id=customer_id)
+
+
+# Sales totals per day/week/month ("hari", "minggu", "bulan") from the report cube
+@diukur("laporan.sales_over_time")
+def sales_over_time(ringkasan, granularity, start_date, end_date, by_product=False):
+    dimensions = ["Produk", "Kategori"] if by_product else []
+    report = laporan_agregat(ringkasan, granularity, start_date, end_date, dimensions, tipe="Pemasukan")
+    report = report.rename(columns={"Periode": "Date", "Produk": "IdProduk", "Kategori": "NamaProduk", "Jumlah": "TotalPrice", "Unit": "Quantity", "Transaksi": "Sales"})
+    return report if by_product else report.set_index("Date")["TotalPrice"]
@@ -0,0 +1,156 @@
+from collections import Counter
+
+from core._malas import pd
+from core.kubus import KubusLaporan
+from core.metrik import diukur
+from core.peringkat import PeringkatProduk
+
+TIPE = ["Pemasukan", "Pengeluaran"]
+# Sampai sebanyak ini, baris ledger dicatat satu per satu (lebih cepat daripada groupby)
+BATAS_PER_BARIS = 20
+
+
+def _ke_tanggal(tanggal):
+    return pd.Timestamp(tanggal).date()
+
+
+# Penjualan clothing (kolom Date, IdProduk, NamaProduk, Quantity, TotalPrice, CustomerId)
+# sebagai baris ledger pemasukan dengan Produk, Unit dan Pelanggan untuk kubus
+def baris_penjualan(data):
+    return pd.DataFrame({
+        "Tanggal": data["Date"].to_numpy(),
+        "Kategori": data["NamaProduk"].to_numpy(),
+        "Tipe": "Pemasukan",
+        "Jumlah": data["TotalPrice"].to_numpy(),
+        "Produk": data["IdProduk"].to_numpy(),
+        "Unit": data["Quantity"].to_numpy(),
+        "Pelanggan": data["CustomerId"].to_numpy() if "CustomerId" in data.columns else None,
+    })
+
+
+# Agregat berjalan untuk ledger: total per tipe serta rollup per hari, per kategori
+# dan per produk. Diperbarui setiap kali transaksi dicatat sehingga ringkasan tidak
+# perlu menghitung ulang seluruh ledger di setiap rerun.
+class RingkasanBerjalan:
+    def __init__(self):
+        self.total = Counter({tipe: 0 for tipe in TIPE})
+        self.jumlah_transaksi = 0
+        self.per_hari = Counter()       # (tanggal, tipe) -> jumlah
+        self.per_kategori = Counter()   # (tipe, kategori) -> jumlah
+        self.per_produk = Counter()     # produk -> jumlah
+        self.unit_produk = Counter()    # produk -> unit terjual
+        self.peringkat = PeringkatProduk()  # produk terlaris per jendela waktu
+        self.kubus = KubusLaporan()         # agregat per hari/minggu/bulan untuk laporan
+        self.versi_penjualan = 0            # id penjualan SQLite terakhir yang sudah dijumlahkan
+
+    @property
+    def saldo(self):
+        return self.total["Pemasukan"] - self.total["Pengeluaran"]
+
+    def totals(self):
+        return self.total["Pemasukan"], self.total["Pengeluaran"], self.saldo
+
+    def tambah(self, tipe, jumlah, tanggal=None, kategori=None, produk=None, unit=0, pelanggan=None):
+        self.total[tipe] += jumlah
+        self.jumlah_transaksi += 1
+        if tanggal is not None:
+            self.per_hari[(_ke_tanggal(tanggal), tipe)] += jumlah
+            self.kubus.tambah(tanggal, tipe, kategori, jumlah, produk, unit, pelanggan)
+        if kategori is not None:
+            self.per_kategori[(tipe, kategori)] += jumlah
+        if produk is not None:
+            self.per_produk[produk] += jumlah
+            self.unit_produk[produk] += unit
+            if tanggal is not None:
+                self.peringkat.tambah(produk, unit, tanggal)
+
+    # Tambahkan banyak baris ledger sekaligus (kolom Tanggal, Kategori, Tipe, Jumlah;
+    # Produk, Unit dan Pelanggan opsional untuk kubus)
+    @diukur("ringkasan.tambah_ledger")
+    def tambah_ledger(self, data):
+        if data.empty:
+            return
+        if len(data) <= BATAS_PER_BARIS and "Produk" not in data.columns and data["Jumlah"].notna().all():
+            for baris in data[["Tanggal", "Kategori", "Tipe", "Jumlah"]].itertuples(index=False):
+                self.tambah(baris.Tipe, baris.Jumlah, tanggal=baris.Tanggal, kategori=baris.Kategori)
+            return
+        self.kubus.tambah_data(data)
+        data = data[["Tanggal", "Kategori", "Tipe", "Jumlah"]].copy()
+        data["Tanggal"] = pd.to_datetime(data["Tanggal"]).dt.date
+        for tipe, jumlah in data.groupby("Tipe", observed=True)["Jumlah"].sum().items():
+            self.total[tipe] += jumlah
+        for kunci, jumlah in data.groupby(["Tanggal", "Tipe"], observed=True)["Jumlah"].sum().items():
+            self.per_hari[kunci] += jumlah
+        for kunci, jumlah in data.groupby(["Tipe", "Kategori"], observed=True)["Jumlah"].sum().items():
+            self.per_kategori[kunci] += jumlah
+        self.jumlah_transaksi += len(data)
+
+    # Tambahkan banyak penjualan sekaligus (kolom Date, IdProduk, NamaProduk, Quantity, TotalPrice),
+    # setara dengan tambah(...) per penjualan dengan produk dan unitnya
+    @diukur("ringkasan.tambah_penjualan")
+    def tambah_penjualan(self, data):
+        if data.empty:
+            return
+        self.tambah_ledger(baris_penjualan(data))
+        per_produk = data.groupby("IdProduk")[["TotalPrice", "Quantity"]].sum()
+        self.per_produk.update(per_produk["TotalPrice"].to_dict())
+        self.unit_produk.update(per_produk["Quantity"].to_dict())
+        self.peringkat.tambah_penjualan(data)
+
+    # Tambahkan sel harian kubus (lihat kubus.sel_harian), misalnya ringkasan tersegel
+    # partisi bulan: hasilnya sama dengan menambahkan baris-baris asal sel itu
+    @diukur("ringkasan.tambah_sel")
+    def tambah_sel(self, sel):
+        if sel.empty:
+            return
+        self.kubus.tambah_sel(sel)
+        for tipe, jumlah in sel.groupby("Tipe", observed=True)["Jumlah"].sum().items():
+            self.total[tipe] += jumlah
+        self.jumlah_transaksi += int(sel["Transaksi"].sum())
+        sel = sel.assign(Tanggal=pd.to_datetime(sel["Periode"]).dt.date)
+        for kunci, jumlah in sel.groupby(["Tanggal", "Tipe"], observed=True)["Jumlah"].sum().items():
+            self.per_hari[kunci] += jumlah
+        for kunci, jumlah in sel.groupby(["Tipe", "Kategori"], observed=True)["Jumlah"].sum().items():
+            self.per_kategori[kunci] += jumlah
+
+        produk = sel[sel["Produk"].notna()]
+        if not produk.empty:
+            per_produk = produk.groupby("Produk")[["Jumlah", "Unit"]].sum()
+            self.per_produk.update(per_produk["Jumlah"].to_dict())
+            self.unit_produk.update(per_produk["Unit"].to_dict())
+            self.peringkat.tambah_penjualan(pd.DataFrame({
+                "Date": produk["Periode"].to_numpy(),
+                "IdProduk": produk["Produk"].to_numpy(),
+                "Quantity": produk["Unit"].to_numpy(),
+            }))
+
+    @classmethod
+    def dari_ledger(cls, data):
+        ringkasan = cls()
+        ringkasan.tambah_ledger(data)
+        return ringkasan
+
+    @classmethod
+    def dari_sel(cls, sel):
+        ringkasan = cls()
+        ringkasan.tambah_sel(sel)
+        return ringkasan
+
+    # Bandingkan total berjalan dengan perhitungan ulang penuh dari ledger
+    @diukur("ringkasan.cocok_dengan")
+    def cocok_dengan(self, data):
+        for tipe in TIPE:
+            if self.total[tipe] != data.loc[data["Tipe"] == tipe, "Jumlah"].sum():
+                return False
+        return self.jumlah_transaksi == len(data)
+
+    # Rollup harian satu tipe sebagai Series (indeks tanggal), opsional dibatasi rentang
+    @diukur("ringkasan.harian")
+    def harian(self, tipe, tanggal_awal=None, tanggal_akhir=None):
+        nilai = {
+            tanggal: jumlah for (tanggal, t), jumlah in self.per_hari.items()
+            if t == tipe
+            and (tanggal_awal is None or tanggal >= tanggal_awal)
+            and (tanggal_akhir is None or tanggal <= tanggal_akhir)
+        }
+        return pd.Series(nilai, dtype="float64").sort_index()
@@ -0,0 +1,125 @@
+from datetime import datetime
+
+from core._malas import pd
+from core.metrik import diukur
+from core.ledger import komit_baris
+from core.inventory import segarkan_stok, simpan_stok
+from core.penyimpanan import PenjualanSQLite
+from core.partisi import ringkasan_partisi
+
+# Sales history of the clothing app, shared by all sessions
+CLOTHING_SALES_DB = "clothing_sales.db"
+
+
+# Fungsi untuk mencatat penjualan beberapa produk sekaligus. Stok seluruh keranjang
+# dikurangi dalam satu transaksi inventaris (gagal semua jika ada yang kurang), lalu
+# baris ledger di-commit sekali ke dataset bersama dan file stok ditulis sekali. Jika
+# baris ledger gagal dicatat, stok yang sudah diambil dikembalikan ke inventaris.
+# Mengembalikan jumlah baris yang dicatat.
+@diukur("penjualan.catat_penjualan")
+def catat_penjualan(ledger, dataset, katalog, inventaris, tanggal, keranjang, keterangan):
+    keranjang = {kode: unit for kode, unit in keranjang.items() if unit > 0 and kode in katalog}
+    if not keranjang:
+        return 0
+
+    inventaris.kurangi(keranjang)
+    try:
+        indeks = katalog.labels(keranjang)
+        unit = pd.Series(list(keranjang.values()), dtype="int64").to_numpy()
+        baris_produk = katalog.data.loc[indeks]
+        total_harga = baris_produk["Harga"].to_numpy() * unit
+
+        data_baru = pd.DataFrame({
+            "Tanggal": pd.to_datetime(tanggal),
+            "Kategori": baris_produk["Produk"].to_numpy(),
+            "Tipe": "Pemasukan",
+            "Jumlah": total_harga,
+            "Keterangan": keterangan,
+        })
+        komit_baris(ledger, dataset, data_baru)
+    except BaseException:
+        inventaris.ubah(keranjang)
+        raise
+
+    segarkan_stok(katalog, inventaris)
+    simpan_stok(katalog.data)
+    return len(data_baru)
+
+
+def open_sales(path_db=CLOTHING_SALES_DB):
+    return PenjualanSQLite(path_db)
+
+
+# Running totals for a new session, started from the sealed summary of every closed
+# month; only the sales of months that are not closed yet are read. The store lock is
+# held so no sale or month-end close lands between the totals and their version.
+@diukur("penjualan.sales_summary")
+def sales_summary(sales):
+    with sales.kunci:
+        version = sales.versi()
+        ringkasan = ringkasan_partisi(sales)
+    ringkasan.versi_penjualan = version
+    return ringkasan
+
+
+# Bring the running totals up to the sales store: sales recorded by any session since
+# the last sync are added, so every open session shows the same totals
+@diukur("penjualan.sync_summary")
+def sync_summary(ringkasan, sales):
+    new_sales, ringkasan.versi_penjualan = sales.sejak(ringkasan.versi_penjualan)
+    if not new_sales.empty:
+        ringkasan.tambah_penjualan(new_sales)
+    return len(new_sales)
+
+
+# Sell a whole cart (product id -> quantity): the stock of every line is taken in one
+# inventory transaction (nothing is sold if any line is short), then all lines are
+# written to the sales store at once and the running totals are synced with it. If the
+# sales store write fails, the stock is put back.
+@diukur("penjualan.sell_basket")
+def sell_basket(katalog, inventory, sales, ringkasan, basket, transaction_date, customer_id):
+    basket = {product_id: quantity for product_id, quantity in basket.items() if quantity > 0 and product_id in katalog}
+    if not basket:
+        return []
+    stock = inventory.kurangi(basket)
+    try:
+        sold = [{
+            "Date": pd.Timestamp(transaction_date),
+            "IdProduk": product_id,
+            "NamaProduk": katalog.ambil(product_id, "NamaProduk"),
+            "Quantity": quantity,
+            "TotalPrice": quantity * katalog.harga(product_id),
+            "CustomerId": customer_id
+        } for product_id, quantity in basket.items()]
+        sales.tambah(sold)
+    except BaseException:
+        inventory.ubah(basket)
+        raise
+    for sale in sold:
+        katalog.set_stok(sale["IdProduk"], stock[sale["IdProduk"]])
+    sync_summary(ringkasan, sales)
+    return sold
+
+
+# Demo sales dated today, written only when asked for from the empty Dashboard
+def simulate_sales(product_data, sales, count=50):
+    from generator_data import buat_penjualan
+
+    simulated_sales = next(buat_penjualan(product_data, count))
+    simulated_sales["Date"] = datetime.now()
+    sales.tambah_data(simulated_sales)
+
+
+def add_customer(customers, customer_name):
+    new_customer_id = f"ctm{len(customers) + 1}"
+    customers[new_customer_id] = customer_name
+    return new_customer_id
+
+
+def default_customers():
+    return {
+        "ctm1": "John Doe",
+        "ctm2": "Jane Smith",
+        "ctm3": "Alice Brown",
+        "ctm4": "Bob White"
+    }
@@ -0,0 +1,71 @@
+from core._malas import np, pd
+
+# Skema tipe kolom untuk tabel di memori:
+#   "tanggal"  datetime64
+#   "kategori" kode kategorikal (kolom berkardinalitas rendah: tipe, kategori, nama produk)
+#   "uang"     int64 rupiah utuh (tanpa float), dibulatkan dari nilai pecahan
+#   "bilangan" int64
+# Kolom yang tidak ada di skema (misalnya Keterangan) dibiarkan apa adanya.
+SKEMA_LEDGER = {"Tanggal": "tanggal", "Kategori": "kategori", "Tipe": "kategori", "Jumlah": "uang"}
+SKEMA_STOK = {
+    "Produk": "kategori", "Merek": "kategori", "UkuranProduk": "kategori", "WarnaProduk": "kategori",
+    "Harga": "uang", "Stok": "bilangan",
+}
+SKEMA_PRODUK = {
+    "JenisProduk": "kategori", "NamaProduk": "kategori", "UkuranProduk": "kategori", "WarnaProduk": "kategori",
+    "HargaProduk": "uang", "StokProduk": "bilangan",
+}
+SKEMA_PENJUALAN = {
+    "Date": "tanggal", "NamaProduk": "kategori", "Quantity": "bilangan", "TotalPrice": "uang", "CustomerId": "kategori",
+}
+
+
+# Bulatkan ke bilangan bulat dengan setengah menjauhi nol (2,5 -> 3, seperti
+# record_transaksi; Series.round membulatkan ke genap); kolom dengan nilai kosong
+# memakai Int64 (nullable)
+def _ke_bulat(seri):
+    angka = pd.to_numeric(seri)
+    angka = np.sign(angka) * np.floor(np.abs(angka) + 0.5)
+    return angka.astype("Int64" if angka.isna().any() else "int64")
+
+
+# Ubah satu kolom ke tipenya; kolom yang tipenya sudah benar tidak disalin ulang
+def ubah_kolom(seri, jenis):
+    if jenis == "tanggal":
+        return seri if pd.api.types.is_datetime64_any_dtype(seri) else pd.to_datetime(seri)
+    if jenis == "kategori":
+        return seri if isinstance(seri.dtype, pd.CategoricalDtype) else seri.astype("category")
+    if pd.api.types.is_integer_dtype(seri):
+        return seri
+    return _ke_bulat(seri)
+
+
+def terapkan_skema(data, skema):
+    data = data.copy(deep=False)
+    for kolom, jenis in skema.items():
+        if kolom in data.columns:
+            data[kolom] = ubah_kolom(data[kolom], jenis)
+    return data
+
+
+# Samakan kategori dua kolom kategorikal: kategori baru ditambahkan di akhir sehingga
+# kode kategori yang sudah ada tidak berubah (tanpa pengodean ulang)
+def _samakan_kategori(lama, baru):
+    tambahan = baru.cat.categories.difference(lama.cat.categories)
+    if len(tambahan):
+        lama = lama.cat.add_categories(tambahan)
+    return lama, baru.cat.set_categories(lama.cat.categories)
+
+
+# Gabungkan baris baru ke tabel. Baris baru diubah ke skema dan kolom kategorikal
+# disamakan kategorinya lebih dulu, sehingga hasil concat tetap kategorikal dan tidak
+# kembali menjadi object/str.
+def gabung(data, baru, skema):
+    baru = terapkan_skema(baru, skema)
+    if data.empty:
+        return baru.reset_index(drop=True)
+    data = terapkan_skema(data, skema)
+    for kolom, jenis in skema.items():
+        if jenis == "kategori" and kolom in data.columns and kolom in baru.columns:
+            data[kolom], baru[kolom] = _samakan_kategori(data[kolom], baru[kolom])
+    return pd.concat([data, baru], ignore_index=True)
@@ -0,0 +1,99 @@
+import pandas as pd
+import pytest
+
+from core.dataset import DatasetBersama, TurunanDataset
+from core.ringkasan import RingkasanBerjalan
+from core.skema import SKEMA_LEDGER
+from generator_data import buat_ledger
+
+
+def _dataset(data, **opsi):
+    sumber = {"data": data}
+    return sumber, DatasetBersama(lambda: sumber["data"], SKEMA_LEDGER, **opsi)
+
+
+def _turunan(dataset, catatan):
+    def bangun(data):
+        catatan.append("bangun")
+        return RingkasanBerjalan.dari_ledger(data)
+
+    def perbarui(ringkasan, baru):
+        catatan.append(len(baru))
+        ringkasan.tambah_ledger(baru)
+
+    return TurunanDataset(dataset, bangun, perbarui)
+
+
+def test_komit_dan_perubahan():
+    _, dataset = _dataset(buat_ledger(100, seed=0))
+    versi_awal, data_awal = dataset.snapshot()
+    bagian = [buat_ledger(n, seed=n) for n in (3, 5, 7)]
+    versi = [dataset.komit(b) for b in bagian]
+    assert versi == [versi_awal + 1, versi_awal + 2, versi_awal + 3]
+    # Snapshot lama tidak diubah di tempat
+    assert len(data_awal) == 100
+    assert len(dataset.snapshot()[1]) == 115
+
+    assert len(dataset.perubahan(versi[0], versi[0])) == 0
+    assert dataset.perubahan(versi_awal, versi[2])["Jumlah"].tolist() == pd.concat(bagian)["Jumlah"].tolist()
+    assert dataset.perubahan(versi[0], versi[1])["Jumlah"].tolist() == bagian[1]["Jumlah"].tolist()
+    # Commit kosong tidak menaikkan versi
+    assert dataset.komit(buat_ledger(0)) == versi[2]
+
+
+def test_komit_menyimpan_sebelum_menggabung():
+    _, dataset = _dataset(buat_ledger(10, seed=0))
+    tersimpan = []
+    dataset.komit(buat_ledger(4, seed=1), simpan=tersimpan.append)
+    assert len(tersimpan) == 1 and len(dataset.snapshot()[1]) == 14
+
+    def gagal(baru):
+        raise OSError("disk penuh")
+
+    versi = dataset.versi
+    with pytest.raises(OSError):
+        dataset.komit(buat_ledger(4, seed=2), simpan=gagal)
+    assert dataset.versi == versi and len(dataset.snapshot()[1]) == 14
+
+
+def test_log_terpotong_memaksa_bangun_ulang():
+    _, dataset = _dataset(buat_ledger(50, seed=0), batas_log=2)
+    versi_awal = dataset.versi
+    for seed in range(3):
+        dataset.komit(buat_ledger(2, seed=seed))
+    # Log hanya menyimpan dua commit terakhir
+    assert dataset.perubahan(versi_awal, dataset.versi) is None
+    assert len(dataset.perubahan(versi_awal + 1, dataset.versi)) == 4
+
+
+def test_turunan_inkremental_sama_dengan_bangun_penuh():
+    sumber, dataset = _dataset(buat_ledger(200, seed=0), batas_log=3)
+    catatan = []
+    turunan = _turunan(dataset, catatan)
+    turunan.ambil()
+    assert catatan == ["bangun"]
+
+    # Turunan yang versinya sama tidak disentuh
+    turunan.ambil()
+    assert catatan == ["bangun"]
+
+    dataset.komit(buat_ledger(5, seed=1))
+    dataset.komit(buat_ledger(6, seed=2))
+    data, ringkasan = turunan.ambil()
+    assert catatan == ["bangun", 11]
+    assert ringkasan.totals() == RingkasanBerjalan.dari_ledger(data).totals()
+    assert ringkasan.jumlah_transaksi == len(data) == 211
+
+    # Tertinggal lebih jauh dari log: dibangun ulang dari snapshot
+    for seed in range(4):
+        dataset.komit(buat_ledger(2, seed=10 + seed))
+    data, ringkasan = turunan.ambil()
+    assert catatan[-1] == "bangun"
+    assert ringkasan.totals() == RingkasanBerjalan.dari_ledger(data).totals()
+
+    # Muat ulang mengosongkan log: semua turunan dibangun ulang dari penyimpanan
+    sumber["data"] = buat_ledger(30, seed=99)
+    dataset.muat_ulang()
+    data, ringkasan = turunan.ambil()
+    assert catatan[-1] == "bangun"
+    assert len(data) == 30 and ringkasan.jumlah_transaksi == 30
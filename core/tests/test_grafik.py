@@ -0,0 +1,80 @@
+import pandas as pd
+import pytest
+
+from core import grafik, metrik
+
+
+@pytest.fixture
+def render(monkeypatch):
+    grafik.kosongkan_cache()
+    metrik.reset()
+    panggilan = []
+    asli = grafik._render
+
+    def hitung_render(fig):
+        panggilan.append(1)
+        return asli(fig)
+
+    monkeypatch.setattr(grafik, "_render", hitung_render)
+    yield panggilan
+    grafik.kosongkan_cache()
+
+
+def _harian(hari, mulai="2020-01-01", nilai=1):
+    return pd.Series(nilai, index=pd.date_range(mulai, periods=hari, freq="D"), dtype="int64")
+
+
+def test_kunci_cache_mengikuti_isi_data():
+    seri = _harian(30)
+    assert grafik.hash_data("garis", seri) == grafik.hash_data("garis", seri.copy())
+    # Nilai, tanggal, dan parameter lain ikut menentukan kunci
+    assert grafik.hash_data("garis", seri) != grafik.hash_data("garis", seri.add(1))
+    assert grafik.hash_data("garis", seri) != grafik.hash_data("garis", _harian(30, mulai="2020-01-02"))
+    assert grafik.hash_data("garis", seri) != grafik.hash_data("pie", seri)
+
+
+def test_turunkan_resolusi_memilih_periode_terhalus():
+    pendek = _harian(100)
+    assert grafik.turunkan_resolusi(pendek, 400) is pendek
+
+    # 1000 hari tidak muat; minggu (143 titik) muat
+    seri = _harian(1000)
+    mingguan = grafik.turunkan_resolusi(seri, 400)
+    assert len(mingguan) <= 400 and mingguan.index.freqstr.startswith("W")
+    assert mingguan.sum() == seri.sum()
+
+    bulanan = grafik.turunkan_resolusi(seri, 40)
+    assert len(bulanan) == 33 and bulanan.index.freqstr == "MS"
+    assert bulanan.sum() == seri.sum()
+
+
+def test_cache_hit_dan_bangun_ulang(render):
+    seri = {"Pemasukan": _harian(60), "Pengeluaran": _harian(60, nilai=2)}
+    gambar = grafik.grafik_garis(seri, "Judul", "Tanggal", "Rp")
+    assert gambar[:8] == b"\x89PNG\r\n\x1a\n"
+    assert len(render) == 1
+
+    # Data sama dari objek berbeda: dari cache tanpa render ulang
+    salinan = {label: s.copy() for label, s in seri.items()}
+    assert grafik.grafik_garis(salinan, "Judul", "Tanggal", "Rp") is gambar
+    assert len(render) == 1
+
+    # Data berubah: digambar ulang
+    seri["Pemasukan"] = seri["Pemasukan"].add(5)
+    assert grafik.grafik_garis(seri, "Judul", "Tanggal", "Rp") is not gambar
+    assert len(render) == 2
+
+    # Deret panjang diturunkan resolusinya sebelum di-hash: hari berbeda dalam minggu
+    # yang sama menghasilkan gambar yang sama
+    panjang = _harian(1000)
+    gambar = grafik.grafik_garis({"Pemasukan": panjang}, "Judul", "Tanggal", "Rp")
+    geser = panjang.copy()
+    geser.iloc[[1, 2]] = [2, 0]
+    assert grafik.grafik_garis({"Pemasukan": geser}, "Judul", "Tanggal", "Rp") is gambar
+    assert len(render) == 3
+
+    grafik.grafik_pie([1, 2], ["a", "b"])
+    grafik.grafik_pie([1, 2], ["a", "b"])
+    assert len(render) == 4
+    hitungan = metrik.penghitung()
+    assert (hitungan["grafik.cache_hit"], hitungan["grafik.cache_miss"]) == (3, 4)
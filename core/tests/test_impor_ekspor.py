@@ -0,0 +1,121 @@
+import io
+
+import pandas as pd
+import pytest
+
+from core.impor_ekspor import (
+    ekspor_penjualan, ekspor_transaksi, impor_penjualan, impor_transaksi, validasi_transaksi,
+)
+from core.inventaris import InventarisBersama
+from core.inventory import create_product_catalog, generate_product_data
+from core.penyimpanan import JurnalKeuangan, PenjualanSQLite
+from generator_data import buat_ledger, buat_penjualan
+
+CSV_TRANSAKSI = """Tanggal,Kategori,Tipe,Jumlah,Keterangan
+2024-01-01,Sewa,Pengeluaran,1000,a
+bukan tanggal,Sewa,Pengeluaran,1000,b
+2024-01-02,T-Shirts,Pemasukan,2500.5,c
+2024-01-03,Sewa,Hadiah,1000,d
+2024-01-04,,Pengeluaran,1000,e
+2024-01-05,Sewa,Pengeluaran,seribu,f
+2024-01-06,Sewa,Pengeluaran,-5,g
+2024-01-07,Gaji,Pengeluaran,7000,h
+"""
+
+
+def test_validasi_transaksi_menolak_dengan_nomor_baris_dan_alasan():
+    chunk = pd.read_csv(io.StringIO(CSV_TRANSAKSI), dtype=str, keep_default_na=False)
+    valid, ditolak = validasi_transaksi(chunk, baris_awal=11)
+    assert valid.index.tolist() == [11, 13, 18]
+    assert valid["Jumlah"].tolist() == [1000, 2501, 7000]
+    assert str(valid["Jumlah"].dtype) == "int64"
+    assert ditolak["Baris"].tolist() == [12, 14, 15, 16, 17]
+    assert ditolak["Alasan"].tolist() == [
+        "Tanggal tidak valid", "Tipe harus Pemasukan atau Pengeluaran", "Kategori kosong",
+        "Jumlah bukan angka", "Jumlah harus lebih dari 0",
+    ]
+    # Baris ditolak dilaporkan persis seperti di sumbernya
+    assert ditolak["Jumlah"].tolist() == ["1000", "1000", "1000", "seribu", "-5"]
+
+    with pytest.raises(ValueError):
+        validasi_transaksi(chunk.drop(columns="Jumlah"))
+
+
+def test_impor_transaksi_per_chunk(tmp_path):
+    sumber = tmp_path / "transaksi.csv"
+    sumber.write_text(CSV_TRANSAKSI)
+    path_ditolak = tmp_path / "ditolak.csv"
+    ledger = JurnalKeuangan(str(tmp_path / "ledger.arrow"))
+
+    # 8 baris dalam chunk 3: chunk terakhir hanya berisi 2 baris
+    hasil = impor_transaksi(str(sumber), ledger, path_ditolak=str(path_ditolak), ukuran_chunk=3)
+    assert (hasil["diterima"], hasil["ditolak"], hasil["chunk"]) == (3, 5, 3)
+    assert hasil["contoh_ditolak"]["Baris"].tolist() == [2, 4, 5, 6, 7]
+    ditolak = pd.read_csv(path_ditolak)
+    assert ditolak["Baris"].tolist() == [2, 4, 5, 6, 7]
+    assert ditolak.columns[0] == "Baris" and ditolak.columns[-1] == "Alasan"
+    assert JurnalKeuangan(str(tmp_path / "ledger.arrow")).muat()["Keterangan"].tolist() == ["a", "c", "h"]
+
+
+def test_impor_penjualan_menolak_stok_kurang_per_chunk(tmp_path):
+    katalog = create_product_catalog(generate_product_data())
+    inventaris = InventarisBersama(str(tmp_path / "stok.db"))
+    inventaris.impor([1, 2], [3, 10])
+    tersimpan = []
+    sumber = io.StringIO(
+        "Date,IdProduk,Quantity,TotalPrice\n"
+        "2024-01-01,1,2,\n"
+        "2024-01-01,99999,1,\n"
+        "2024-01-02,2,1.5,\n"
+        "2024-01-02,1,2,\n"     # chunk kedua: stok produk 1 tinggal 1
+        "2024-01-03,2,4,1000\n"
+    )
+    hasil = impor_penjualan(sumber, katalog, tersimpan.append, inventaris=inventaris, format="csv", ukuran_chunk=3)
+    assert (hasil["diterima"], hasil["ditolak"], hasil["chunk"]) == (2, 3, 2)
+    assert sorted(hasil["contoh_ditolak"]["Alasan"]) == [
+        "IdProduk not in catalog", "Insufficient stock", "Quantity is not a whole number",
+    ]
+    data = pd.concat(tersimpan)
+    assert data["IdProduk"].tolist() == [1, 2]
+    assert data["TotalPrice"].tolist() == [2 * katalog.harga(1), 1000]
+    assert inventaris.semua() == {"1": 1, "2": 6}
+    assert (katalog.stok(1), katalog.stok(2)) == (1, 6)
+
+
+@pytest.mark.parametrize("format", ["csv", "jsonl", "parquet"])
+def test_ekspor_lalu_impor_transaksi_sama(tmp_path, format):
+    data = buat_ledger(500, seed=3).assign(Keterangan=lambda d: "k" + d.index.astype(str))
+    asal = JurnalKeuangan(str(tmp_path / "asal.arrow"))
+    asal.tambah_data(data)
+    path = str(tmp_path / f"ekspor.{format}")
+    assert ekspor_transaksi(asal, path, "2021-01-01", "2022-12-31", ukuran_chunk=64) == len(
+        data.loc[data["Tanggal"].between("2021-01-01", "2022-12-31")]
+    )
+
+    tujuan = JurnalKeuangan(str(tmp_path / "tujuan.arrow"))
+    hasil = impor_transaksi(path, tujuan, ukuran_chunk=100)
+    assert hasil["ditolak"] == 0
+    harapan = data.loc[data["Tanggal"].between("2021-01-01", "2022-12-31")].reset_index(drop=True)
+    dimuat = tujuan.muat()
+    pd.testing.assert_frame_equal(
+        dimuat.astype({"Kategori": str, "Tipe": str}), harapan, check_dtype=False
+    )
+
+
+@pytest.mark.parametrize("format", ["jsonl", "parquet"])
+def test_ekspor_lalu_impor_penjualan_sama(tmp_path, format):
+    produk = generate_product_data()
+    katalog = create_product_catalog(produk)
+    penjualan = next(buat_penjualan(produk, 300, seed=1))
+    penjualan["CustomerId"] = "ctm1"
+    asal = PenjualanSQLite(str(tmp_path / "asal.db"))
+    asal.tambah_data(penjualan)
+    path = str(tmp_path / f"ekspor.{format}")
+    assert ekspor_penjualan(asal, path, ukuran_chunk=64) == 300
+
+    tujuan = PenjualanSQLite(str(tmp_path / "tujuan.db"))
+    hasil = impor_penjualan(path, katalog, tujuan.tambah_data, ukuran_chunk=100)
+    # JSONL dibaca per 100 baris; parquet per row group yang ditulis ekspor
+    assert (hasil["diterima"], hasil["ditolak"]) == (300, 0)
+    assert hasil["chunk"] == 3 if format == "jsonl" else hasil["chunk"] > 1
+    pd.testing.assert_frame_equal(tujuan.muat(), asal.muat())
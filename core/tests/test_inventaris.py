@@ -0,0 +1,166 @@
+import multiprocessing
+import threading
+
+import pandas as pd
+import pytest
+
+from core.dataset import DatasetBersama
+from core.inventaris import InventarisBersama, StokTidakCukup
+from core.inventory import buat_katalog_stok, segarkan_stok
+from core.penulis import penulis
+from core.penyimpanan import JurnalKeuangan
+from core.sales import catat_penjualan
+from core.skema import SKEMA_LEDGER
+
+
+@pytest.fixture
+def inventaris(tmp_path):
+    inventaris = InventarisBersama(str(tmp_path / "stok.db"))
+    inventaris.impor(["A", "B", "C"], [5, 3, 0])
+    return inventaris
+
+
+def test_oversell_ditolak_tanpa_perubahan_sebagian(inventaris):
+    with pytest.raises(StokTidakCukup) as galat:
+        inventaris.kurangi({"A": 2, "B": 4})
+    assert galat.value.kode == "B"
+    # Pengurangan A di transaksi yang sama ikut dibatalkan
+    assert inventaris.semua() == {"A": 5, "B": 3, "C": 0}
+
+    with pytest.raises(StokTidakCukup):
+        inventaris.kurangi({"C": 1})
+    with pytest.raises(StokTidakCukup):
+        inventaris.kurangi({"X": 1})
+    assert inventaris.kurangi({"A": 5, "B": 3}) == {"A": 0, "B": 0}
+
+
+def test_kasir_bersamaan_tidak_pernah_membuat_stok_negatif(tmp_path):
+    inventaris = InventarisBersama(str(tmp_path / "stok.db"))
+    inventaris.impor(["A", "B"], [50, 30])
+    terjual = []
+    lock = threading.Lock()
+
+    def kasir():
+        for _ in range(40):
+            try:
+                inventaris.kurangi({"A": 1, "B": 1})
+            except StokTidakCukup:
+                continue
+            with lock:
+                terjual.append(1)
+
+    pekerja = [threading.Thread(target=kasir) for _ in range(4)]
+    for t in pekerja:
+        t.start()
+    for t in pekerja:
+        t.join()
+    assert len(terjual) == 30
+    assert inventaris.semua() == {"A": 20, "B": 0}
+
+
+# Satu proses kasir: jual satu A dan satu B berulang kali dan catat stok yang terlihat
+def _kasir_proses(path_db, percobaan, antrean):
+    inventaris = InventarisBersama(path_db)
+    terjual, terendah = 0, None
+    for _ in range(percobaan):
+        try:
+            stok = inventaris.kurangi({"A": 1, "B": 1})
+        except StokTidakCukup:
+            continue
+        terjual += 1
+        terendah = min(stok.values()) if terendah is None else min(terendah, *stok.values())
+    antrean.put((terjual, terendah))
+
+
+def test_kasir_di_proses_berbeda_tidak_pernah_membuat_stok_negatif(tmp_path):
+    path_db = str(tmp_path / "stok.db")
+    InventarisBersama(path_db).impor(["A", "B"], [100, 60])
+    konteks = multiprocessing.get_context("spawn")
+    antrean = konteks.Queue()
+    pekerja = [konteks.Process(target=_kasir_proses, args=(path_db, 25, antrean)) for _ in range(4)]
+    for p in pekerja:
+        p.start()
+    hasil = [antrean.get(timeout=120) for _ in pekerja]
+    for p in pekerja:
+        p.join(120)
+        assert p.exitcode == 0
+    assert sum(terjual for terjual, _ in hasil) == 60
+    assert all(terendah is None or terendah >= 0 for _, terendah in hasil)
+    assert InventarisBersama(path_db).semua() == {"A": 40, "B": 0}
+
+
+def _produk_baru_proses(path_db, jumlah, antrean):
+    inventaris = InventarisBersama(path_db)
+    antrean.put([inventaris.produk_baru(1) for _ in range(jumlah)])
+
+
+def test_produk_baru_dari_proses_berbeda_mendapat_kode_unik(tmp_path):
+    path_db = str(tmp_path / "stok.db")
+    InventarisBersama(path_db).impor([1, 2, 270, "SKU-9"], [1, 1, 1, 1])
+    konteks = multiprocessing.get_context("spawn")
+    antrean = konteks.Queue()
+    pekerja = [konteks.Process(target=_produk_baru_proses, args=(path_db, 20, antrean)) for _ in range(3)]
+    for p in pekerja:
+        p.start()
+    kode = sum((antrean.get(timeout=120) for _ in pekerja), [])
+    for p in pekerja:
+        p.join(120)
+    # Kode baru melanjutkan kode angka terbesar; kode bukan angka diabaikan
+    assert sorted(kode) == list(range(271, 331))
+    assert len(InventarisBersama(path_db).semua()) == 64
+
+
+def _stok():
+    return pd.DataFrame({
+        "Kode Produk": ["A", "B", "C"],
+        "Produk": ["Kaos", "Celana", "Jaket"],
+        "Merek": ["M1", "M2", "M3"],
+        "UkuranProduk": ["S", "M", "L"],
+        "WarnaProduk": ["Merah", "Biru", "Hitam"],
+        "Harga": [100000, 200000, 300000],
+        "Stok": [5, 3, 0],
+    })
+
+
+def test_segarkan_stok_hanya_membaca_yang_berubah(inventaris):
+    katalog = buat_katalog_stok(_stok())
+    segarkan_stok(katalog, inventaris)
+    versi = katalog.versi_stok
+    assert inventaris.berubah_sejak(versi) == ({}, versi)
+
+    inventaris.kurangi({"B": 2})
+    berubah, terbaru = inventaris.berubah_sejak(versi)
+    assert berubah == {"B": 1} and terbaru > versi
+    # Katalog pembaca lain yang belum sinkron ikut tertinggal sampai disegarkan
+    katalog.set_stok("A", 99)
+    segarkan_stok(katalog, inventaris)
+    assert (katalog.stok("A"), katalog.stok("B")) == (99, 1)
+
+    # Versi yang tidak dikenal (database diganti): semua produk dibaca ulang
+    assert inventaris.berubah_sejak(terbaru + 100)[0] == {"A": 5, "B": 1, "C": 0}
+    assert inventaris.berubah_sejak(None)[0] == {"A": 5, "B": 1, "C": 0}
+
+
+def test_catat_penjualan_mengembalikan_stok_jika_ledger_gagal(inventaris, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    katalog = buat_katalog_stok(_stok())
+    segarkan_stok(katalog, inventaris)
+    jurnal = JurnalKeuangan(str(tmp_path / "ledger.arrow"))
+    dataset = DatasetBersama(jurnal.muat, SKEMA_LEDGER)
+
+    def gagal(data):
+        raise OSError("disk penuh")
+
+    monkeypatch.setattr(jurnal, "tambah_data", gagal)
+    with pytest.raises(OSError):
+        catat_penjualan(jurnal, dataset, katalog, inventaris, "2024-01-01", {"A": 2, "B": 1}, "Penjualan")
+    assert inventaris.semua() == {"A": 5, "B": 3, "C": 0}
+    assert dataset.snapshot()[1].empty
+
+    monkeypatch.undo()
+    monkeypatch.chdir(tmp_path)
+    assert catat_penjualan(jurnal, dataset, katalog, inventaris, "2024-01-01", {"A": 2, "B": 1}, "Penjualan") == 2
+    penulis.tunggu()
+    assert inventaris.semua() == {"A": 3, "B": 2, "C": 0}
+    assert (katalog.stok("A"), katalog.stok("B")) == (3, 2)
+    assert JurnalKeuangan(str(tmp_path / "ledger.arrow")).muat()["Jumlah"].tolist() == [200000, 200000]
@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.kubus import KubusLaporan, awal_periode
+from generator_data import buat_ledger
+
+
+def _data(n=3000, seed=0):
+    data = buat_ledger(n, hari=400, seed=seed)
+    rng = np.random.default_rng(seed)
+    return data.assign(
+        Produk=rng.choice(["P1", "P2", "P3"], n),
+        Unit=rng.integers(1, 5, n),
+        Pelanggan=rng.choice(["C1", "C2"], n),
+    )
+
+
+# Query kubus dihitung langsung dari baris mentah
+def _brute(data, granularitas, tanggal_awal=None, tanggal_akhir=None, dimensi=(), **filter):
+    hari = data["Tanggal"].dt.normalize()
+    cocok = pd.Series(True, index=data.index)
+    if tanggal_awal is not None:
+        cocok &= hari >= pd.Timestamp(tanggal_awal)
+    if tanggal_akhir is not None:
+        cocok &= hari <= pd.Timestamp(tanggal_akhir)
+    for nama, nilai in filter.items():
+        cocok &= data[nama.capitalize()] == nilai
+    data = data.loc[cocok].assign(Periode=awal_periode(data.loc[cocok, "Tanggal"], granularitas), Transaksi=1)
+    return data.groupby(["Periode"] + list(dimensi))[["Jumlah", "Unit", "Transaksi"]].sum().reset_index()
+
+
+def _rapikan(hasil, dimensi=()):
+    hasil = hasil.astype({kolom: str for kolom in dimensi}).astype({"Jumlah": "int64", "Unit": "int64", "Transaksi": "int64"})
+    hasil["Periode"] = hasil["Periode"].astype("datetime64[us]")
+    return hasil.sort_values(["Periode"] + list(dimensi)).reset_index(drop=True)
+
+
+RENTANG = [
+    (None, None),
+    ("2020-01-15", "2020-09-10"),   # ujung-ujung di tengah minggu dan bulan
+    ("2020-02-01", "2020-04-30"),   # bulan penuh
+    ("2020-03-02", "2020-03-15"),   # minggu penuh
+    ("2020-03-04", "2020-03-06"),   # lebih pendek dari satu minggu
+    ("2020-06-01", None),
+]
+
+
+@pytest.mark.parametrize("granularitas", ["hari", "minggu", "bulan"])
+@pytest.mark.parametrize("rentang", RENTANG)
+def test_query_sama_dengan_baris_mentah(granularitas, rentang):
+    data = _data()
+    kubus = KubusLaporan()
+    kubus.tambah_data(data)
+    for dimensi, filter in [((), {}), (("Kategori",), {"tipe": "Pemasukan"}), (("Produk", "Pelanggan"), {}), (("Tipe",), {"produk": "P2"})]:
+        hasil = kubus.query(granularitas, *rentang, dimensi=dimensi, **filter)
+        harapan = _brute(data, granularitas, *rentang, dimensi=dimensi, **filter)
+        pd.testing.assert_frame_equal(_rapikan(hasil, dimensi), _rapikan(harapan, dimensi))
+
+
+def test_tambah_per_baris_sama_dengan_tambah_data():
+    data = _data(500, seed=1)
+    sekaligus, satu_satu = KubusLaporan(), KubusLaporan(batas_tertunda=64)
+    sekaligus.tambah_data(data.iloc[:200])
+    satu_satu.tambah_data(data.iloc[:200])
+    sekaligus.tambah_data(data.iloc[200:])
+    for baris in data.iloc[200:].itertuples(index=False):
+        satu_satu.tambah(baris.Tanggal, baris.Tipe, baris.Kategori, baris.Jumlah, baris.Produk, baris.Unit, baris.Pelanggan)
+        # Query di tengah penambahan tidak boleh menghilangkan baris tertunda
+        if baris.Jumlah % 7 == 0:
+            satu_satu.query("bulan")
+    for granularitas in ("hari", "minggu", "bulan"):
+        dimensi = ("Tipe", "Kategori", "Produk")
+        pd.testing.assert_frame_equal(
+            _rapikan(satu_satu.query(granularitas, dimensi=dimensi), dimensi),
+            _rapikan(sekaligus.query(granularitas, dimensi=dimensi), dimensi),
+        )
+
+
+def test_kubus_kosong():
+    hasil = KubusLaporan().query("bulan", dimensi=("Kategori",))
+    assert hasil.empty
+    assert list(hasil.columns) == ["Periode", "Kategori", "Jumlah", "Unit", "Transaksi"]
@@ -0,0 +1,124 @@
+import json
+import threading
+
+import pytest
+
+from core import metrik
+
+
+@pytest.fixture(autouse=True)
+def metrik_bersih(monkeypatch):
+    metrik.reset()
+    monkeypatch.setattr(metrik, "METRIK_JSONL", None)
+    monkeypatch.setattr(metrik, "METRIK_PROM", None)
+    yield
+    metrik.reset()
+
+
+def test_diukur_mencatat_setiap_panggilan():
+    @metrik.diukur("uji.fungsi")
+    def fungsi(a, b=0):
+        """Dokumentasi tetap terbawa."""
+        if a < 0:
+            raise ValueError(a)
+        return a + b
+
+    assert fungsi(1, b=2) == 3
+    assert fungsi(4) == 4
+    with pytest.raises(ValueError):
+        fungsi(-1)
+    assert fungsi.__name__ == "fungsi" and fungsi.__doc__ == "Dokumentasi tetap terbawa."
+
+    (stat,) = metrik.statistik()
+    # Panggilan yang melempar exception juga diukur
+    assert stat["nama"] == "uji.fungsi" and stat["jumlah"] == 3
+    assert 0 <= stat["p50"] <= stat["p99"] and stat["total"] >= stat["p99"]
+
+
+def test_rincian_per_rerun():
+    metrik.mulai_rerun("uji")
+    with metrik.ukur("luar"):
+        with metrik.ukur("dalam"):
+            pass
+        with metrik.ukur("dalam"):
+            pass
+    metrik.hitung("cache_hit", 2)
+    rekaman = metrik.selesai_rerun("Dashboard")
+
+    assert rekaman["aplikasi"] == "uji" and rekaman["halaman"] == "Dashboard"
+    assert rekaman["panggilan"] == {"luar": 1, "dalam": 2}
+    assert rekaman["penghitung"] == {"cache_hit": 2}
+    # Bagian bersifat inklusif: bagian luar memuat bagian dalam
+    assert rekaman["bagian_ms"]["luar"] >= rekaman["bagian_ms"]["dalam"]
+    assert rekaman["total_ms"] >= rekaman["bagian_ms"]["luar"]
+    assert list(rekaman["bagian_ms"]) == ["luar", "dalam"]
+
+    # Di luar rerun hanya statistik global yang dicatat
+    assert metrik.selesai_rerun() is None
+    with metrik.ukur("dalam"):
+        pass
+    jumlah = {stat["nama"]: stat["jumlah"] for stat in metrik.statistik()}
+    assert jumlah == {"dalam": 3, "luar": 1, "rerun": 1}
+
+
+def test_rerun_setiap_thread_terpisah():
+    hasil = {}
+
+    def sesi(nama, n):
+        metrik.mulai_rerun(nama)
+        for _ in range(n):
+            with metrik.ukur("kerja"):
+                pass
+        hasil[nama] = metrik.selesai_rerun()
+
+    pekerja = [threading.Thread(target=sesi, args=(f"sesi{i}", i + 1)) for i in range(3)]
+    for t in pekerja:
+        t.start()
+    for t in pekerja:
+        t.join()
+    assert {nama: r["panggilan"]["kerja"] for nama, r in hasil.items()} == {"sesi0": 1, "sesi1": 2, "sesi2": 3}
+
+
+def test_ekspor_jsonl(tmp_path, monkeypatch):
+    path = tmp_path / "metrik.jsonl"
+    monkeypatch.setattr(metrik, "METRIK_JSONL", str(path))
+    for halaman in ("Dashboard", "Laporan"):
+        metrik.mulai_rerun("uji")
+        with metrik.ukur("muat"):
+            pass
+        metrik.selesai_rerun(halaman)
+
+    baris = [json.loads(b) for b in path.read_text().splitlines()]
+    assert [b["halaman"] for b in baris] == ["Dashboard", "Laporan"]
+    assert all(b["panggilan"] == {"muat": 1} and b["total_ms"] >= b["bagian_ms"]["muat"] for b in baris)
+
+
+def test_ekspor_prometheus(tmp_path, monkeypatch):
+    metrik.catat_durasi("muat", 0.003)
+    metrik.catat_durasi("muat", 0.2)
+    metrik.catat_durasi('nama "aneh"', 20)
+    metrik.hitung("grafik.cache_hit", 5)
+    teks = metrik.teks_prometheus()
+    baris = set(teks.splitlines())
+
+    # Bucket kumulatif: 0,003 detik masuk semua bucket mulai le=0.005
+    assert 'aplikasi_durasi_detik_bucket{nama="muat",le="0.001"} 0' in baris
+    assert 'aplikasi_durasi_detik_bucket{nama="muat",le="0.005"} 1' in baris
+    assert 'aplikasi_durasi_detik_bucket{nama="muat",le="0.25"} 2' in baris
+    assert 'aplikasi_durasi_detik_bucket{nama="muat",le="+Inf"} 2' in baris
+    assert 'aplikasi_durasi_detik_count{nama="muat"} 2' in baris
+    assert 'aplikasi_durasi_detik_bucket{nama="nama \\"aneh\\"",le="10"} 0' in baris
+    assert 'aplikasi_durasi_detik_bucket{nama="nama \\"aneh\\"",le="+Inf"} 1' in baris
+    assert 'aplikasi_kejadian_total{nama="grafik.cache_hit"} 5' in baris
+
+    # File ditulis saat rerun selesai, paling sering sekali per INTERVAL_PROM
+    path = tmp_path / "metrik.prom"
+    monkeypatch.setattr(metrik, "METRIK_PROM", str(path))
+    monkeypatch.setattr(metrik, "_prom_terakhir", [0.0])
+    metrik.mulai_rerun("uji")
+    metrik.selesai_rerun()
+    assert 'aplikasi_durasi_detik_count{nama="rerun"} 1' in path.read_text().splitlines()
+    metrik.mulai_rerun("uji")
+    metrik.selesai_rerun()
+    assert 'aplikasi_durasi_detik_count{nama="rerun"} 1' in path.read_text().splitlines()
+    assert [p.name for p in tmp_path.iterdir()] == ["metrik.prom"]
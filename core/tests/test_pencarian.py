@@ -0,0 +1,68 @@
+import re
+
+import pandas as pd
+import pytest
+
+from core.pencarian import IndeksProduk
+from generator_data import buat_katalog
+
+KOLOM_TEKS = ["JenisProduk", "NamaProduk", "UkuranProduk", "WarnaProduk"]
+
+
+# Pencarian langsung per baris: setiap kata kueri harus cocok dengan salah satu token
+# (awalan untuk kata pendek, bagian mana pun untuk kata sepanjang 3 huruf atau lebih);
+# skor = banyak kata yang cocok di awal token, seri diurutkan menurut urutan katalog
+def _brute(data, kueri, k):
+    istilah = list(dict.fromkeys(re.findall(r"\w+", kueri.lower())))
+    if not istilah:
+        return []
+    hasil = []
+    for posisi, baris in enumerate(data[KOLOM_TEKS].astype(str).itertuples(index=False)):
+        token = [t for teks in baris for t in re.findall(r"\w+", teks.lower())]
+        cocok = [
+            any(t.startswith(i) if len(i) < 3 else i in t for t in token)
+            for i in istilah
+        ]
+        if all(cocok):
+            skor = sum(any(t.startswith(i) for t in token) for i in istilah)
+            hasil.append((-skor, posisi))
+    return [data["IdProduk"].iloc[p] for _, p in sorted(hasil)[:k]]
+
+
+@pytest.fixture(scope="module")
+def katalog():
+    return buat_katalog(ulang=3, seed=0)
+
+
+KUERI = ["", "s", "sl", "sleeve", "eev", "jean", "ean hi", "chino pants putih", "3d", "m hitam", "tidak ada", "s s", "PARKA!"]
+
+
+def test_sama_dengan_pencarian_langsung(katalog):
+    indeks = IndeksProduk(katalog, "IdProduk", KOLOM_TEKS)
+    assert len(indeks) == len(katalog)
+    for kueri in KUERI:
+        for k in (1, 10, 100):
+            assert indeks.cari(kueri, k) == _brute(katalog, kueri, k), kueri
+        assert indeks.hitung(kueri) == len(_brute(katalog, kueri, len(katalog)))
+
+
+def test_mengetik_bertahap_memakai_cache_dengan_benar(katalog):
+    indeks = IndeksProduk(katalog, "IdProduk", KOLOM_TEKS, ukuran_cache=4)
+    for kalimat in ("slim fit jeans hitam", "flannel long sleeve large", "parka putih"):
+        for akhir in range(1, len(kalimat) + 1):
+            kueri = kalimat[:akhir]
+            assert indeks.cari(kueri, 20) == _brute(katalog, kueri, 20), kueri
+    # Menghapus huruf (istilah lebih umum setelah yang lebih khusus)
+    for kueri in ("jeans", "jean", "jea", "je", "j"):
+        assert indeks.cari(kueri, 20) == _brute(katalog, kueri, 20), kueri
+
+
+def test_produk_baru_langsung_bisa_dicari(katalog):
+    indeks = IndeksProduk(katalog, "IdProduk", KOLOM_TEKS)
+    indeks.cari("zebra", 5)
+    produk = {"IdProduk": 99999, "JenisProduk": "T-Shirts", "NamaProduk": "Zebra Stripe", "UkuranProduk": "Medium", "WarnaProduk": "Putih"}
+    indeks.tambah(produk)
+    semua = pd.concat([katalog.astype({kolom: str for kolom in KOLOM_TEKS}), pd.DataFrame([produk])], ignore_index=True)
+    assert indeks.cari("zebra", 5) == [99999]
+    for kueri in ("shirts med", "str", "putih"):
+        assert indeks.cari(kueri, 50) == _brute(semua, kueri, 50), kueri
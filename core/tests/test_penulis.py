@@ -0,0 +1,137 @@
+import os
+import subprocess
+import sys
+import threading
+import time
+
+from core.penulis import PenulisLatar
+
+
+def test_penulisan_beruntun_dengan_kunci_sama_digabung():
+    penulis = PenulisLatar()
+    lepas = threading.Event()
+    ditulis = []
+    # Penulisan pertama menahan thread penulis sementara yang lain menumpuk
+    penulis.kirim("tahan", lambda: lepas.wait(5))
+    for i in range(10):
+        penulis.kirim("stok", lambda i=i: ditulis.append(("stok", i)))
+        penulis.kirim("ledger", lambda i=i: ditulis.append(("ledger", i)))
+    assert penulis.tertunda() == 3
+    lepas.set()
+    assert penulis.tunggu(5)
+    # Hanya nilai terakhir setiap kunci yang ditulis, sesuai urutan kiriman pertamanya
+    assert ditulis == [("stok", 9), ("ledger", 9)]
+    status = penulis.status()
+    assert (status["ditulis"], status["digabung"], status["tertunda"]) == (3, 18, 0)
+    penulis.tutup()
+
+
+def test_antrean_penuh_menahan_pengirim():
+    penulis = PenulisLatar(ukuran_antrean=2)
+    mulai, lepas = threading.Event(), threading.Event()
+    penulis.kirim("tahan", lambda: (mulai.set(), lepas.wait(5)))
+    assert mulai.wait(5)
+    penulis.kirim("a", lambda: None)
+    penulis.kirim("b", lambda: None)
+
+    # Kunci ketiga tidak muat di antrean: pengirim menunggu sampai ada tempat
+    selesai = threading.Event()
+    pengirim = threading.Thread(target=lambda: (penulis.kirim("c", lambda: None), selesai.set()))
+    pengirim.start()
+    assert not selesai.wait(0.2)
+    # Kunci yang sudah tertunda tetap bisa digabung tanpa menunggu
+    penulis.kirim("a", lambda: None)
+    lepas.set()
+    assert selesai.wait(5)
+    pengirim.join()
+    assert penulis.tunggu(5)
+    assert penulis.status()["ditulis"] == 4
+    penulis.tutup()
+
+
+def test_penulisan_gagal_dicoba_lagi_lalu_dilaporkan():
+    penulis = PenulisLatar(batas_ulang=3, jeda_ulang=0.01)
+    percobaan = []
+
+    def gagal_dua_kali():
+        percobaan.append(1)
+        if len(percobaan) <= 2:
+            raise OSError("disk penuh")
+
+    penulis.kirim("stok", gagal_dua_kali)
+    assert penulis.tunggu(5)
+    status = penulis.status()
+    assert len(percobaan) == 3 and status["diulang"] == 2 and status["galat"] == {}
+
+    def selalu_gagal():
+        percobaan.append(1)
+        raise OSError("disk penuh")
+
+    percobaan.clear()
+    penulis.kirim("stok", selalu_gagal)
+    assert penulis.tunggu(5)
+    status = penulis.status()
+    # Setelah batas percobaan galat tetap terlihat sampai kunci itu berhasil ditulis
+    assert len(percobaan) == 3 and status["menunggu_ulang"] == []
+    assert isinstance(status["galat"]["stok"], OSError)
+    penulis.kirim("stok", lambda: None)
+    assert penulis.tunggu(5) and penulis.status()["galat"] == {}
+    penulis.tutup()
+
+
+def test_penulisan_baru_menggantikan_percobaan_ulang():
+    penulis = PenulisLatar(jeda_ulang=60)
+    lama = []
+    penulis.kirim("stok", lambda: (lama.append(1), 1 / 0))
+    for _ in range(100):
+        if penulis.status()["menunggu_ulang"]:
+            break
+        time.sleep(0.01)
+    status = penulis.status()
+    assert status["menunggu_ulang"] == ["stok"] and status["tertunda"] == 1
+    assert isinstance(status["galat"]["stok"], ZeroDivisionError)
+
+    baru = []
+    penulis.kirim("stok", lambda: baru.append(1))
+    assert penulis.tunggu(5)
+    assert lama == [1] and baru == [1]
+    assert penulis.status()["galat"] == {}
+    penulis.tutup()
+
+
+def test_tutup_menjalankan_percobaan_ulang_yang_menunggu():
+    penulis = PenulisLatar(jeda_ulang=60)
+    percobaan = []
+
+    def gagal_sekali():
+        percobaan.append(1)
+        if len(percobaan) == 1:
+            raise OSError("disk penuh")
+
+    penulis.kirim("stok", gagal_sekali)
+    for _ in range(100):
+        if penulis.status()["menunggu_ulang"]:
+            break
+        time.sleep(0.01)
+    penulis.tutup()
+    assert len(percobaan) == 2 and penulis.status()["galat"] == {}
+    # Setelah ditutup penulisan dijalankan langsung
+    penulis.kirim("stok", lambda: percobaan.append(1))
+    assert len(percobaan) == 3
+
+
+# Proses yang keluar tepat setelah mengirim penulisan tetap menyelesaikannya (atexit)
+def test_atexit_menyelesaikan_penulisan_tertunda(tmp_path):
+    path = tmp_path / "hasil.txt"
+    skrip = (
+        "import time\n"
+        "from core.penulis import penulis\n"
+        "def tulis(i):\n"
+        "    time.sleep(0.05)\n"
+        f"    open({str(path)!r}, 'a').write(f'{{i}}\\n')\n"
+        "for i in range(5):\n"
+        "    penulis.kirim(i, lambda i=i: tulis(i))\n"
+    )
+    akar = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    subprocess.run([sys.executable, "-c", skrip], cwd=akar, check=True, timeout=60)
+    assert path.read_text().split() == ["0", "1", "2", "3", "4"]
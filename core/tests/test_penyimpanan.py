@@ -0,0 +1,262 @@
+import json
+import multiprocessing
+import os
+
+import pandas as pd
+import pytest
+
+from core.partisi import ringkasan_partisi, ringkasan_terbuka, tutup_buku
+from core.penyimpanan import JurnalKeuangan, LedgerBulanan, PenjualanSQLite
+from core.ringkasan import RingkasanBerjalan
+from generator_data import buat_katalog, buat_ledger, buat_penjualan
+
+
+def _record(i, tanggal="2024-01-01"):
+    return {"Tanggal": tanggal, "Kategori": "Sewa", "Tipe": "Pengeluaran", "Jumlah": 1000 + i, "Keterangan": f"t{i}"}
+
+
+def _jumlah(data):
+    return data["Jumlah"].tolist()
+
+
+# ---- JurnalKeuangan
+
+def test_jurnal_kompaksi_menggabung_ke_snapshot(tmp_path):
+    path = str(tmp_path / "ledger.arrow")
+    jurnal = JurnalKeuangan(path, batas_kompaksi=10)
+    for i in range(25):
+        jurnal.tambah([_record(i)])
+
+    # Kompaksi terakhir terjadi di baris ke-20; sisa 5 baris masih di jurnal
+    with open(jurnal.path_jurnal) as f:
+        assert len(f.read().splitlines()) == 5
+    data = JurnalKeuangan(path).muat()
+    assert _jumlah(data) == [1000 + i for i in range(25)]
+    assert str(data["Tanggal"].dtype).startswith("datetime64")
+
+    jurnal.kompaksi()
+    assert os.path.getsize(jurnal.path_jurnal) == 0
+    assert _jumlah(JurnalKeuangan(path).muat()) == [1000 + i for i in range(25)]
+
+
+def test_jurnal_potongan_terakhir_tidak_lengkap_dibuang(tmp_path):
+    path = str(tmp_path / "ledger.arrow")
+    jurnal = JurnalKeuangan(path)
+    jurnal.tambah([_record(0), _record(1)])
+    jurnal.tutup()
+    with open(jurnal.path_jurnal, "a") as f:
+        f.write('{"no": 2, "Tanggal": "2024-01-01", "Kate')
+    ukuran = os.path.getsize(jurnal.path_jurnal)
+
+    # Pembaca hanya-baca tidak memotong file yang mungkin sedang ditulis
+    assert _jumlah(JurnalKeuangan(path, hanya_baca=True).muat()) == [1000, 1001]
+    assert os.path.getsize(jurnal.path_jurnal) == ukuran
+
+    pulih = JurnalKeuangan(path)
+    assert _jumlah(pulih.muat()) == [1000, 1001]
+    assert os.path.getsize(pulih.path_jurnal) < ukuran
+    pulih.tambah([_record(2)])
+    assert _jumlah(JurnalKeuangan(path).muat()) == [1000, 1001, 1002]
+
+
+def test_jurnal_record_yang_sudah_di_snapshot_dilewati(tmp_path):
+    path = str(tmp_path / "ledger.arrow")
+    jurnal = JurnalKeuangan(path)
+    jurnal.tambah([_record(i) for i in range(3)])
+    isi_jurnal = open(jurnal.path_jurnal).read()
+    jurnal.kompaksi()
+    # Kompaksi terputus setelah snapshot diganti: jurnal lama masih ada
+    with open(jurnal.path_jurnal, "w") as f:
+        f.write(isi_jurnal)
+        f.write(json.dumps({"no": 3, **_record(3)}) + "\n")
+    assert _jumlah(JurnalKeuangan(path).muat()) == [1000, 1001, 1002, 1003]
+
+
+def test_jurnal_batch_besar_sebagai_segmen(tmp_path):
+    path = str(tmp_path / "ledger.arrow")
+    jurnal = JurnalKeuangan(path, batas_kompaksi=100, batas_segmen=3)
+    jurnal.tambah_data(buat_ledger(500, seed=0))
+    # Segmen pertama di atas snapshot kosong langsung digabung
+    assert jurnal.daftar_segmen() == [] and os.path.exists(path)
+
+    bagian = [buat_ledger(500, seed=0)]
+    for seed in (1, 2):
+        kecil = buat_ledger(5, seed=10 + seed)
+        jurnal.tambah_data(kecil)
+        besar = buat_ledger(150, seed=seed)
+        jurnal.tambah_data(besar)
+        bagian += [kecil, besar]
+    assert [awal for awal, _ in jurnal.daftar_segmen()] == [505, 660]
+    harapan = pd.concat(bagian, ignore_index=True)
+    assert _jumlah(JurnalKeuangan(path, hanya_baca=True).muat()) == _jumlah(harapan)
+
+    # Segmen ketiga mencapai batas_segmen: semua digabung ke snapshot
+    jurnal.tambah_data(buat_ledger(150, seed=3))
+    harapan = pd.concat([harapan, buat_ledger(150, seed=3)], ignore_index=True)
+    assert jurnal.daftar_segmen() == []
+    assert _jumlah(JurnalKeuangan(path).muat()) == _jumlah(harapan)
+
+
+# Satu proses penulis jurnal: baris satu per satu dan sesekali batch besar (segmen)
+def _penulis_jurnal(path, nama, antrean):
+    jurnal = JurnalKeuangan(path, batas_kompaksi=40, batas_segmen=2)
+    jurnal.muat()
+    for i in range(120):
+        if i % 40 == 39:
+            jurnal.tambah_data(buat_ledger(60, seed=i).assign(Keterangan=[f"{nama}-{i}-{j}" for j in range(60)]))
+        else:
+            jurnal.tambah([{**_record(i), "Keterangan": f"{nama}-{i}"}])
+    jurnal.tutup()
+    antrean.put(nama)
+
+
+def test_dua_proses_penulis_tidak_kehilangan_baris(tmp_path):
+    path = str(tmp_path / "ledger.arrow")
+    JurnalKeuangan(path).tambah([_record(i) for i in range(10)])
+    konteks = multiprocessing.get_context("spawn")
+    antrean = konteks.Queue()
+    pekerja = [konteks.Process(target=_penulis_jurnal, args=(path, nama, antrean)) for nama in ("aplikasi", "cli")]
+    for p in pekerja:
+        p.start()
+    assert sorted(antrean.get(timeout=240) for _ in pekerja) == ["aplikasi", "cli"]
+    for p in pekerja:
+        p.join(60)
+        assert p.exitcode == 0
+
+    keterangan = JurnalKeuangan(path).muat()["Keterangan"].tolist()
+    harapan = [f"t{i}" for i in range(10)]
+    for nama in ("aplikasi", "cli"):
+        for i in range(120):
+            harapan += [f"{nama}-{i}-{j}" for j in range(60)] if i % 40 == 39 else [f"{nama}-{i}"]
+    assert len(keterangan) == len(harapan) == 10 + 2 * (117 + 3 * 60)
+    assert sorted(keterangan) == sorted(harapan)
+
+
+def test_penulis_lain_di_antara_dua_tambah_tidak_menimpa(tmp_path):
+    path = str(tmp_path / "ledger.arrow")
+    aplikasi = JurnalKeuangan(path)
+    aplikasi.tambah([_record(i) for i in range(10)])
+    # CLI impor menambah batch besar setelah aplikasi memuat jurnal
+    cli = JurnalKeuangan(path)
+    cli.tambah_data(buat_ledger(6000, seed=0))
+    cli.tutup()
+    aplikasi.tambah([_record(10)])
+    assert len(JurnalKeuangan(path).muat()) == 6011
+    assert len(aplikasi.muat()) == 6011
+
+
+def test_jurnal_kosong_memakai_skema(tmp_path):
+    data = JurnalKeuangan(str(tmp_path / "ledger.arrow")).muat()
+    assert data.empty
+    assert isinstance(data["Kategori"].dtype, pd.CategoricalDtype)
+    assert str(data["Jumlah"].dtype) == "int64"
+
+
+# ---- LedgerBulanan
+
+@pytest.fixture
+def ledger_bulanan(tmp_path):
+    ledger = LedgerBulanan(str(tmp_path / "bulanan"))
+    ledger.tambah_data(buat_ledger(3000, hari=365 * 2, seed=1))
+    yield ledger
+    ledger.tutup()
+
+
+def _halaman_brute(data, offset, limit, menurun):
+    if menurun:
+        data = data.iloc[::-1]
+    return data.iloc[offset:offset + limit]
+
+
+def _cek_ledger(ledger):
+    semua = ledger.query()
+    ringkasan = ringkasan_terbuka(ledger, ledger.muat_terbuka())
+    acuan = RingkasanBerjalan.dari_ledger(semua)
+    assert ringkasan.totals() == acuan.totals()
+    assert ringkasan.jumlah_transaksi == acuan.jumlah_transaksi == len(semua)
+    assert +ringkasan.per_kategori == +acuan.per_kategori
+
+    for filter in ({}, {"tipe": "Pemasukan"}, {"kategori": "Sewa"}, {"tanggal_awal": "2020-03-01", "tanggal_akhir": "2020-08-31"}):
+        data = ledger.query(**filter)
+        assert ledger.hitung(**filter) == len(data)
+        for offset in (0, 30, len(data) - 10):
+            for menurun in (True, False):
+                halaman = ledger.halaman(offset, 25, menurun=menurun, **filter)
+                assert _jumlah(halaman) == _jumlah(_halaman_brute(data, offset, 25, menurun))
+
+
+def test_bulanan_tutup_buku_dan_arsip(ledger_bulanan):
+    _cek_ledger(ledger_bulanan)
+    bulan = tutup_buku(ledger_bulanan, pekerja=1)
+    assert bulan == ledger_bulanan.daftar_bulan()
+    assert ledger_bulanan.ringkasan_tersegel.daftar() == bulan
+    # Semua bulan sudah lewat dan tersegel: tidak ada baris yang perlu dimuat
+    assert ledger_bulanan.muat_terbuka().empty
+    _cek_ledger(ledger_bulanan)
+
+    # Baris baru di bulan tersegel digabung ke segelnya
+    ledger_bulanan.tambah([_record(0, "2020-02-10")])
+    ledger_bulanan.tambah_data(buat_ledger(20, seed=5).assign(Tanggal=pd.Timestamp("2020-03-05")))
+    assert ledger_bulanan.ringkasan_tersegel.ada("2020-02") and ledger_bulanan.ringkasan_tersegel.ada("2020-03")
+    _cek_ledger(ledger_bulanan)
+
+    total = len(ledger_bulanan.query())
+    assert ledger_bulanan.arsipkan(2020) == len(ledger_bulanan.query(tanggal_awal="2020-01-01", tanggal_akhir="2020-12-31"))
+    assert ledger_bulanan.daftar_arsip() == ["2020"]
+    assert all(b[:4] != "2020" for b in ledger_bulanan.daftar_bulan())
+    assert not any(nama.startswith("2020-") for nama in os.listdir(ledger_bulanan.folder))
+    assert len(ledger_bulanan.query()) == total
+    _cek_ledger(ledger_bulanan)
+
+    with pytest.raises(ValueError):
+        ledger_bulanan.tambah([_record(0, "2020-05-01")])
+
+
+def test_bulanan_arsip_menolak_bulan_yang_belum_ditutup(ledger_bulanan):
+    with pytest.raises(ValueError):
+        ledger_bulanan.arsipkan(2020)
+    assert ledger_bulanan.daftar_arsip() == []
+
+
+# ---- PenjualanSQLite
+
+def _cek_penjualan(penjualan):
+    ringkasan = ringkasan_partisi(penjualan)
+    acuan = RingkasanBerjalan()
+    acuan.tambah_penjualan(penjualan.muat())
+    assert ringkasan.totals() == acuan.totals()
+    assert ringkasan.jumlah_transaksi == acuan.jumlah_transaksi
+    assert +ringkasan.per_produk == +acuan.per_produk
+    assert +ringkasan.unit_produk == +acuan.unit_produk
+
+
+def test_penjualan_tutup_buku_dan_tulis_ke_bulan_tersegel(tmp_path):
+    katalog = buat_katalog(seed=0)
+    penjualan = PenjualanSQLite(str(tmp_path / "penjualan.db"))
+    penjualan.tambah_data(next(buat_penjualan(katalog, 2000, tanggal_awal="2022-01-01", hari=120, seed=0)))
+    bulan = tutup_buku(penjualan, pekerja=1)
+    assert bulan == penjualan.ringkasan_tersegel.daftar() == ["2022-01", "2022-02", "2022-03", "2022-04"]
+    _cek_penjualan(penjualan)
+
+    # Penjualan baru di bulan tersegel masuk ke segelnya dalam transaksi yang sama
+    versi = penjualan.versi()
+    penjualan.tambah([{
+        "Date": pd.Timestamp("2022-02-10 10:00"), "IdProduk": 1, "NamaProduk": katalog["NamaProduk"].iloc[0],
+        "Quantity": 2, "TotalPrice": 2 * int(katalog["HargaProduk"].iloc[0]), "CustomerId": "ctm1",
+    }])
+    penjualan.tambah_data(next(buat_penjualan(katalog, 50, tanggal_awal="2022-03-25", hari=20, seed=1)))
+    baru, terbaru = penjualan.sejak(versi)
+    assert len(baru) == 51 and terbaru == penjualan.versi()
+    assert penjualan.ringkasan_tersegel.daftar() == bulan
+    _cek_penjualan(penjualan)
+
+    # Penulisan yang gagal tidak meninggalkan baris maupun sel segel
+    sebelum = penjualan.ringkasan_tersegel.baca("2022-02")
+    with pytest.raises(Exception):
+        penjualan.tambah([{"Date": pd.Timestamp("2022-02-11"), "IdProduk": 1, "NamaProduk": "x", "Quantity": None, "TotalPrice": 1}])
+    assert penjualan.versi() == terbaru
+    pd.testing.assert_frame_equal(penjualan.ringkasan_tersegel.baca("2022-02"), sebelum)
+
+    # Hitung ulang memberi segel yang sama dengan segel yang digabung per penulisan
+    assert tutup_buku(penjualan, hitung_ulang=True, pekerja=1) == bulan
+    _cek_penjualan(penjualan)
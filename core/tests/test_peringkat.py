@@ -0,0 +1,64 @@
+import random
+from collections import Counter
+from datetime import date, timedelta
+
+import pandas as pd
+
+from core.peringkat import PeringkatProduk
+
+
+# Unit per produk dalam jendela yang berakhir di `hari_ini`, dihitung dari semua penjualan
+def _brute(penjualan, jendela, hari_ini):
+    unit = Counter()
+    for tanggal, produk, jumlah in penjualan:
+        if jendela is None or hari_ini - timedelta(days=jendela) < tanggal <= hari_ini:
+            unit[produk] += jumlah
+    return unit
+
+
+def test_sama_dengan_hitung_langsung():
+    rng = random.Random(0)
+    hari = [date(2024, 1, 1)]
+    peringkat = PeringkatProduk(k_maks=10, jam=lambda: hari[0])
+    penjualan = []
+    for _ in range(400):
+        acak = rng.random()
+        if acak < 0.1:
+            hari[0] += timedelta(days=rng.choice([1, 1, 2, 5, 40]))
+        elif acak < 0.2:
+            baris = [(hari[0] + timedelta(days=rng.randint(-40, 10)), rng.randint(1, 30), rng.randint(1, 5)) for _ in range(20)]
+            penjualan += baris
+            peringkat.tambah_penjualan(pd.DataFrame(baris, columns=["Date", "IdProduk", "Quantity"]))
+        else:
+            tanggal = hari[0] + timedelta(days=rng.randint(-40, 10))
+            produk, jumlah = rng.randint(1, 30), rng.randint(1, 5)
+            penjualan.append((tanggal, produk, jumlah))
+            peringkat.tambah(produk, jumlah, tanggal)
+
+        for jendela in (None, 1, 7, 30):
+            unit = _brute(penjualan, jendela, hari[0])
+            for k in (5, 20):
+                hasil = peringkat.teratas(k, jendela)
+                harapan = sorted(unit.values(), reverse=True)[:k]
+                # Produk dengan unit sama boleh berurutan berbeda
+                assert [u for _, u in hasil] == harapan
+                assert all(unit[produk] == u for produk, u in hasil)
+
+
+def test_penjualan_bertanggal_di_depan_tidak_menggeser_jendela():
+    hari = [date(2024, 3, 1)]
+    peringkat = PeringkatProduk(jam=lambda: hari[0])
+    peringkat.tambah("kemarin", 2, date(2024, 2, 29))
+    peringkat.tambah("hari ini", 1, date(2024, 3, 1))
+    peringkat.tambah("lusa", 5, date(2024, 3, 3))
+    assert peringkat.teratas(5, 1) == [("hari ini", 1)]
+    assert peringkat.teratas(5, 7) == [("kemarin", 2), ("hari ini", 1)]
+    assert peringkat.teratas(5, None) == [("lusa", 5), ("kemarin", 2), ("hari ini", 1)]
+
+    # Saat harinya tiba, penjualan itu masuk jendela dan hari lama keluar
+    hari[0] = date(2024, 3, 3)
+    assert peringkat.teratas(5, 1) == [("lusa", 5)]
+    assert peringkat.teratas(5, 7) == [("lusa", 5), ("kemarin", 2), ("hari ini", 1)]
+    hari[0] = date(2024, 4, 10)
+    assert peringkat.teratas(5, 30) == []
+    assert peringkat.teratas(5, None) == [("lusa", 5), ("kemarin", 2), ("hari ini", 1)]
@@ -0,0 +1,28 @@
+from core.inventaris import InventarisBersama
+from core.inventory import create_product_catalog, generate_product_data
+from core.sales import open_sales, sales_summary, sell_basket, sync_summary
+from generator_data import buat_penjualan
+
+
+def test_ringkasan_sesi_mengikuti_penjualan_sesi_lain(tmp_path):
+    produk = generate_product_data()
+    katalog = create_product_catalog(produk)
+    inventaris = InventarisBersama(str(tmp_path / "stok.db"))
+    inventaris.impor(produk["IdProduk"], produk["StokProduk"])
+    sales = open_sales(str(tmp_path / "sales.db"))
+    sales.tambah_data(next(buat_penjualan(produk, 200, seed=0)))
+
+    sesi_a, sesi_b = sales_summary(sales), sales_summary(sales)
+    assert sesi_a.versi_penjualan == sales.versi()
+    sell_basket(katalog, inventaris, sales, sesi_a, {1: 2, 3: 1}, "2024-05-01", "ctm1")
+    sales.tambah_data(next(buat_penjualan(produk, 30, tanggal_awal="2024-05-02", seed=1)))
+
+    # Sesi yang menjual sudah sinkron sampai penjualannya sendiri; sisanya menyusul
+    assert sync_summary(sesi_a, sales) == 30
+    assert sync_summary(sesi_b, sales) == 32
+    assert sync_summary(sesi_b, sales) == 0
+    baru = sales_summary(sales)
+    for sesi in (sesi_a, sesi_b):
+        assert sesi.totals() == baru.totals()
+        assert sesi.jumlah_transaksi == baru.jumlah_transaksi == 232
+        assert +sesi.unit_produk == +baru.unit_produk
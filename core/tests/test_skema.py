@@ -0,0 +1,33 @@
+import pandas as pd
+
+from core.ledger import record_transaksi
+from core.penyimpanan import ledger_kosong
+from core.skema import SKEMA_LEDGER, gabung, terapkan_skema
+
+
+def test_setengah_rupiah_dibulatkan_menjauhi_nol():
+    data = terapkan_skema(pd.DataFrame({"Jumlah": [2.5, 3.5, -2.5, 1.49, 1000.5]}), {"Jumlah": "uang"})
+    assert str(data["Jumlah"].dtype) == "int64"
+    assert data["Jumlah"].tolist() == [3, 4, -3, 1, 1001]
+
+    # Satu transaksi yang dicatat langsung dibulatkan sama seperti kolom di memori
+    for jumlah, harapan in ((2.5, 3), (3.5, 4), ("1000.5", 1001), (0.49, 0)):
+        assert record_transaksi("2024-01-01", "Sewa", "Pengeluaran", jumlah, "")["Jumlah"] == harapan
+
+    kosong = terapkan_skema(pd.DataFrame({"Jumlah": [2.5, None]}), {"Jumlah": "uang"})
+    assert str(kosong["Jumlah"].dtype) == "Int64"
+    assert kosong["Jumlah"].tolist() == [3, pd.NA]
+
+
+def test_ledger_kosong_bertipe_seperti_ledger_berisi():
+    kosong = ledger_kosong()
+    assert kosong.empty
+    assert str(kosong["Tanggal"].dtype) == "datetime64[us]"
+    assert isinstance(kosong["Kategori"].dtype, pd.CategoricalDtype)
+    assert isinstance(kosong["Tipe"].dtype, pd.CategoricalDtype)
+    assert str(kosong["Jumlah"].dtype) == "int64"
+
+    # Baris pertama yang digabung ke ledger kosong tetap bertipe skema
+    data = gabung(kosong, pd.DataFrame([record_transaksi("2024-01-01", "Sewa", "Pengeluaran", 1500.5, "x")]), SKEMA_LEDGER)
+    assert data["Jumlah"].tolist() == [1501]
+    assert isinstance(data["Kategori"].dtype, pd.CategoricalDtype)
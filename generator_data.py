@@ -0,0 +1,168 @@
+# Generator data sintetis (katalog, penjualan, ledger) untuk uji beban dan benchmark.
+#
+#   python -m generator_data katalog --sku 1000000 --keluaran katalog.parquet
+#   python -m generator_data penjualan --jumlah 20000000 --sku 1000000 --keluaran penjualan.parquet
+#   python -m generator_data ledger --jumlah 1000000 --keluaran data_keuangan.arrow
+#
+# Semua hasil ditentukan oleh --seed sehingga dataset yang sama bisa dibuat ulang.
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from core.expenses import KATEGORI_PENGELUARAN
+from core.impor_ekspor import tulis_chunk
+from core.penyimpanan import tulis_tabel
+
+JENIS_PRODUK = {
+    "T-Shirts": ["Short Sleeve", "Long Sleeve", "AIRism Cotton", "Cotton"],
+    "Jackets": ["Reversible Parka", "Pocketable UV Protection Parka", "BLOCKTECH Parka 3D Cut", "Zip Ip Blouson"],
+    "Flannel": ["Flannel Shirt Long Sleeve", "Flannel Long Sleeve Checked", "Flannel Long Sleeve"],
+    "Sweater": ["Crew Neck Long Sleeve Sweater", "Polo Sweater Short Sleeve", "3D Knit Crew Neck Sweater", "Waffle V Neck Sweater"],
+    "Jeans": ["Wide Tapered Jeans", "Straight Jeans", "Slim Fit Jeans", "Ultra Stretch Skinny Fit Jeans"],
+    "Shorts": ["Stretch Slim Fit Shorts", "Geared Shorts", "Ultra Stretch Shorts", "Cargo Shorts"],
+    "Chinos": ["Slim Fit Chino Pants", "Pleated Wide Chino Pants", "Wide Fit Chino Pants", "Chino Shorts"],
+    "Sweat Pants": ["Sweat Pants", "Sweat Wide Pants", "Ultra Stretch Sweat Shorts"],
+}
+UKURAN_PRODUK = ["Small", "Medium", "Large"]
+WARNA_PRODUK = ["Hijau", "Hitam", "Putih"]
+
+UKURAN_CHUNK = 1_000_000
+
+
+# Katalog = hasil kali Kartesius (jenis, nama) x ukuran x warna, dibuat tanpa loop Python.
+# `ulang` > 1 menambah seri model ("Cotton 2", "Cotton 3", ...) untuk katalog yang sangat besar.
+def buat_katalog(jenis_produk=JENIS_PRODUK, ukuran=UKURAN_PRODUK, warna=WARNA_PRODUK,
+                 ulang=1, harga_min=100000, harga_maks=300000, stok=100, seed=None):
+    rng = np.random.default_rng(seed)
+    model = [
+        (jenis, nama if seri == 1 else f"{nama} {seri}")
+        for seri in range(1, ulang + 1)
+        for jenis, daftar_nama in jenis_produk.items()
+        for nama in daftar_nama
+    ]
+    jenis = np.array([m[0] for m in model], dtype=object)
+    nama = np.array([m[1] for m in model], dtype=object)
+
+    model, idx_ukuran, idx_warna = (
+        a.ravel() for a in np.meshgrid(np.arange(len(nama)), np.arange(len(ukuran)), np.arange(len(warna)), indexing="ij")
+    )
+    jumlah = len(model)
+    return pd.DataFrame({
+        "IdProduk": np.arange(1, jumlah + 1),
+        "JenisProduk": pd.Categorical(jenis[model]),
+        "NamaProduk": pd.Categorical(nama[model]),
+        "UkuranProduk": pd.Categorical.from_codes(idx_ukuran, ukuran),
+        "WarnaProduk": pd.Categorical.from_codes(idx_warna, warna),
+        "HargaProduk": rng.integers(harga_min, harga_maks + 1, jumlah),
+        "StokProduk": np.full(jumlah, stok),
+    })
+
+
+# Jumlah ulang seri model yang dibutuhkan agar katalog berisi minimal `sku` produk
+def ulang_untuk_sku(sku, jenis_produk=JENIS_PRODUK, ukuran=UKURAN_PRODUK, warna=WARNA_PRODUK):
+    per_seri = sum(len(n) for n in jenis_produk.values()) * len(ukuran) * len(warna)
+    return max(1, -(-sku // per_seri))
+
+
+# Bobot Zipf: sedikit produk/pelanggan sangat laris, sisanya ekor panjang
+def _bobot_zipf(n, s, rng):
+    bobot = 1.0 / np.arange(1, n + 1) ** s
+    rng.shuffle(bobot)
+    return bobot / bobot.sum()
+
+
+# Penjualan sintetis: popularitas produk dan pelanggan mengikuti Zipf, kuantitas 1-5
+# (kebanyakan 1), dan akhir pekan lebih ramai. Dibuat per chunk agar memori terbatas.
+def buat_penjualan(katalog, jumlah, tanggal_awal="2022-01-01", hari=365, pelanggan=None,
+                   zipf=1.1, seed=None, ukuran_chunk=UKURAN_CHUNK):
+    rng = np.random.default_rng(seed)
+    p_produk = _bobot_zipf(len(katalog), zipf, rng)
+    p_pelanggan = _bobot_zipf(len(pelanggan), zipf, rng) if pelanggan is not None else None
+
+    tanggal = pd.date_range(tanggal_awal, periods=max(hari, 1), freq="D")
+    p_tanggal = np.where(tanggal.dayofweek >= 5, 1.6, 1.0)
+    p_tanggal = p_tanggal / p_tanggal.sum()
+
+    id_produk = katalog["IdProduk"].to_numpy()
+    nama_produk = katalog["NamaProduk"].to_numpy()
+    harga = katalog["HargaProduk"].to_numpy()
+
+    for mulai in range(0, jumlah, ukuran_chunk):
+        n = min(ukuran_chunk, jumlah - mulai)
+        posisi = rng.choice(len(katalog), size=n, p=p_produk)
+        kuantitas = np.minimum(rng.geometric(0.55, size=n), 5)
+        detik = rng.integers(8 * 3600, 22 * 3600, size=n)
+        chunk = pd.DataFrame({
+            "Date": tanggal[rng.choice(len(tanggal), size=n, p=p_tanggal)] + pd.to_timedelta(detik, unit="s"),
+            "IdProduk": id_produk[posisi],
+            "NamaProduk": nama_produk[posisi],
+            "Quantity": kuantitas,
+            "TotalPrice": kuantitas * harga[posisi],
+        })
+        if pelanggan is not None:
+            chunk["CustomerId"] = np.asarray(pelanggan, dtype=object)[rng.choice(len(pelanggan), size=n, p=p_pelanggan)]
+        yield chunk
+
+
+# Ledger sintetis untuk aplikasi pencatatan keuangan (kolom seperti data_keuangan)
+def buat_ledger(jumlah, tanggal_awal="2020-01-01", hari=365 * 5, rasio_pemasukan=0.8, seed=None):
+    rng = np.random.default_rng(seed)
+    produk = np.array([jenis for jenis in JENIS_PRODUK], dtype=object)
+    pengeluaran = np.array(KATEGORI_PENGELUARAN, dtype=object)
+    pemasukan = rng.random(jumlah) < rasio_pemasukan
+    return pd.DataFrame({
+        "Tanggal": pd.Timestamp(tanggal_awal) + pd.to_timedelta(np.sort(rng.integers(0, hari, jumlah)), unit="D"),
+        "Kategori": np.where(pemasukan, produk[rng.integers(0, len(produk), jumlah)], pengeluaran[rng.integers(0, len(pengeluaran), jumlah)]),
+        "Tipe": np.where(pemasukan, "Pemasukan", "Pengeluaran"),
+        "Jumlah": np.where(pemasukan, rng.integers(1, 6, jumlah) * 150000, rng.integers(1, 200, jumlah) * 50000),
+        "Keterangan": "",
+    })
+
+
+def pelanggan_sintetis(jumlah):
+    return [f"ctm{i}" for i in range(1, jumlah + 1)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m generator_data")
+    sub = parser.add_subparsers(dest="perintah", required=True)
+
+    p_katalog = sub.add_parser("katalog", help="katalog produk clothing")
+    p_katalog.add_argument("--sku", type=int, default=270)
+
+    p_penjualan = sub.add_parser("penjualan", help="riwayat penjualan clothing")
+    p_penjualan.add_argument("--jumlah", type=int, default=1_000_000)
+    p_penjualan.add_argument("--sku", type=int, default=270)
+    p_penjualan.add_argument("--pelanggan", type=int, default=10_000)
+    p_penjualan.add_argument("--hari", type=int, default=365)
+    p_penjualan.add_argument("--tanggal-awal", default="2022-01-01")
+
+    p_ledger = sub.add_parser("ledger", help="ledger aplikasi pencatatan keuangan")
+    p_ledger.add_argument("--jumlah", type=int, default=1_000_000)
+    p_ledger.add_argument("--hari", type=int, default=365 * 5)
+
+    for p in (p_katalog, p_penjualan, p_ledger):
+        p.add_argument("--seed", type=int, default=0)
+        p.add_argument("--keluaran", required=True)
+
+    args = parser.parse_args(argv)
+    if args.perintah == "katalog":
+        katalog = buat_katalog(ulang=ulang_untuk_sku(args.sku), seed=args.seed).head(args.sku)
+        total = tulis_chunk([katalog], args.keluaran)
+    elif args.perintah == "penjualan":
+        katalog = buat_katalog(ulang=ulang_untuk_sku(args.sku), seed=args.seed).head(args.sku)
+        chunks = buat_penjualan(
+            katalog, args.jumlah, tanggal_awal=args.tanggal_awal, hari=args.hari,
+            pelanggan=pelanggan_sintetis(args.pelanggan), seed=args.seed,
+        )
+        total = tulis_chunk(chunks, args.keluaran)
+    else:
+        ledger = buat_ledger(args.jumlah, hari=args.hari, seed=args.seed)
+        tulis_tabel(ledger, args.keluaran)
+        total = len(ledger)
+    print(f"{total} baris ditulis ke {args.keluaran}")
+
+
+if __name__ == "__main__":
+    main()
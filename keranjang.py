@@ -0,0 +1,82 @@
+import streamlit as st
+
+from core.pencarian import K_HASIL
+
+LABEL = {
+    "id": {
+        "cari": "Cari Produk", "petunjuk": "Nama, merek, ukuran atau warna", "hasil": "Hasil Pencarian",
+        "lainnya": "{n} produk cocok, menampilkan {k} teratas", "tidak_ada": "Produk tidak ditemukan.",
+        "tambah": "Tambah ke Keranjang", "hapus": "Hapus", "kosong": "Keranjang masih kosong.",
+    },
+    "en": {
+        "cari": "Search Product", "petunjuk": "Name, brand, size or color", "hasil": "Search Results",
+        "lainnya": "{n} products match, showing the top {k}", "tidak_ada": "No product found.",
+        "tambah": "Add to Cart", "hapus": "Remove", "kosong": "The cart is empty.",
+    },
+}
+
+
+# Kotak pencarian produk dengan paling banyak k hasil dari indeks pencarian. Mengembalikan
+# kode produk yang dipilih, atau None. Hanya hasil pencarian yang menjadi pilihan widget,
+# sehingga ukuran halaman tidak bergantung pada jumlah produk di katalog.
+def pilih_produk(kunci, indeks, format_produk, k=K_HASIL, bahasa="id"):
+    label = LABEL[bahasa]
+    kueri = st.text_input(label["cari"], placeholder=label["petunjuk"], key=f"{kunci}_kueri")
+    if not kueri.strip():
+        return None
+    hasil = indeks.cari(kueri, k)
+    if not hasil:
+        st.info(label["tidak_ada"])
+        return None
+    if len(hasil) == k:
+        total = indeks.hitung(kueri)
+        if total > k:
+            st.caption(label["lainnya"].format(n=total, k=k))
+    return st.selectbox(label["hasil"], hasil, format_func=format_produk, key=f"{kunci}_hasil")
+
+
+def _isi(kunci):
+    return st.session_state.setdefault(f"{kunci}_isi", {})
+
+
+# Kunci widget jumlah satu baris; versi naik setiap keranjang dikosongkan sehingga
+# widget lama tidak dipakai lagi (dan dibuang Streamlit) tanpa mengubah state-nya
+def _kunci_unit(kunci, kode):
+    return f"{kunci}_unit_{st.session_state.get(f'{kunci}_versi', 0)}_{kode}"
+
+
+# Callback tombol: widget jumlah dibuat ulang dengan nilai dari keranjang
+def _tambah(kunci, kode):
+    isi = _isi(kunci)
+    isi[kode] = isi.get(kode, 0) + 1
+    st.session_state.pop(_kunci_unit(kunci, kode), None)
+
+
+def _hapus(kunci, kode):
+    _isi(kunci).pop(kode, None)
+    st.session_state.pop(_kunci_unit(kunci, kode), None)
+
+
+# Kosongkan keranjang, misalnya setelah transaksi tercatat
+def kosongkan_keranjang(kunci):
+    st.session_state[f"{kunci}_isi"] = {}
+    st.session_state[f"{kunci}_versi"] = st.session_state.get(f"{kunci}_versi", 0) + 1
+
+
+# Keranjang belanja: produk dicari lewat indeks lalu ditambahkan ke keranjang di session
+# state. Hanya baris keranjang yang menjadi widget jumlah, sehingga biaya rerun bergantung
+# pada ukuran keranjang, bukan ukuran katalog. Mengembalikan dict kode -> unit.
+def keranjang_belanja(kunci, indeks, format_produk, k=K_HASIL, bahasa="id"):
+    label = LABEL[bahasa]
+    kode = pilih_produk(kunci, indeks, format_produk, k, bahasa)
+    if kode is not None:
+        st.button(label["tambah"], key=f"{kunci}_tambah", on_click=_tambah, args=(kunci, kode))
+
+    isi = _isi(kunci)
+    if not isi:
+        st.caption(label["kosong"])
+    for kode, unit in list(isi.items()):
+        kolom1, kolom2 = st.columns([4, 1])
+        isi[kode] = kolom1.number_input(format_produk(kode), min_value=0, step=1, value=unit, key=_kunci_unit(kunci, kode))
+        kolom2.button(label["hapus"], key=f"{kunci}_hapus_{kode}", on_click=_hapus, args=(kunci, kode))
+    return dict(isi)
@@ -0,0 +1,53 @@
+import math
+
+import pandas as pd
+import streamlit as st
+
+UKURAN_HALAMAN = [25, 50, 100, 250]
+
+LABEL = {
+    "id": {
+        "urut": "Urutkan", "menurun": "Menurun", "ukuran": "Baris per halaman",
+        "halaman": "Halaman", "info": "Menampilkan baris {awal}-{akhir} dari {total}",
+    },
+    "en": {
+        "urut": "Sort by", "menurun": "Descending", "ukuran": "Rows per page",
+        "halaman": "Page", "info": "Showing rows {awal}-{akhir} of {total}",
+    },
+}
+
+
+# Ambil satu halaman dari DataFrame tanpa mengurutkan seluruh tabel jika tidak perlu.
+# urut=None berarti urutan pencatatan (menurun = terbaru lebih dulu).
+def halaman_dataframe(data, offset, limit, urut=None, menurun=True):
+    if urut is None:
+        if menurun:
+            akhir = len(data) - offset
+            return data.iloc[max(akhir - limit, 0):max(akhir, 0)].iloc[::-1]
+        return data.iloc[offset:offset + limit]
+
+    kolom = data[urut]
+    if pd.api.types.is_numeric_dtype(kolom) or pd.api.types.is_datetime64_any_dtype(kolom):
+        # Cukup ambil offset + limit teratas: O(n log k), bukan O(n log n)
+        ambil = data.nlargest if menurun else data.nsmallest
+        return ambil(offset + limit, urut).iloc[offset:]
+    return data.sort_values(urut, ascending=not menurun, kind="stable").iloc[offset:offset + limit]
+
+
+# Tampilkan tabel berhalaman. `ambil_halaman(offset, limit, urut, menurun)` hanya
+# dipanggil untuk jendela yang terlihat, sehingga ukuran data yang dikirim ke browser
+# tidak bergantung pada jumlah baris total.
+def tabel_berhalaman(kunci, ambil_halaman, total, kolom_urut, menurun=True, bahasa="id"):
+    label = LABEL[bahasa]
+    kolom1, kolom2, kolom3, kolom4 = st.columns(4)
+    pilihan_urut = ["-"] + list(kolom_urut)
+    urut = kolom1.selectbox(label["urut"], pilihan_urut, key=f"{kunci}_urut")
+    menurun = kolom2.checkbox(label["menurun"], value=menurun, key=f"{kunci}_menurun")
+    ukuran = kolom3.selectbox(label["ukuran"], UKURAN_HALAMAN, key=f"{kunci}_ukuran")
+    jumlah_halaman = max(1, math.ceil(total / ukuran))
+    halaman = kolom4.number_input(label["halaman"], min_value=1, max_value=jumlah_halaman, step=1, key=f"{kunci}_halaman")
+
+    offset = (min(halaman, jumlah_halaman) - 1) * ukuran
+    data = ambil_halaman(offset, ukuran, None if urut == "-" else urut, menurun)
+    st.dataframe(data)
+    st.caption(label["info"].format(awal=min(offset + 1, total), akhir=offset + len(data), total=total))
@@ -0,0 +1,72 @@
+import os
+from datetime import datetime
+
+import pandas as pd
+import streamlit as st
+
+from core import metrik
+from core.penulis import penulis
+
+LABEL = {
+    "id": {
+        "judul": "Debug: waktu rerun", "total": "Rerun ini", "bagian": "Bagian (inklusif)",
+        "penghitung": "Penghitung", "riwayat": "Semua rerun",
+        "tertunda": "Penyimpanan: {n} perubahan menunggu ditulis", "tersimpan": "Semua perubahan tersimpan",
+        "terakhir": "Semua perubahan tersimpan (terakhir {waktu})", "gagal": "Gagal menyimpan {kunci}: {galat}",
+        "diulang": " (akan dicoba lagi)",
+    },
+    "en": {
+        "judul": "Debug: rerun timing", "total": "This rerun", "bagian": "Sections (inclusive)",
+        "penghitung": "Counters", "riwayat": "All reruns",
+        "tertunda": "Storage: {n} change(s) waiting to be written", "tersimpan": "All changes saved",
+        "terakhir": "All changes saved (last at {waktu})", "gagal": "Failed to save {kunci}: {galat}",
+        "diulang": " (retrying)",
+    },
+}
+
+
+# Panel aktif dengan ?debug=1 di URL atau variabel lingkungan DEBUG_METRIK=1
+def panel_aktif():
+    return os.environ.get("DEBUG_METRIK") == "1" or st.query_params.get("debug") == "1"
+
+
+# Rincian satu rerun di sidebar: total, durasi per bagian, penghitung, dan
+# persentil p50/p99 dari semua rerun sejak proses dimulai
+def tampilkan_panel(rekaman, bahasa="id"):
+    if rekaman is None or not panel_aktif():
+        return
+    label = LABEL[bahasa]
+    with st.sidebar.expander(label["judul"], expanded=True):
+        st.metric(label["total"], f"{rekaman['total_ms']:.1f} ms")
+
+        st.caption(label["bagian"])
+        bagian = pd.DataFrame({
+            "ms": pd.Series(rekaman["bagian_ms"]).round(2),
+            "n": pd.Series(rekaman["panggilan"]),
+        })
+        st.dataframe(bagian.sort_values("ms", ascending=False))
+
+        if rekaman["penghitung"]:
+            st.caption(label["penghitung"])
+            st.dataframe(pd.Series(rekaman["penghitung"], name="n"))
+
+        st.caption(label["riwayat"])
+        statistik = pd.DataFrame(metrik.statistik()).set_index("nama")
+        statistik[["total", "p50", "p99"]] = statistik[["total", "p50", "p99"]] * 1000
+        st.dataframe(statistik.rename(columns={"total": "total ms", "p50": "p50 ms", "p99": "p99 ms"}).round(2))
+
+
+# Status penulis latar di sidebar: perubahan yang masih menunggu ditulis ke disk,
+# penulisan yang gagal (dan apakah masih akan dicoba lagi), atau semua sudah tersimpan
+def tampilkan_status_penyimpanan(bahasa="id"):
+    label = LABEL[bahasa]
+    status = penulis.status()
+    for kunci, galat in status["galat"].items():
+        diulang = label["diulang"] if kunci in status["menunggu_ulang"] else ""
+        st.sidebar.error(label["gagal"].format(kunci=kunci[-1], galat=galat) + diulang)
+    if status["tertunda"]:
+        st.sidebar.caption(label["tertunda"].format(n=status["tertunda"]))
+    elif status["terakhir"] is not None:
+        st.sidebar.caption(label["terakhir"].format(waktu=datetime.fromtimestamp(status["terakhir"]).strftime("%H:%M:%S")))
+    else:
+        st.sidebar.caption(label["tersimpan"])